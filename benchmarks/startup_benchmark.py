@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark
+
+측정 항목:
+- import 시간: `python -X importtime -c "import src.cli"` 결과의 누적 시간과 가장 느린 모듈
+- 프로바이더 SDK 로드 여부: src.cli import 후 sys.modules에 SDK가 들어오면 안 됩니다
+- time-to-first-prompt: `python run.py` 실행 후 첫 번째 입력 프롬프트가 출력되기까지의 시간
+
+사용 예:
+    python benchmarks/startup_benchmark.py --runs 5 --max-import-ms 300 --json startup.json
+회귀가 감지되면 exit code 1로 종료합니다.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from typing import Dict, Any, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 모델/백엔드를 선택하기 전에는 로드되면 안 되는 모듈
+PROVIDER_MODULES = [
+    "openai",
+    "google.genai",
+    "elevenlabs",
+    "googleapiclient",
+    "google_auth_oauthlib",
+    "ffmpeg",
+    "PIL",
+    "pytz",
+]
+
+FIRST_PROMPT_MARKER = "Select a creator"
+
+
+def measure_import(target: str = "src.cli") -> Dict[str, Any]:
+    """-X importtime 출력에서 target과 상위 패키지의 누적 import 시간을 계산합니다.
+
+    하위 모듈의 누적 시간은 상위 모듈의 누적 시간에 이미 포함되므로 들여쓰기가 없는(최상위)
+    줄만 더하고, 인터프리터 시작 시 site가 불러오는 모듈은 제외합니다.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to import {target}:\n{result.stderr}")
+
+    modules = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, self_us, cumulative_us, name = line.replace("import time:", "|").split("|")
+        # 이름 필드는 구분자 뒤 공백 하나 + 깊이마다 공백 두 칸으로 들여쓰기됩니다
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((name.strip(), int(self_us), int(cumulative_us), depth))
+
+    parts = target.split(".")
+    packages = {".".join(parts[:i]) for i in range(1, len(parts) + 1)}
+    total_us = sum(cumulative for name, _, cumulative, depth in modules if depth == 0 and name in packages)
+    slowest = sorted(modules, key=lambda m: m[1], reverse=True)[:10]
+    return {
+        "total_ms": total_us / 1000,
+        "slowest_modules": [{"module": name, "self_ms": self_us / 1000} for name, self_us, _, _ in slowest],
+    }
+
+
+def loaded_provider_modules(target: str = "src.cli") -> List[str]:
+    """target import 후 로드된 프로바이더 SDK 모듈 목록을 반환합니다."""
+    code = (
+        f"import sys, json; import {target}; "
+        f"print(json.dumps([m for m in {PROVIDER_MODULES!r} if m in sys.modules]))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to import {target}:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure_first_prompt(timeout: float = 60) -> float:
+    """run.py 시작부터 첫 입력 프롬프트 출력까지의 시간(ms)을 측정합니다."""
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "run.py"],
+        cwd=PROJECT_ROOT,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        env=env,
+    )
+    output = b""
+    try:
+        while FIRST_PROMPT_MARKER.encode() not in output:
+            chunk = process.stdout.read1(4096)
+            if not chunk:
+                raise RuntimeError(f"run.py exited before prompting:\n{output.decode(errors='replace')}")
+            output += chunk
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError("Timed out waiting for the first prompt")
+        return (time.perf_counter() - started) * 1000
+    finally:
+        process.kill()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure ShortFactory startup time")
+    parser.add_argument("--runs", type=int, default=5, help="Number of measurements (median is reported)")
+    parser.add_argument("--max-import-ms", type=float, help="Fail if the median import time exceeds this")
+    parser.add_argument("--max-first-prompt-ms", type=float, help="Fail if the median time-to-first-prompt exceeds this")
+    parser.add_argument("--skip-first-prompt", action="store_true", help="Only measure import time")
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    import_runs = [measure_import() for _ in range(args.runs)]
+    results: Dict[str, Any] = {
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "import_ms": statistics.median(run["total_ms"] for run in import_runs),
+        "slowest_modules": import_runs[-1]["slowest_modules"],
+        "eager_provider_modules": loaded_provider_modules(),
+    }
+    if not args.skip_first_prompt:
+        results["first_prompt_ms"] = statistics.median(measure_first_prompt() for _ in range(args.runs))
+
+    print("\n=== Startup Benchmark ===")
+    print(f"Import src.cli:        {results['import_ms']:.1f} ms (median of {args.runs})")
+    if "first_prompt_ms" in results:
+        print(f"Time to first prompt:  {results['first_prompt_ms']:.1f} ms")
+    print(f"Eager provider SDKs:   {', '.join(results['eager_provider_modules']) or 'none'}")
+    print("Slowest modules (self time):")
+    for module in results["slowest_modules"]:
+        print(f"  {module['self_ms']:8.1f} ms  {module['module']}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    failures = []
+    if results["eager_provider_modules"]:
+        failures.append(f"provider SDKs imported at startup: {results['eager_provider_modules']}")
+    if args.max_import_ms and results["import_ms"] > args.max_import_ms:
+        failures.append(f"import time {results['import_ms']:.1f} ms > {args.max_import_ms} ms")
+    if args.max_first_prompt_ms and results.get("first_prompt_ms", 0) > args.max_first_prompt_ms:
+        failures.append(f"time to first prompt {results['first_prompt_ms']:.1f} ms > {args.max_first_prompt_ms} ms")
+    if failures:
+        print("\n❌ Regression detected:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\n✅ Startup within limits")
+
+
+if __name__ == "__main__":
+    main()
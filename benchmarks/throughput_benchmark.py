@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+End-to-end throughput benchmark
+
+오프라인 fake provider(SHORTFACTORY_PROVIDERS=fake)로 전체 파이프라인(콘텐츠 → 이미지 → 나레이션
+→ ffmpeg 조립 → 업로드 → 시트 갱신)을 실행합니다. 씬 수, 스크립트 길이, 이미지 크기의 조합마다
+별도 작업 디렉토리의 하위 프로세스에서 비디오 여러 개를 순서대로 만들고 다음을 측정합니다.
+
+측정 항목:
+- videos/hour, 비디오별 지연 시간 p50/p95
+- 단계별(체크포인트 단계 완료 사이 구간) wall 시간, CPU 사용률, 최대 RSS (ffmpeg 자식 프로세스 포함)
+- 외부 호출 지연 시간 요약과 주입된 오류 수
+
+--replay-task를 주면 SHORTFACTORY_PROVIDERS=record로 기록한 실제 task의 cassette를 재생하므로
+실제 프로덕션 콘텐츠(같은 콘텐츠 플랜, 이미지, 나레이션)로 재현 가능한 측정을 할 수 있습니다.
+
+사용 예:
+    python benchmarks/throughput_benchmark.py --videos 3 --scenes 3 6 --script-sentences 1 3 \\
+        --image-sizes 512x512 1024x1024 --time-scale 0.1 --json throughput.json
+    python benchmarks/throughput_benchmark.py --json new.json --baseline throughput.json --max-regression 10
+    python benchmarks/throughput_benchmark.py --creator science_fact --replay-task <task_id> --videos 3
+--baseline의 같은 케이스보다 videos/hour가 --max-regression(%) 이상 낮아지면 exit code 1로 종료합니다.
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import argparse
+import platform
+import tempfile
+import threading
+import itertools
+import subprocess
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASE_FAKE_CONFIG = os.path.join(PROJECT_ROOT, "config", "fake_providers.yaml")
+SPREADSHEET_ID = "throughput-benchmark"
+# 작업 디렉토리에 링크할 읽기 전용 디렉토리 (data/는 케이스마다 새로 만듭니다)
+SHARED_DIRS = ["config", "assets"]
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))]
+
+
+def _cpu_seconds() -> float:
+    """이 프로세스와 종료된 자식 프로세스(ffmpeg/ffprobe)의 CPU 시간 합계"""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def _child_pids() -> List[int]:
+    """이 프로세스의 직접 자식 프로세스 (/proc의 ppid로 찾습니다)"""
+    parent = os.getpid()
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                # pid (comm) state ppid ... comm에 공백이 있을 수 있으므로 마지막 ')' 뒤를 읽습니다
+                fields = f.read().rsplit(b")", 1)[1].split()
+            if int(fields[1]) == parent:
+                pids.append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+    return pids
+
+
+def _rss_bytes() -> int:
+    """이 프로세스와 자식 프로세스의 현재 RSS 합계.
+
+    /proc이 없는 플랫폼에서는 이 프로세스의 최대 RSS(ru_maxrss)를 반환합니다.
+    """
+    if not os.path.isdir("/proc"):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    for pid in [os.getpid()] + _child_pids():
+        try:
+            with open(f"/proc/{pid}/statm", "r") as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+    return total
+
+
+class StageMonitor:
+    """체크포인트 단계 완료 이벤트 사이 구간의 wall/CPU 시간과 최대 RSS를 단계별로 기록합니다.
+
+    비디오는 한 번에 하나씩 처리하므로 각 구간은 정확히 한 단계의 작업에 해당합니다.
+    """
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.stages: Dict[str, List[Dict[str, float]]] = {}
+        self.peak_rss = 0
+        self._lock = threading.Lock()
+        self._window_peak = 0
+        self._window_started = (0.0, 0.0)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._sample, name="stage-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            rss = _rss_bytes()
+            with self._lock:
+                self._window_peak = max(self._window_peak, rss)
+                self.peak_rss = max(self.peak_rss, rss)
+
+    def begin_task(self) -> None:
+        """비디오 하나의 첫 단계(content) 구간을 시작합니다."""
+        rss = _rss_bytes()
+        with self._lock:
+            self._window_started = (time.perf_counter(), _cpu_seconds())
+            self._window_peak = rss
+
+    def on_stage(self, creator: str, task_id: str, stage: str) -> None:
+        """checkpoint stage listener: 방금 완료된 단계의 구간을 닫고 다음 구간을 시작합니다."""
+        now, cpu, rss = time.perf_counter(), _cpu_seconds(), _rss_bytes()
+        with self._lock:
+            started_at, started_cpu = self._window_started
+            self.stages.setdefault(stage, []).append({
+                "wall": now - started_at,
+                "cpu": cpu - started_cpu,
+                "peak_rss": max(self._window_peak, rss),
+            })
+            self._window_started = (now, cpu)
+            self._window_peak = rss
+
+    def summary(self, stage_order: List[str]) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            stages = {stage: list(windows) for stage, windows in self.stages.items()}
+        result = {}
+        for stage in stage_order:
+            windows = stages.get(stage)
+            if not windows:
+                continue
+            walls = [window["wall"] for window in windows]
+            cpu = sum(window["cpu"] for window in windows)
+            result[stage] = {
+                "count": len(windows),
+                "wall_p50": _percentile(walls, 0.50),
+                "wall_p95": _percentile(walls, 0.95),
+                "cpu_seconds": cpu,
+                # 1.0 = CPU 코어 하나를 계속 사용 (ffmpeg 멀티스레드 인코딩은 1을 넘을 수 있습니다)
+                "cpu_utilization": cpu / sum(walls) if sum(walls) > 0 else 0.0,
+                "peak_rss_mb": max(window["peak_rss"] for window in windows) / (1024 * 1024),
+            }
+        return result
+
+
+def run_worker(case_path: str) -> None:
+    """케이스 하나를 현재 작업 디렉토리에서 실행하고 결과를 result.json에 기록합니다 (하위 프로세스)."""
+    with open(case_path, "r", encoding="utf-8") as f:
+        case = json.load(f)
+
+    from src.cli import ShortFactoryCLI
+    from src.utils.checkpoint import STAGES, add_stage_listener
+    from src.utils.metrics import metrics
+    from src.utils.tracing import latency_summary
+    from src.providers.fake_google import get_fake_google_store
+    from src.providers.cassette import replay_from
+    from src.providers.settings import fault_stats
+
+    creator = case["creator"]
+    cli = ShortFactoryCLI(creator=creator, model=case["model"])
+
+    # 벤치마크용 주제 큐를 fake 시트에 채웁니다
+    sheet_name = cli.sheets_manager._get_creator_sheet_name(creator)
+    created = datetime.now() - timedelta(days=1)
+    get_fake_google_store().seed_sheet(SPREADSHEET_ID, sheet_name, [
+        [case.get("subject") or f"Benchmark subject {i + 1}",
+         (created + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S")]
+        for i in range(case["videos"])
+    ])
+    subjects = cli.sheets_manager.get_next_subjects(SPREADSHEET_ID, creator, case["videos"])
+
+    monitor = StageMonitor()
+    add_stage_listener(monitor.on_stage)
+    monitor.start()
+    latencies, errors = [], []
+    started, started_cpu = time.perf_counter(), _cpu_seconds()
+    task_ids = [str(uuid.uuid4()) for _ in subjects]
+    try:
+        # SHORTFACTORY_BATCH_CONTENT가 설정되면 콘텐츠 플랜을 묶어서 먼저 생성합니다 (wall time에 포함)
+        cli.plan_contents(subjects, task_ids)
+        for subject, task_id in zip(subjects, task_ids):
+            if case.get("cassette"):
+                replay_from(task_id, case["cassette"])
+            monitor.begin_task()
+            task_started = time.perf_counter()
+            try:
+                if cli.process_subject(subject, task_id):
+                    latencies.append(time.perf_counter() - task_started)
+                else:
+                    errors.append(f"{task_id}: pipeline returned False")
+            except Exception as e:
+                errors.append(f"{task_id}: {type(e).__name__}: {e}")
+    finally:
+        monitor.stop()
+    wall = time.perf_counter() - started
+
+    result = {
+        "case": case["case"],
+        "videos": len(subjects),
+        "succeeded": len(latencies),
+        "failed": len(errors),
+        "errors": errors[:5],
+        "wall_seconds": wall,
+        "videos_per_hour": len(latencies) / wall * 3600 if wall > 0 else 0.0,
+        "video_latency": {
+            "p50": _percentile(latencies, 0.50),
+            "p95": _percentile(latencies, 0.95),
+            "max": max(latencies) if latencies else 0.0,
+        },
+        "output_video_seconds": metrics.get("shortfactory_output_video_seconds_total"),
+        "cpu_utilization": (_cpu_seconds() - started_cpu) / wall if wall > 0 else 0.0,
+        "peak_rss_mb": monitor.peak_rss / (1024 * 1024),
+        "stages": monitor.summary(STAGES),
+        "external_calls": latency_summary(),
+        "faults": fault_stats(),
+    }
+    with open("result.json", "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+
+
+def build_cases(args) -> List[Dict[str, Any]]:
+    if args.replay_task:
+        # 기록된 콘텐츠는 고정되어 있으므로 씬 수/스크립트 길이/이미지 크기 조합을 만들지 않습니다
+        return [{"replay_task": args.replay_task}]
+    cases = []
+    for scenes, sentences, size in itertools.product(args.scenes, args.script_sentences, args.image_sizes):
+        width, height = (int(value) for value in size.lower().split("x"))
+        cases.append({"scenes": scenes, "script_sentences": sentences, "image_width": width, "image_height": height})
+    return cases
+
+
+def case_key(case: Dict[str, Any]) -> str:
+    if "replay_task" in case:
+        return f"replay={case['replay_task']}"
+    return f"scenes={case['scenes']} sentences={case['script_sentences']} image={case['image_width']}x{case['image_height']}"
+
+
+def _fake_config(case: Dict[str, Any], time_scale: Optional[float]) -> Dict[str, Any]:
+    """기본 fake 설정에 케이스의 콘텐츠 플랜/이미지 크기를 덮어씁니다."""
+    import yaml
+    with open(BASE_FAKE_CONFIG, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+    if "scenes" in case:
+        config.setdefault("content_plan", {}).update(scenes=case["scenes"], script_sentences=case["script_sentences"])
+        config.setdefault("image", {}).update(width=case["image_width"], height=case["image_height"])
+    if time_scale is not None:
+        config["time_scale"] = time_scale
+    return config
+
+
+def _replay_source(workspace: str, creator: str, task_id: str) -> Dict[str, Any]:
+    """기록된 task의 cassette를 작업 디렉토리로 복사하고 주제를 읽습니다."""
+    task_dir = os.path.join(PROJECT_ROOT, "data", creator, task_id)
+    source = os.path.join(task_dir, "cassette")
+    if not os.path.exists(os.path.join(source, "interactions.jsonl")):
+        raise ValueError(f"No cassette recorded for task {task_id} (run it with SHORTFACTORY_PROVIDERS=record)")
+    with open(os.path.join(task_dir, "manifest.json"), "r", encoding="utf-8") as f:
+        subject = (json.load(f).get("subject") or {}).get("subject")
+    cassette = os.path.join(workspace, "cassette")
+    shutil.copytree(source, cassette)
+    return {"cassette": cassette, "subject": subject}
+
+
+def run_case(case: Dict[str, Any], args) -> Dict[str, Any]:
+    """임시 작업 디렉토리를 만들고 하위 프로세스에서 케이스를 실행합니다."""
+    import yaml
+    workspace = tempfile.mkdtemp(prefix="shortfactory-bench-")
+    try:
+        for name in SHARED_DIRS:
+            os.symlink(os.path.join(PROJECT_ROOT, name), os.path.join(workspace, name))
+        config_path = os.path.join(workspace, "fake_providers.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.safe_dump(_fake_config(case, args.time_scale), f)
+        worker_case = {"case": case, "creator": args.creator, "model": args.model, "videos": args.videos}
+        if "replay_task" in case:
+            worker_case.update(_replay_source(workspace, args.creator, case["replay_task"]))
+        case_path = os.path.join(workspace, "case.json")
+        with open(case_path, "w", encoding="utf-8") as f:
+            json.dump(worker_case, f)
+
+        env = dict(
+            os.environ,
+            PYTHONPATH=os.pathsep.join(filter(None, [PROJECT_ROOT, os.environ.get("PYTHONPATH")])),
+            SHORTFACTORY_PROVIDERS="replay" if "replay_task" in case else "fake",
+            SHORTFACTORY_FAKE_CONFIG=config_path,
+            GOOGLE_SHEETS_ID=SPREADSHEET_ID,
+            SHORTFACTORY_STREAM_CONTENT="1" if args.stream_content else "0",
+            SHORTFACTORY_BATCH_CONTENT=str(args.batch_content),
+        )
+        log_path = os.path.join(workspace, "worker.log")
+        with open(log_path, "wb") as log:
+            process = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--worker", case_path],
+                cwd=workspace, env=env, stdout=log, stderr=subprocess.STDOUT,
+            )
+        result_path = os.path.join(workspace, "result.json")
+        if process.returncode != 0 or not os.path.exists(result_path):
+            with open(log_path, "r", encoding="utf-8", errors="replace") as f:
+                tail = f.read()[-4000:]
+            raise RuntimeError(f"Benchmark worker failed for {case_key(case)}:\n{tail}")
+        with open(result_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    finally:
+        if args.keep_workspace:
+            print(f"Workspace kept: {workspace}")
+        else:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+
+def git_revision() -> Dict[str, Any]:
+    def git(*command):
+        result = subprocess.run(["git", *command], cwd=PROJECT_ROOT, capture_output=True, text=True)
+        return result.stdout.strip() if result.returncode == 0 else ""
+    return {"commit": git("rev-parse", "HEAD") or None, "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    print("\n=== Throughput Benchmark ===")
+    print(f"Commit: {results['commit'] or 'unknown'}{' (dirty)' if results['dirty'] else ''}")
+    print(f"{'case':<42} {'ok':>5} {'videos/h':>9} {'p50 (s)':>9} {'p95 (s)':>9} {'cpu':>6} {'rss MB':>8}")
+    for result in results["cases"]:
+        print(
+            f"{case_key(result['case']):<42} {result['succeeded']:>2}/{result['videos']:<2} "
+            f"{result['videos_per_hour']:>9.1f} {result['video_latency']['p50']:>9.2f} "
+            f"{result['video_latency']['p95']:>9.2f} {result['cpu_utilization']:>6.2f} {result['peak_rss_mb']:>8.1f}"
+        )
+        for stage, stats in result["stages"].items():
+            print(
+                f"    {stage:<12} p50 {stats['wall_p50']:>7.2f}s  p95 {stats['wall_p95']:>7.2f}s  "
+                f"cpu {stats['cpu_utilization']:>5.2f}  rss {stats['peak_rss_mb']:>7.1f} MB"
+            )
+        for error in result["errors"]:
+            print(f"    ⚠️ {error}")
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], max_regression: Optional[float]) -> List[str]:
+    """baseline과 같은 케이스의 videos/hour와 p95 지연을 비교하고 회귀 목록을 반환합니다."""
+    previous = {case_key(result["case"]): result for result in baseline.get("cases", [])}
+    failures = []
+    print(f"\n=== Compared with {baseline.get('commit') or 'baseline'} ===")
+    for result in results["cases"]:
+        key = case_key(result["case"])
+        old = previous.get(key)
+        if not old or not old["videos_per_hour"]:
+            print(f"{key:<42} (no baseline)")
+            continue
+        change = (result["videos_per_hour"] - old["videos_per_hour"]) / old["videos_per_hour"] * 100
+        p95_change = result["video_latency"]["p95"] - old["video_latency"]["p95"]
+        print(f"{key:<42} videos/h {change:+7.1f}%   p95 {p95_change:+8.2f}s")
+        if max_regression is not None and change < -max_regression:
+            failures.append(f"{key}: videos/hour {change:+.1f}% (limit -{max_regression}%)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure end-to-end ShortFactory throughput against fake providers")
+    parser.add_argument("--videos", type=int, default=3, help="Videos per case")
+    parser.add_argument("--scenes", type=int, nargs="+", default=[4], help="Scene counts to benchmark")
+    parser.add_argument("--script-sentences", type=int, nargs="+", default=[1], help="Sentences per scene script")
+    parser.add_argument("--image-sizes", nargs="+", default=["1024x1024"], help="Generated image sizes (WIDTHxHEIGHT)")
+    parser.add_argument("--time-scale", type=float, help="Override the fake provider latency multiplier (0 = no waiting)")
+    parser.add_argument("--replay-task", help="Replay this recorded task's cassette instead of synthetic content")
+    parser.add_argument("--creator", default="science_fact", help="Creator config to use (config/prompts/<creator>.yml)")
+    parser.add_argument("--model", choices=["gemini", "gpt-4o"], default="gemini", help="Model to use")
+    parser.add_argument("--stream-content", action="store_true", help="Stream the content plan and start images/narrations early")
+    parser.add_argument("--batch-content", type=int, default=0, help="Plan this many videos per LLM request (0 = one per video)")
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare with a previous --json result")
+    parser.add_argument("--max-regression", type=float, help="Fail if videos/hour drops by more than this percent")
+    parser.add_argument("--keep-workspace", action="store_true", help="Keep each case's data directory and worker log")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker)
+        return
+
+    results: Dict[str, Any] = {
+        **git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "settings": {
+            "videos": args.videos,
+            "creator": args.creator,
+            "model": args.model,
+            "time_scale": args.time_scale,
+            "stream_content": args.stream_content,
+            "batch_content": args.batch_content,
+        },
+        "cases": [],
+    }
+    for case in build_cases(args):
+        print(f"Running {case_key(case)} ({args.videos} video(s))...", flush=True)
+        results["cases"].append(run_case(case, args))
+
+    print_results(results)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            failures = compare(results, json.load(f), args.max_regression)
+        if failures:
+            print("\n❌ Regression detected:")
+            for failure in failures:
+                print(f"  - {failure}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
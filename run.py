@@ -6,6 +6,7 @@ ShortFactory CLI 실행 스크립트
 import os
 import sys
 import json
+import argparse
 from dotenv import load_dotenv
 
 # Add the project root directory to Python path
@@ -15,7 +16,7 @@ sys.path.insert(0, project_root)
 # Load environment variables from .env file in project root
 load_dotenv(os.path.join(project_root, '.env'))
 
-from src.cli import ShortFactoryCLI, get_user_input
+from src.cli import ShortFactoryCLI, get_user_input, replay_task, resume_tasks
 from src.core.content.content_generator import ContentGenerator
 from src.core.visual.visual_director import VisualDirector
 from src.core.audio.narration_generator import NarrationGenerator
@@ -24,8 +25,103 @@ from src.utils.logger import Logger
 import uuid
 
 
+def parse_args():
+    """명령행 인자를 파싱합니다. 인자가 없으면 대화형 모드로 실행됩니다."""
+    parser = argparse.ArgumentParser(description="Short Factory")
+    subparsers = parser.add_subparsers(dest="command")
+
+    resume_parser = subparsers.add_parser("resume", help="Resume interrupted tasks from their checkpoints")
+    resume_parser.add_argument("--creator", required=True, help="Creator name (config/prompts/<creator>.yml)")
+    resume_parser.add_argument("--task-id", help="Task ID to resume (default: all incomplete tasks)")
+    resume_parser.add_argument("--model", choices=["gemini", "gpt-4o"], help="Override the model recorded in the manifest")
+
+    replay_parser = subparsers.add_parser("replay", help="Re-run a recorded task from its cassette without network calls")
+    replay_parser.add_argument("--creator", required=True, help="Creator name (config/prompts/<creator>.yml)")
+    replay_parser.add_argument("--task-id", required=True, help="Task recorded with SHORTFACTORY_PROVIDERS=record")
+    replay_parser.add_argument("--model", choices=["gemini", "gpt-4o"], help="Override the model recorded in the manifest")
+
+    daemon_parser = subparsers.add_parser("daemon", help="Run headless, continuously draining the subject queue")
+    daemon_parser.add_argument("--config", default=os.path.join("config", "daemon.yaml"), help="Daemon config file")
+    daemon_parser.add_argument("--creators", nargs="+", help="Creators to serve (default: all)")
+    daemon_parser.add_argument("--model", choices=["gemini", "gpt-4o"], help="Model to use")
+    daemon_parser.add_argument("--concurrency", type=int, help="Videos processed in parallel")
+    daemon_parser.add_argument("--poll-interval", type=float, help="Seconds between polls when the queue is empty")
+    daemon_parser.add_argument("--max-videos-per-hour", type=int, help="Throughput target (0 = unlimited)")
+    daemon_parser.add_argument("--max-videos", type=int, help="Stop after this many videos (0 = until SIGTERM)")
+    daemon_parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this port (0 = disabled)")
+
+    schedule_parser = subparsers.add_parser("schedule", help="Run all creators concurrently with per-creator quotas")
+    schedule_parser.add_argument("--config", default=os.path.join("config", "scheduler.yaml"), help="Scheduler config file")
+    schedule_parser.add_argument("--model", choices=["gemini", "gpt-4o"], help="Model to use")
+    schedule_parser.add_argument("--concurrency", type=int, help="Videos processed in parallel across all creators")
+    schedule_parser.add_argument("--ffmpeg-jobs", type=int, help="Maximum concurrent ffmpeg encodes")
+    schedule_parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this port (0 = disabled)")
+
+    stats_parser = subparsers.add_parser("stats", help="Refresh YouTube statistics in the creator sheet")
+    stats_parser.add_argument("--creator", required=True, help="Creator name (config/prompts/<creator>.yml)")
+    stats_parser.add_argument("--force", action="store_true", help="Refresh every video regardless of its refresh schedule")
+
+    serve_parser = subparsers.add_parser("serve", help="Run the HTTP job submission service")
+    serve_parser.add_argument("--host", default="0.0.0.0", help="Bind address")
+    serve_parser.add_argument("--port", type=int, default=8000, help="Port")
+    serve_parser.add_argument("--concurrency", type=int, default=2, help="Videos processed in parallel")
+    serve_parser.add_argument("--max-pending", type=int, default=100, help="Queued jobs before new submissions are rejected")
+
+    return parser.parse_args()
+
+
 def main():
     """CLI의 메인 진입점입니다."""
+    args = parse_args()
+    if args.command == "resume":
+        completed = resume_tasks(args.creator, task_id=args.task_id, model=args.model)
+        print(f"\nResumed {completed} task(s).")
+        return
+    if args.command == "replay":
+        # cassette와 메모리 fake만 사용하므로 실제 시트 ID가 없어도 됩니다
+        os.environ["SHORTFACTORY_PROVIDERS"] = "replay"
+        os.environ.setdefault("GOOGLE_SHEETS_ID", "replay")
+        replay_id = replay_task(args.creator, args.task_id, model=args.model)
+        if replay_id:
+            print(f"\nReplayed into task {replay_id} (data/{args.creator}/{replay_id}).")
+        return
+    if args.command == "daemon":
+        from src.daemon import FactoryDaemon
+        daemon = FactoryDaemon.from_config(
+            args.config,
+            creators=args.creators,
+            model=args.model,
+            concurrency=args.concurrency,
+            poll_interval=args.poll_interval,
+            max_videos_per_hour=args.max_videos_per_hour,
+            max_videos=args.max_videos,
+            metrics_port=args.metrics_port,
+        )
+        daemon.install_signal_handlers()
+        daemon.run()
+        return
+    if args.command == "schedule":
+        from src.scheduler import CreatorScheduler
+        scheduler = CreatorScheduler.from_config(
+            args.config,
+            model=args.model,
+            concurrency=args.concurrency,
+            ffmpeg_jobs=args.ffmpeg_jobs,
+            metrics_port=args.metrics_port,
+        )
+        scheduler.install_signal_handlers()
+        scheduler.run()
+        return
+    if args.command == "serve":
+        from src.api.job_service import run_server
+        run_server(host=args.host, port=args.port, concurrency=args.concurrency, max_pending=args.max_pending)
+        return
+    if args.command == "stats":
+        from src.utils.sheets_manager import SheetsManager
+        sheets_manager = SheetsManager(creator=args.creator)
+        sheets_manager.update_video_statistics(sheets_manager.spreadsheet_id, args.creator, force=args.force)
+        return
+
     try:
         print("environment variables loaded: ", os.getenv("GOOGLE_API_KEY"))
         print("\n=== Short Factory ===")        
@@ -0,0 +1,326 @@
+"""Job submission HTTP service
+
+POST /jobs로 비디오 생성 작업을 받아 제한된 크기의 비동기 큐에 넣고, 워커 코루틴이
+스레드 풀에서 기존 파이프라인(ShortFactoryCLI.process_subject)을 실행합니다.
+- GET /jobs/{job_id}: 작업 상태
+- GET /jobs/{job_id}/events: 단계별 진행 상황 (Server-Sent Events)
+- GET /jobs/{job_id}/video: 완성된 MP4 (Range 요청 지원, aiofiles로 스트리밍)
+- GET /metrics: Prometheus 메트릭
+
+파이프라인은 스레드에서 실행되므로 이벤트 루프는 항상 다른 요청을 처리할 수 있습니다.
+작업 ID는 파이프라인의 task ID와 같으므로 중단된 작업은 `run.py resume`으로 이어서 실행할 수 있습니다.
+"""
+import os
+import json
+import uuid
+import asyncio
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Tuple
+import aiofiles
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from .metrics_server import router as metrics_router
+from ..cli import ShortFactoryCLI, get_creator_options
+from ..utils.checkpoint import STAGES, TaskCheckpoint, add_stage_listener, remove_stage_listener
+from ..utils.logger import Logger
+
+
+# 범위 요청 응답을 읽을 때의 청크 크기
+STREAM_CHUNK_SIZE = 256 * 1024
+# 작업이 끝난 뒤 SSE 연결을 유지할 필요가 없으므로 keep-alive 주석만 주기적으로 보냅니다
+SSE_KEEPALIVE_SECONDS = 15
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+
+class JobRequest(BaseModel):
+    creator: str = Field(..., description="Creator name (config/prompts/<creator>.yml)")
+    subject: str = Field(..., min_length=1, description="Video subject")
+    model: Literal["gemini", "gpt-4o"] = "gemini"
+
+
+class Job:
+    def __init__(self, request: JobRequest):
+        self.job_id = str(uuid.uuid4())
+        self.creator = request.creator
+        self.subject = request.subject
+        self.model = request.model
+        self.status = "queued"
+        self.created_at = datetime.now().isoformat()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.error: Optional[str] = None
+        self.events: List[Dict[str, Any]] = []
+        self._subscribers: List[asyncio.Queue] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "creator": self.creator,
+            "subject": self.subject,
+            "model": self.model,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "stages_completed": [event["stage"] for event in self.events if event["event"] == "stage"],
+        }
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """이벤트를 기록하고 구독자에게 전달합니다 (이벤트 루프 스레드에서만 호출)."""
+        event = dict(event, job_id=self.job_id, ts=datetime.now().isoformat())
+        self.events.append(event)
+        for subscriber in self._subscribers:
+            subscriber.put_nowait(event)
+
+    def subscribe(self) -> Tuple[asyncio.Queue, List[Dict[str, Any]]]:
+        """새 구독 큐와 지금까지의 이벤트를 반환합니다."""
+        subscriber: asyncio.Queue = asyncio.Queue()
+        self._subscribers.append(subscriber)
+        return subscriber, list(self.events)
+
+    def unsubscribe(self, subscriber: asyncio.Queue) -> None:
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+
+
+class JobManager:
+    def __init__(self, concurrency: int = 2, max_pending: int = 100):
+        """
+        Args:
+            concurrency (int): 동시에 실행할 파이프라인 수 (스레드 풀 크기)
+            max_pending (int): 대기 큐의 최대 길이. 가득 차면 새 작업을 거절합니다 (503)
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.logger = Logger()
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="job-worker")
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        add_stage_listener(self._on_stage_completed)
+
+    async def stop(self) -> None:
+        remove_stage_listener(self._on_stage_completed)
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        # 실행 중인 파이프라인은 체크포인트에 남으므로 기다리지 않습니다
+        self._executor.shutdown(wait=False)
+
+    def submit(self, request: JobRequest) -> Job:
+        """작업을 큐에 넣습니다. 큐가 가득 차면 asyncio.QueueFull을 발생시킵니다."""
+        job = Job(request)
+        self._queue.put_nowait(job)
+        self.jobs[job.job_id] = job
+        job.publish({"event": "status", "status": "queued", "position": self._queue.qsize()})
+        return job
+
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    def _on_stage_completed(self, creator: str, task_id: str, stage: str) -> None:
+        # 파이프라인 스레드에서 호출되므로 이벤트 루프로 넘겨 처리합니다
+        job = self.jobs.get(task_id)
+        if job is None or self._loop is None:
+            return
+        event = {"event": "stage", "stage": stage, "index": STAGES.index(stage) + 1, "total": len(STAGES)}
+        self._loop.call_soon_threadsafe(job.publish, event)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.status = "running"
+        job.started_at = datetime.now().isoformat()
+        job.publish({"event": "status", "status": "running"})
+        try:
+            completed = await self._loop.run_in_executor(self._executor, self._run_pipeline, job)
+            job.status = "succeeded" if completed else "failed"
+            if not completed:
+                job.error = "Pipeline did not complete (see logs)"
+        except Exception as e:
+            self.logger.error(f"Job {job.job_id} failed: {str(e)}")
+            traceback.print_exc()
+            job.status = "failed"
+            job.error = str(e)
+        job.finished_at = datetime.now().isoformat()
+        job.publish({"event": "status", "status": job.status, "error": job.error})
+
+    @staticmethod
+    def _run_pipeline(job: Job) -> bool:
+        """스레드 풀에서 기존 파이프라인으로 비디오를 생성하고 업로드합니다."""
+        cli = ShortFactoryCLI(creator=job.creator, model=job.model)
+        subject = {
+            'subject': job.subject,
+            'creation_time': job.created_at,
+            # 시트에 없는 주제는 업로드 후 새 행으로 추가됩니다
+            'row_index': None,
+        }
+        return cli.process_subject(subject, job.job_id)
+
+
+def parse_range(header: str, file_size: int) -> Optional[Tuple[int, int]]:
+    """Range 헤더(bytes=start-end, bytes=-suffix)를 (start, end) 포함 범위로 변환합니다.
+
+    Returns:
+        Optional[Tuple[int, int]]: 범위. 헤더를 해석할 수 없으면 None
+
+    Raises:
+        ValueError: 파일 범위를 벗어난 요청 (416)
+    """
+    if not header.startswith("bytes=") or "," in header:
+        return None  # 여러 범위 요청은 지원하지 않으므로 전체 파일로 응답
+    start_text, separator, end_text = header[len("bytes="):].strip().partition("-")
+    try:
+        start = int(start_text) if start_text else None
+        end = int(end_text) if end_text else None
+    except ValueError:
+        return None
+    if not separator or (start is None and end is None):
+        return None
+    if start is None:
+        # 마지막 end 바이트 요청
+        if end == 0:
+            raise ValueError(f"Range not satisfiable: {header}")
+        return max(0, file_size - end), file_size - 1
+    if end is None:
+        end = file_size - 1
+    if start >= file_size or start > end:
+        raise ValueError(f"Range not satisfiable: {header}")
+    return start, min(end, file_size - 1)
+
+
+async def _read_file(path: str, start: int, length: int) -> AsyncIterator[bytes]:
+    async with aiofiles.open(path, "rb") as f:
+        await f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = await f.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def create_app(concurrency: int = 2, max_pending: int = 100) -> FastAPI:
+    manager = JobManager(concurrency=concurrency, max_pending=max_pending)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        await manager.start()
+        try:
+            yield
+        finally:
+            await manager.stop()
+
+    app = FastAPI(title="Short Factory", lifespan=lifespan)
+    app.state.job_manager = manager
+    app.include_router(metrics_router)
+
+    def get_job(job_id: str) -> Job:
+        job = manager.jobs.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+        return job
+
+    @app.post("/jobs", status_code=202)
+    async def submit_job(request: JobRequest) -> Dict[str, Any]:
+        if request.creator not in get_creator_options():
+            raise HTTPException(status_code=404, detail=f"Unknown creator: {request.creator}")
+        try:
+            job = manager.submit(request)
+        except asyncio.QueueFull:
+            raise HTTPException(
+                status_code=503,
+                detail=f"Job queue is full ({manager.max_pending} pending)",
+                headers={"Retry-After": "60"},
+            )
+        return job.to_dict()
+
+    @app.get("/jobs/{job_id}")
+    async def job_status(job_id: str) -> Dict[str, Any]:
+        return get_job(job_id).to_dict()
+
+    @app.get("/jobs/{job_id}/events")
+    async def job_events(job_id: str, request: Request) -> StreamingResponse:
+        job = get_job(job_id)
+
+        async def stream() -> AsyncIterator[str]:
+            subscriber, history = job.subscribe()
+            try:
+                for event in history:
+                    yield f"event: {event['event']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+                while job.status not in TERMINAL_STATUSES or not subscriber.empty():
+                    if await request.is_disconnected():
+                        return
+                    try:
+                        event = await asyncio.wait_for(subscriber.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                    except asyncio.TimeoutError:
+                        yield ": keep-alive\n\n"
+                        continue
+                    yield f"event: {event['event']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+            finally:
+                job.unsubscribe(subscriber)
+
+        return StreamingResponse(
+            stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    @app.get("/jobs/{job_id}/video")
+    async def job_video(job_id: str, request: Request) -> Response:
+        job = get_job(job_id)
+        try:
+            checkpoint = TaskCheckpoint.load(job.creator, job.job_id)
+        except FileNotFoundError:
+            checkpoint = None
+        if checkpoint is None or not checkpoint.manifest["stages"].get("assembly"):
+            raise HTTPException(status_code=404, detail="Video is not ready yet")
+        video_path = checkpoint.get_outputs("assembly")["video_path"]
+        if not os.path.exists(video_path):
+            raise HTTPException(status_code=404, detail="Video file is missing")
+
+        file_size = os.path.getsize(video_path)
+        headers = {"Accept-Ranges": "bytes"}
+        try:
+            byte_range = parse_range(request.headers.get("range", ""), file_size)
+        except ValueError:
+            return Response(status_code=416, headers={"Content-Range": f"bytes */{file_size}"})
+
+        if byte_range is None:
+            start, end, status_code = 0, file_size - 1, 200
+        else:
+            (start, end), status_code = byte_range, 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+        length = end - start + 1
+        headers["Content-Length"] = str(length)
+        return StreamingResponse(
+            _read_file(video_path, start, length), status_code=status_code, media_type="video/mp4", headers=headers
+        )
+
+    return app
+
+
+def run_server(host: str = "0.0.0.0", port: int = 8000, concurrency: int = 2, max_pending: int = 100) -> None:
+    import uvicorn
+    uvicorn.run(create_app(concurrency=concurrency, max_pending=max_pending), host=host, port=port)
@@ -0,0 +1,46 @@
+"""Prometheus metrics endpoint for long-running workers
+
+데몬/스케줄러 프로세스 안에서 별도 스레드로 uvicorn을 실행하고
+GET /metrics로 src/utils/metrics.py의 값을 Prometheus text 형식으로 제공합니다.
+"""
+import threading
+from typing import Optional
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import PlainTextResponse
+from ..utils.metrics import metrics
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics() -> PlainTextResponse:
+    # 동기 핸들러는 스레드 풀에서 실행되므로 collector가 잠금을 기다려도 이벤트 루프를 막지 않습니다
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
+
+
+def create_metrics_app() -> FastAPI:
+    app = FastAPI(title="Short Factory Metrics")
+    app.include_router(router)
+    return app
+
+
+_server_thread: Optional[threading.Thread] = None
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> threading.Thread:
+    """백그라운드 데몬 스레드에서 메트릭 서버를 시작합니다 (프로세스당 한 번)."""
+    global _server_thread
+    if _server_thread is not None and _server_thread.is_alive():
+        return _server_thread
+
+    import uvicorn
+    config = uvicorn.Config(create_metrics_app(), host=host, port=port, log_level="warning", access_log=False)
+    server = uvicorn.Server(config)
+    # 시그널 처리는 메인 스레드의 데몬이 담당합니다
+    server.install_signal_handlers = lambda: None
+    _server_thread = threading.Thread(target=server.run, name="metrics-server", daemon=True)
+    _server_thread.start()
+    return _server_thread
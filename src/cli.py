@@ -3,13 +3,23 @@ import json
 import uuid
 import traceback
 from datetime import datetime
+from typing import Dict, Any, List, Optional
 from .core.content.content_generator import ContentGenerator
 from .core.visual.visual_director import VisualDirector
 from .core.audio.narration_generator import NarrationGenerator
 from .core.video.video_assembler import VideoAssembler
 from .utils.sheets_manager import SheetsManager
 from .utils.youtube_manager import YouTubeManager
-from config.styles import image_styles
+from .utils.checkpoint import TaskCheckpoint
+from .utils.upload_queue import UploadQueue, defer_upload
+from .utils.quota_ledger import QuotaExceeded, get_quota_ledger
+from .utils.tracing import format_latency_summary, span, task_trace
+from .utils.section_prefetch import SectionPrefetcher
+
+# 1이면 콘텐츠 플랜을 스트리밍으로 받고 완성된 섹션의 이미지/나레이션 생성을 바로 시작합니다
+STREAM_CONTENT_ENV = "SHORTFACTORY_STREAM_CONTENT"
+# N(2 이상)이면 run()이 주제 N개의 콘텐츠 플랜을 LLM 요청 하나로 미리 생성합니다
+BATCH_CONTENT_ENV = "SHORTFACTORY_BATCH_CONTENT"
 
 def get_creator_options() -> list[str]:
     """Get available creator options from the prompts directory."""
@@ -49,27 +59,48 @@ def get_user_input() -> str:
     return creator
 
 class ShortFactoryCLI:
-    def __init__(self, creator: str, model: str = "gemini"):
-        self.task_id = str(uuid.uuid4())
+    def __init__(self, creator: str, model: str = "gemini", upload_concurrency: int = 2, stream_content: Optional[bool] = None,
+                 batch_content: Optional[int] = None):
+        self.task_id = None
         self.creator = creator  # 크리에이터 저장
         self.model = model.lower()  # 모델 저장
-        self.content_generator = ContentGenerator(self.task_id, model)
-        self.visual_director = VisualDirector(self.task_id, creator, model)
-        self.narration_generator = NarrationGenerator(self.task_id, creator)
+        # 콘텐츠 플랜 스트리밍 (기본값: SHORTFACTORY_STREAM_CONTENT 환경 변수)
+        if stream_content is None:
+            stream_content = os.getenv(STREAM_CONTENT_ENV, "0").lower() in ("1", "true", "yes")
+        self.stream_content = stream_content
+        # 요청 하나에 묶을 콘텐츠 플랜 수 (기본값: SHORTFACTORY_BATCH_CONTENT 환경 변수, 1 이하는 사용 안 함)
+        if batch_content is None:
+            batch_content = int(os.getenv(BATCH_CONTENT_ENV, "0") or 0)
+        self.batch_content = batch_content
+        self.prefetcher = None
+        # run()에서는 렌더링이 끝난 비디오를 백그라운드 업로드 큐로 넘깁니다
+        self.upload_concurrency = upload_concurrency
+        self.upload_queue = None
         self.sheets_manager = SheetsManager(creator=creator)
+        self.youtube_manager = YouTubeManager(creator)
         
         # Get Google Sheets ID from environment variable
         self.spreadsheet_id = os.getenv('GOOGLE_SHEETS_ID')
         if not self.spreadsheet_id:
             raise ValueError("GOOGLE_SHEETS_ID environment variable is not set.")
     
+    def _init_task(self, task_id: str) -> TaskCheckpoint:
+        """비디오 하나(task)를 위한 생성기와 체크포인트를 초기화합니다."""
+        self.task_id = task_id
+        self.checkpoint = TaskCheckpoint(task_id, self.creator, self.model)
+        self.content_generator = ContentGenerator(task_id, self.model)
+        self.visual_director = VisualDirector(task_id, self.creator, self.model)
+        self.narration_generator = NarrationGenerator(task_id, self.creator)
+        self.video_assembler = VideoAssembler(task_id, self.creator)
+        self.prefetcher = None
+        return self.checkpoint
+    
     def run(self) -> bool:
         """Run the CLI"""
         try:
             print("\n=== Short Factory CLI ===")
             print(f"Creator: {self.creator}")
             print(f"Model: {self.model}")
-            print(f"Task ID: {self.task_id}")
             print(f"Spreadsheet ID: {self.spreadsheet_id}")
             
             # 비디오 생성 개수 입력
@@ -84,154 +115,447 @@ class ShortFactoryCLI:
             
             print(f"\nGenerating {num_videos} videos...")
             
-            success_count = 0
-            for i in range(num_videos):
-                print(f"\n=== Generating Video {i+1}/{num_videos} ===")
-                
-                # Initialize VideoAssembler with creator
-                self.video_assembler = VideoAssembler(self.task_id, self.creator)
-                
-                # Get next subject from Google Sheets
-                next_subject = self.sheets_manager.get_next_subject(self.spreadsheet_id, self.creator)
-                if not next_subject:
-                    print("\nNo pending subjects found in Google Sheets.")
-                    break
-                
-                print(f"\nProcessing subject: {next_subject['subject']}")
-                print(f"Created at: {next_subject['creation_time']}")
-                print(f"Task ID: {self.task_id}")
-                print(f"Row index: {next_subject['row_index']}")
-                
-                # Initialize YouTube manager with creator
-                self.youtube_manager = YouTubeManager(self.creator)
-                
-                # 1. Generate content
+            # Get the next subjects from Google Sheets with a single read
+            subjects = self.sheets_manager.get_next_subjects(self.spreadsheet_id, self.creator, num_videos)
+            if len(subjects) < num_videos:
+                print(f"\nOnly {len(subjects)} pending subjects found in Google Sheets.")
+            
+            # 오늘 남은 YouTube quota로 업로드할 수 있는 만큼만 렌더링합니다
+            render_now, deferred = get_quota_ledger().plan_uploads(self.youtube_manager.quota_project, len(subjects))
+            if deferred:
+                print(f"\nYouTube quota allows {render_now} more upload(s) today; "
+                      f"deferring {deferred} subject(s) to the next quota window.")
+                subjects = subjects[:render_now]
+            
+            # 배치 전체의 업로드 슬롯을 한 번에 할당 (겹치지 않는 연속 슬롯)
+            upload_slots = self.sheets_manager.get_upload_slots(self.creator, len(subjects)) if subjects else []
+            
+            # 업로드는 별도 워커가 처리하고, 메인 스레드는 바로 다음 비디오를 생성합니다
+            self.upload_queue = UploadQueue(self.creator, self.publish_job, self.upload_concurrency)
+            self.upload_queue.recover()
+            self.upload_queue.start()
+            
+            # 비디오마다 새로운 task ID 사용
+            planned_ids = [str(uuid.uuid4()) for _ in subjects]
+            task_ids = []
+            try:
+                self.plan_contents(subjects, planned_ids)
+                for i, (next_subject, upload_slot, task_id) in enumerate(zip(subjects, upload_slots, planned_ids)):
+                    print(f"\n=== Generating Video {i+1}/{len(subjects)} ===")
+                    print(f"Upload slot: {upload_slot}")
+                    
+                    if self.process_subject(next_subject, task_id, upload_slot=upload_slot):
+                        task_ids.append(task_id)
+            finally:
+                print(f"\nWaiting for {self.upload_queue.pending()} upload(s) to finish...")
+                results = self.upload_queue.join()
+                self.upload_queue = None
+            
+            success_count = sum(1 for task_id in task_ids if results.get(task_id))
+            print(f"\n=== Generation Complete ===")
+            print(f"Successfully generated and uploaded {success_count} out of {num_videos} videos")
+            print("\n=== External Call Latency ===")
+            print(format_latency_summary())
+            return True
+
+        except Exception as e:
+            print(f"\n[!] Error occurred: {str(e)}")
+            traceback.print_exc()
+            return False
+    
+    def plan_contents(self, subjects: List[Dict[str, Any]], task_ids: List[str]) -> int:
+        """배치 모드에서 주제들의 콘텐츠 플랜을 batch_content개씩 묶어 미리 생성합니다.
+
+        생성된 플랜은 각 task의 content 단계로 저장되므로 process_subject는 체크포인트에서
+        불러옵니다. 배치에서 생성하지 못한 주제는 process_subject가 평소처럼 하나씩 생성합니다.
+
+        Args:
+            subjects (List[Dict[str, Any]]): 처리할 주제 목록
+            task_ids (List[str]): 주제마다 사용할 task ID
+
+        Returns:
+            int: 미리 생성한 콘텐츠 플랜 수
+        """
+        if self.batch_content < 2 or len(subjects) < 2:
+            return 0
+        from .providers.settings import provider_mode
+        if provider_mode() in ("record", "replay"):
+            # cassette는 task 단위이므로 여러 task에 걸친 요청은 기록하거나 재생할 수 없습니다
+            print("\nBatch content planning is disabled while recording or replaying provider calls.")
+            return 0
+        generator = ContentGenerator(f"content-batch-{uuid.uuid4()}", self.model)
+        pending = list(zip(subjects, task_ids))
+        planned = 0
+        for start in range(0, len(pending), self.batch_content):
+            batch = pending[start:start + self.batch_content]
+            print(f"\n=== Planning {len(batch)} videos in one request ===")
+            try:
+                with span("stage.content_batch", subjects=len(batch)):
+                    content_plans = generator.generate_contents(self.creator, [subject['subject'] for subject, _ in batch])
+            except Exception as e:
+                print(f"\n[!] Batch content generation failed, planning these videos one by one: {str(e)}")
+                continue
+            for (subject, task_id), content_plan in zip(batch, content_plans):
+                if content_plan is None:
+                    continue
+                checkpoint = TaskCheckpoint(task_id, self.creator, self.model)
+                checkpoint.set_subject(subject)
+                checkpoint.complete_stage("content", {"content_plan": content_plan})
+                planned += 1
+        return planned
+    
+    def resume(self, task_id: str) -> bool:
+        """체크포인트에서 중단된 작업을 이어서 실행합니다."""
+        checkpoint = TaskCheckpoint.load(self.creator, task_id)
+        if checkpoint.is_finished():
+            print(f"\nTask {task_id} is already finished.")
+            return True
+        if not checkpoint.subject:
+            raise ValueError(f"No subject recorded for task: {task_id}")
+        
+        print(f"\n=== Resuming Task {task_id} ===")
+        return self.process_subject(checkpoint.subject, task_id)
+    
+    def process_subject(self, next_subject: Dict[str, Any], task_id: str, upload_slot: Optional[datetime] = None) -> bool:
+        """주제 하나를 처리합니다. 완료된 단계는 체크포인트에서 불러와 건너뜁니다.
+
+        Args:
+            next_subject (Dict[str, Any]): 처리할 주제
+            task_id (str): Task ID
+            upload_slot (datetime, optional): 미리 할당된 업로드 시간. 없으면 업로드 직전에 할당합니다.
+                업로드하지 못한 경우 슬롯은 반환됩니다.
+        """
+        # 이 task의 체크포인트 (_init_task가 실패하면 None)
+        checkpoint = None
+        try:
+            with task_trace(task_id, self.creator):
+                try:
+                    checkpoint = self._init_task(task_id)
+                    completed = self._process_subject(checkpoint, next_subject, upload_slot)
+                finally:
+                    self._close_prefetcher()
+        except QuotaExceeded as e:
+            # 렌더링이 끝난 비디오는 실패로 처리하지 않고 다음 quota 기간의 업로드 큐에 넣습니다
+            print(f"\n⏸ {str(e)}")
+            defer_upload(self.creator, {'task_id': task_id, 'subject': next_subject}, e.retry_at)
+            return True
+        except Exception:
+            self._release_slot(checkpoint, upload_slot)
+            raise
+        if not completed:
+            self._release_slot(checkpoint, upload_slot)
+        return completed
+    
+    def _start_prefetcher(self, checkpoint: TaskCheckpoint) -> Optional[SectionPrefetcher]:
+        """스트리밍 모드에서 아직 완료되지 않은 visuals/narrations 작업을 섹션 단위로 미리 시작합니다."""
+        if not self.stream_content:
+            return None
+        jobs = {}
+        if not checkpoint.is_complete("visuals"):
+            jobs["visuals"] = self.visual_director.create_scene_image
+        if not checkpoint.is_complete("narrations"):
+            jobs["narrations"] = self.narration_generator.generate_narration
+        self.prefetcher = SectionPrefetcher(jobs) if jobs else None
+        return self.prefetcher
+    
+    def _close_prefetcher(self) -> None:
+        # 실패한 task의 남은 섹션 작업은 취소하고, 실행 중인 작업은 trace를 기록하기 전에 끝냅니다
+        if self.prefetcher is not None:
+            self.prefetcher.close()
+            self.prefetcher = None
+    
+    def _prefetched(self, kind: str):
+        return self.prefetcher.taker(kind) if self.prefetcher is not None else None
+    
+    def _release_slot(self, checkpoint: Optional[TaskCheckpoint], upload_slot: Optional[datetime]) -> None:
+        # 업로드가 끝난 작업의 슬롯은 이미 사용된 것이므로 반환하지 않습니다
+        # (체크포인트를 만들기 전에 실패했다면 업로드도 하지 않은 것)
+        if upload_slot and (checkpoint is None or not checkpoint.is_complete("upload")):
+            self.sheets_manager.release_upload_slot(self.creator, upload_slot)
+    
+    def _process_subject(self, checkpoint: TaskCheckpoint, next_subject: Dict[str, Any], upload_slot: Optional[datetime]) -> bool:
+        task_id = checkpoint.task_id
+        checkpoint.set_subject(next_subject)
+        
+        print(f"\nProcessing subject: {next_subject['subject']}")
+        print(f"Created at: {next_subject['creation_time']}")
+        print(f"Task ID: {task_id}")
+        print(f"Row index: {next_subject['row_index']}")
+        
+        # 1. Generate content
+        if checkpoint.is_complete("content"):
+            print("\n[1/6] Content plan loaded from checkpoint")
+            content_plan = checkpoint.get_outputs("content")["content_plan"]
+        else:
+            prefetcher = self._start_prefetcher(checkpoint)
+            with span("stage.content", stream=prefetcher is not None):
                 content_plan = self.content_generator.generate_content(
                     self.creator,
-                    next_subject['subject']
+                    next_subject['subject'],
+                    on_section=prefetcher.submit if prefetcher else None
                 )
-                print("\n=== Content Plan ===")
-                print(json.dumps(content_plan, indent=2, ensure_ascii=False))
-
-                # 2. Generate visual assets
-                visuals = self.visual_director.create_visuals(
-                    content_plan,
-                    self.creator
+            checkpoint.complete_stage("content", {"content_plan": content_plan})
+            print("\n=== Content Plan ===")
+            print(json.dumps(content_plan, indent=2, ensure_ascii=False))
+        
+        if checkpoint.is_complete("upload"):
+            print("\n[2-5/6] Video already uploaded, skipping render")
+        else:
+            # 2. Generate visual assets
+            if checkpoint.is_complete("visuals"):
+                print("\n[2/6] Visuals loaded from checkpoint")
+                content_plan = checkpoint.get_outputs("visuals")["content_plan"]
+            else:
+                with span("stage.visuals"):
+                    content_plan = self.visual_director.create_visuals(
+                        content_plan,
+                        self.creator,
+                        prefetched=self._prefetched("visuals")
+                    )
+                checkpoint.invalidate("assembly")
+                checkpoint.complete_stage(
+                    "visuals", {"content_plan": content_plan}, files=self._image_paths(content_plan)
                 )
                 print("\n=== Generated Visuals ===")
-                print(json.dumps(visuals, indent=2, ensure_ascii=False))
-
-                # 3. Generate audio
-                audio = self.narration_generator.generate_narrations(content_plan)
+                print(json.dumps(content_plan, indent=2, ensure_ascii=False))
+            
+            # 3. Generate audio
+            if checkpoint.is_complete("narrations"):
+                print("\n[3/6] Narrations loaded from checkpoint")
+            else:
+                with span("stage.narrations"):
+                    audio = self.narration_generator.generate_narrations(
+                        content_plan, prefetched=self._prefetched("narrations")
+                    )
+                checkpoint.invalidate("assembly")
+                checkpoint.complete_stage(
+                    "narrations", {"narrations": audio}, files=self._audio_paths(audio)
+                )
                 print("\n=== Generated Audio ===")
                 print(json.dumps(audio, indent=2, ensure_ascii=False))
-
-                # 4. Assemble video
-                print("\n[4/4] Assembling video")
+            
+            # 4. Assemble video
+            if checkpoint.is_complete("assembly"):
+                print("\n[4/6] Video loaded from checkpoint")
+                video_path = checkpoint.get_outputs("assembly")["video_path"]
+            else:
+                print("\n[4/6] Assembling video")
                 print("\nAssembling video...")
-                video_path = self.video_assembler.assemble_video(
-                    content_id=str(uuid.uuid4()),
-                    content_data=content_plan
-                )
-                print(f"\n✅ SUCCESS: Video created at {video_path}")
-                
-                # 5. Upload to YouTube
-                print("\n[5/5] Uploading to YouTube")
-                try:
-                    # 다음 업로드 시간 계산
-                    next_upload_time = self.sheets_manager.get_next_available_time(self.creator)
-                    
-                    # 해시태그 설정
-                    tags = content_plan.get('hashtags', [])
-
-                    # 비디오 제목 설정
-                    title = content_plan.get('video_title', '')
-                    if not title:
-                        raise ValueError("Video title is not set.")
-                    
-                    # 비디오 설명 설정
-                    description = content_plan.get('video_description', '')
-                    
-                    # 공개 설정 (기본값: private)
-                    privacy_status = 'private'
-                    
-                    # 업로드 설정 확인
-                    print("\nUpload settings:")
-                    print(f"Title: {title}")
-                    print(f"Description: {description}")
-                    print(f"Tags: {' '.join(tags)}")
-                    print(f"Privacy: {privacy_status}")
-                    print(f"Scheduled time: {next_upload_time}")
-                    
-                    youtube_title = title+' '.join(tags)
-                    youtube_title = youtube_title[:100] # less than 100 characters
-                    youtube_description = description+' '.join(tags)
-                    youtube_description = youtube_description[:5000] # less than 5000 characters
-
-                    # YouTube 업로드
-                    metadata = {
-                        'title': youtube_title,
-                        'description': youtube_description,
-                        'tags': tags,
-                        'privacyStatus': privacy_status
-                    }
-                    
-                    response = self.youtube_manager.upload_video(
-                        video_path=video_path,
-                        metadata=metadata,
-                        scheduled_time=next_upload_time,
+                with span("stage.assembly") as assembly:
+                    video_path = self.video_assembler.assemble_video(
+                        content_id=str(uuid.uuid4()),
                         content_data=content_plan
                     )
-                    
-                    print(f"\n✅ SUCCESS: Video uploaded to YouTube")
-                    print(f"Video ID: {response.get('id')}")
-                    print(f"Video URL: https://youtube.com/watch?v={response.get('id')}")
-                    print(f"Scheduled for: {next_upload_time}")
-                    
-                    # 비디오 정보 업데이트
-                    video_id = response.get('id')
-                    video_url = f"https://youtube.com/watch?v={video_id}"
-                    
-                    # 먼저 비디오 정보를 저장하고 행 번호를 받아옵니다
-                    row_index = self.sheets_manager.save_video_info(
-                        spreadsheet_id=self.spreadsheet_id,
-                        content_plan=content_plan,
-                        task_id=self.task_id,
-                        creator=self.creator,
-                        video_id=video_id,
-                        video_url=video_url,
-                        row_index=next_subject['row_index']
-                    )
-                    
-                    if row_index:
-                        # 저장된 행 번호를 사용하여 상태 업데이트
-                        self.sheets_manager.update_video_info(
-                            spreadsheet_id=self.spreadsheet_id,
-                            task_id=self.task_id,
-                            creator=self.creator,
-                            updates={
-                                'video_id': video_id,
-                                'video_url': video_url,
-                                'status': 'uploaded'
-                            },
-                            row_index=row_index
-                        )
-                        success_count += 1
-                    else:
-                        print("\n⚠️ Warning: Could not update video status in Google Sheets")
-                
-                except Exception as e:
-                    print(f"\n⚠️ Error uploading to YouTube: {str(e)}")
-                    continue
+                    assembly.set(bytes=os.path.getsize(video_path))
+                checkpoint.complete_stage("assembly", {"video_path": video_path}, files=[video_path])
+            print(f"\n✅ SUCCESS: Video created at {video_path}")
             
-            print(f"\n=== Generation Complete ===")
-            print(f"Successfully generated and uploaded {success_count} out of {num_videos} videos")
+            if self.upload_queue is not None:
+                self.upload_queue.submit({
+                    'task_id': task_id,
+                    'subject': next_subject,
+                    'upload_slot': upload_slot.isoformat() if upload_slot else None,
+                })
+                print("\n[5/6] Queued for background upload")
+                return True
+        
+        return self._publish(checkpoint, next_subject, content_plan, upload_slot)
+    
+    def publish_job(self, job: Dict[str, Any]) -> bool:
+        """업로드 큐의 작업 하나를 업로드하고 시트를 갱신합니다 (업로드 워커 스레드에서 실행)."""
+        checkpoint = TaskCheckpoint.load(self.creator, job['task_id'])
+        if checkpoint.is_finished():
             return True
+        stage = "visuals" if checkpoint.is_complete("visuals") else "content"
+        content_plan = checkpoint.get_outputs(stage)["content_plan"]
+        upload_slot = datetime.fromisoformat(job['upload_slot']) if job.get('upload_slot') else None
+        with task_trace(job['task_id'], self.creator):
+            return self._publish(checkpoint, job['subject'], content_plan, upload_slot)
+    
+    def _publish(self, checkpoint: TaskCheckpoint, next_subject: Dict[str, Any], content_plan: Dict[str, Any], upload_slot: Optional[datetime]) -> bool:
+        """업로드(5단계)와 시트 갱신(6단계)을 실행합니다. self의 task 상태에 의존하지 않습니다."""
+        if checkpoint.is_complete("upload"):
+            upload = checkpoint.get_outputs("upload")
+        else:
+            video_path = checkpoint.get_outputs("assembly")["video_path"]
+            
+            # 5. Upload to YouTube
+            print("\n[5/6] Uploading to YouTube")
+            # 미리 할당된 슬롯이 없으면 다음 업로드 시간을 할당
+            if upload_slot is None:
+                upload_slot = self.sheets_manager.get_next_available_time(self.creator)
+            try:
+                with span("stage.upload"):
+                    upload = self._upload_video(content_plan, video_path, upload_slot)
+            except QuotaExceeded:
+                self.sheets_manager.release_upload_slot(self.creator, upload_slot)
+                # 다른 워커가 이 주제를 다시 가져가지 않도록 행을 업로드 대기 상태로 표시합니다
+                self.sheets_manager.update_video_info(
+                    spreadsheet_id=self.spreadsheet_id,
+                    task_id=checkpoint.task_id,
+                    creator=self.creator,
+                    updates={'task_id': checkpoint.task_id, 'status': 'awaiting_upload'},
+                    row_index=next_subject['row_index']
+                )
+                raise
+            except Exception as e:
+                print(f"\n⚠️ Error uploading to YouTube: {str(e)}")
+                self.sheets_manager.release_upload_slot(self.creator, upload_slot)
+                return False
+            checkpoint.complete_stage("upload", upload)
+        
+        # 6. Update Google Sheets
+        print("\n[6/6] Updating Google Sheets")
+        video_id = upload['video_id']
+        video_url = upload['video_url']
+        
+        with span("stage.sheets"):
+            # 먼저 비디오 정보를 저장하고 행 번호를 받아옵니다
+            row_index = self.sheets_manager.save_video_info(
+                spreadsheet_id=self.spreadsheet_id,
+                content_plan=content_plan,
+                task_id=checkpoint.task_id,
+                creator=self.creator,
+                video_id=video_id,
+                video_url=video_url,
+                row_index=next_subject['row_index'],
+                scheduled_time=datetime.fromisoformat(upload['scheduled_time']) if upload.get('scheduled_time') else None
+            )
+        
+            if not row_index:
+                print("\n⚠️ Warning: Could not update video status in Google Sheets")
+                return False
+        
+            # 저장된 행 번호를 사용하여 상태 업데이트
+            self.sheets_manager.update_video_info(
+                spreadsheet_id=self.spreadsheet_id,
+                task_id=checkpoint.task_id,
+                creator=self.creator,
+                updates={
+                    'video_id': video_id,
+                    'video_url': video_url,
+                    'status': 'uploaded'
+                },
+                row_index=row_index
+            )
+        checkpoint.complete_stage("sheets", {"row_index": row_index})
+        return True
+    
+    def _upload_video(self, content_plan: Dict[str, Any], video_path: str, next_upload_time: datetime) -> Dict[str, Any]:
+        """YouTube에 비디오를 업로드하고 결과를 반환합니다."""
+        # 해시태그 설정
+        tags = content_plan.get('hashtags', [])
+
+        # 비디오 제목 설정
+        title = content_plan.get('video_title', '')
+        if not title:
+            raise ValueError("Video title is not set.")
+        
+        # 비디오 설명 설정
+        description = content_plan.get('video_description', '')
+        
+        # 공개 설정 (기본값: private)
+        privacy_status = 'private'
+        
+        # 업로드 설정 확인
+        print("\nUpload settings:")
+        print(f"Title: {title}")
+        print(f"Description: {description}")
+        print(f"Tags: {' '.join(tags)}")
+        print(f"Privacy: {privacy_status}")
+        print(f"Scheduled time: {next_upload_time}")
+        
+        youtube_title = title+' '.join(tags)
+        youtube_title = youtube_title[:100] # less than 100 characters
+        youtube_description = description+' '.join(tags)
+        youtube_description = youtube_description[:5000] # less than 5000 characters
 
+        # YouTube 업로드
+        metadata = {
+            'title': youtube_title,
+            'description': youtube_description,
+            'tags': tags,
+            'privacyStatus': privacy_status
+        }
+        
+        response = self.youtube_manager.upload_video(
+            video_path=video_path,
+            metadata=metadata,
+            scheduled_time=next_upload_time,
+            content_data=content_plan
+        )
+        
+        video_id = response.get('id')
+        print(f"\n✅ SUCCESS: Video uploaded to YouTube")
+        print(f"Video ID: {video_id}")
+        print(f"Video URL: https://youtube.com/watch?v={video_id}")
+        print(f"Scheduled for: {next_upload_time}")
+        
+        return {
+            'video_id': video_id,
+            'video_url': f"https://youtube.com/watch?v={video_id}",
+            'scheduled_time': next_upload_time.isoformat() if next_upload_time else None,
+        }
+    
+    @staticmethod
+    def _image_paths(content_plan: Dict[str, Any]) -> List[str]:
+        sections = [content_plan.get("hook", {})] + content_plan.get("scenes", []) + [content_plan.get("conclusion", {})]
+        return [section["image_path"] for section in sections if section.get("image_path")]
+    
+    @staticmethod
+    def _audio_paths(narrations: Dict[str, Any]) -> List[str]:
+        items = [narrations.get("hook", {})] + narrations.get("scenes", []) + [narrations.get("conclusion", {})]
+        return [item["audio_path"] for item in items if item.get("audio_path")]
+
+def resume_tasks(creator: str, task_id: Optional[str] = None, model: Optional[str] = None) -> int:
+    """중단된 작업을 재개합니다. task_id가 없으면 크리에이터의 모든 미완료 작업을 재개합니다.
+
+    Returns:
+        int: 성공적으로 완료된 작업 수
+    """
+    task_ids = [task_id] if task_id else TaskCheckpoint.list_incomplete(creator)
+    if not task_ids:
+        print(f"\nNo incomplete tasks found for {creator}.")
+        return 0
+    
+    completed = 0
+    for resume_id in task_ids:
+        checkpoint = TaskCheckpoint.load(creator, resume_id)
+        cli = ShortFactoryCLI(creator=creator, model=model or checkpoint.model or "gemini")
+        try:
+            if cli.resume(resume_id):
+                completed += 1
         except Exception as e:
-            print(f"\n[!] Error occurred: {str(e)}")
+            print(f"\n[!] Error resuming task {resume_id}: {str(e)}")
             traceback.print_exc()
-            return False
+    return completed
+
+def replay_task(creator: str, task_id: str, model: Optional[str] = None) -> Optional[str]:
+    """녹화된 task의 cassette로 파이프라인을 새 task에서 다시 실행합니다.
+
+    SHORTFACTORY_PROVIDERS=replay 에서 호출해야 합니다. LLM/이미지/TTS 응답은 cassette에서,
+    Google Sheets/YouTube는 메모리 fake에서 처리하므로 네트워크 호출이 없습니다.
+
+    Returns:
+        Optional[str]: 성공하면 새 task ID
+    """
+    from .providers.cassette import Cassette, cassette_dir, replay_from
+    from .providers.settings import provider_mode
+    if provider_mode() != "replay":
+        raise ValueError("replay_task requires SHORTFACTORY_PROVIDERS=replay")
+    
+    source = TaskCheckpoint.load(creator, task_id)
+    if not source.subject:
+        raise ValueError(f"No subject recorded for task: {task_id}")
+    cassette_path = cassette_dir(creator, task_id)
+    if not Cassette(cassette_path).exists():
+        raise ValueError(f"No cassette recorded for task: {task_id} (run it with SHORTFACTORY_PROVIDERS=record)")
+    
+    replay_id = str(uuid.uuid4())
+    replay_from(replay_id, cassette_path)
+    print(f"\n=== Replaying Task {task_id} as {replay_id} ===")
+    cli = ShortFactoryCLI(creator=creator, model=model or source.model or "gemini")
+    return replay_id if cli.process_subject(source.subject, replay_id) else None
 
 def main():
     """Main entry point for the CLI."""
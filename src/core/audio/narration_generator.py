@@ -7,18 +7,17 @@
 - 음성 파일 저장 및 관리
 """
 
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional
 from ...utils.logger import Logger
+from ...utils import rate_limiter
 import os
-from dotenv import load_dotenv
-from elevenlabs.client import ElevenLabs
+from ...utils.client_pool import get_client_pool
+from ...utils.tracing import span
 import time
-import ffmpeg
 
 class NarrationGenerator:
     def __init__(self, task_id: str, creator: str):
         self.logger = Logger()
-        self.ELEVENLABS_API_KEY = "ELEVENLABS_API_KEY"
         self._setup_elevenlabs()
         self.task_id = task_id
         self.creator = creator
@@ -27,34 +26,30 @@ class NarrationGenerator:
         os.makedirs(self.narrations_dir, exist_ok=True)
     
     def _setup_elevenlabs(self):
-        """Set up ElevenLabs API key."""
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        load_dotenv(os.path.join(project_root, '.env'))
-
-        if not os.getenv(self.ELEVENLABS_API_KEY):
-            raise ValueError(
-                "ElevenLabs API key not found. Please set the ELEVENLABS_API_KEY environment variable "
-                "in your .env file or system environment variables."
-            )
-        
-        self.client = ElevenLabs(api_key=os.getenv(self.ELEVENLABS_API_KEY))
+        """Set up ElevenLabs client (shared from the process-wide pool)."""
+        self.client = get_client_pool().get_elevenlabs_client()
     
     def _get_audio_duration(self, audio_path: str) -> float:
         """오디오 파일의 실제 길이를 측정합니다."""
+        import ffmpeg
         try:
-            probe = ffmpeg.probe(audio_path)
+            with span("ffmpeg.probe", category="external"):
+                probe = ffmpeg.probe(audio_path)
             audio_info = next(s for s in probe['streams'] if s['codec_type'] == 'audio')
             return float(audio_info['duration'])
         except Exception as e:
             self.logger.error(f"Error getting audio duration: {str(e)}")
             raise
     
-    def generate_narrations(self, content_plan: Dict[str, Any]) -> Dict[str, Any]:
+    def generate_narrations(self, content_plan: Dict[str, Any],
+                            prefetched: Optional[Callable[[str, Dict[str, Any]], Optional[Dict[str, Any]]]] = None) -> Dict[str, Any]:
         """
         콘텐츠 계획을 바탕으로 나레이션을 생성합니다.
 
         Args:
             content_plan (Dict[str, Any]): 콘텐츠 계획 정보
+            prefetched (Callable, optional): prefetched(scene_name, scene)가 미리 생성한 나레이션 정보를
+                반환하면 그 결과를 사용하고, None이면 여기서 생성합니다.
 
         Returns:
             Dict[str, Any]: 생성된 나레이션 정보
@@ -62,16 +57,20 @@ class NarrationGenerator:
         self.logger.section("Narration generation started")
         self.logger.info(f"Task ID: {self.task_id}")
         
+        def narration(scene: Dict[str, Any], scene_name: str) -> Dict[str, Any]:
+            result = prefetched(scene_name, scene) if prefetched else None
+            return result or self.generate_narration(scene, scene_name)
+
         try:
             narrations = {
-                "hook": self._generate_narration(content_plan["hook"], "hook"),
+                "hook": narration(content_plan["hook"], "hook"),
                 "scenes": [],
-                "conclusion": self._generate_narration(content_plan["conclusion"], "conclusion")
+                "conclusion": narration(content_plan["conclusion"], "conclusion")
             }
             
             # Generate narration for each scene
             for i, scene in enumerate(content_plan["scenes"], 1):
-                scene_narration = self._generate_narration(scene, f"scene_{i}")
+                scene_narration = narration(scene, f"scene_{i}")
                 narrations["scenes"].append(scene_narration)
             
             self.logger.success("Narration generation completed successfully")
@@ -81,9 +80,9 @@ class NarrationGenerator:
             self.logger.error(f"Error generating narrations: {str(e)}")
             raise e
     
-    def _generate_narration(self, scene: Dict[str, Any], scene_name: str) -> Dict[str, Any]:
+    def generate_narration(self, scene: Dict[str, Any], scene_name: str) -> Dict[str, Any]:
         """
-        개별 장면의 스크립트를 음성으로 변환합니다.
+        개별 장면의 스크립트를 음성으로 변환합니다 (콘텐츠 플랜 스트리밍 중에 미리 호출될 수 있습니다).
 
         Args:
             scene (Dict[str, Any]): 장면 정보
@@ -97,24 +96,30 @@ class NarrationGenerator:
             self.logger.info(f"Generating narration for {scene_name}...")
             
             # Generate audio with exaggerated voice settings
-            audio = self.client.text_to_speech.convert(
-                text=scene["script"],
-                voice_id="5Q0t7uMcjvnagumLfvZi",  # Josh voice
-                model_id="eleven_multilingual_v2",
-                output_format="mp3_44100_128",
-                voice_settings={
-                    "stability": 0.5,
-                    "similarity_boost": 0.75,
-                    "style": 0.8,
-                    "use_speaker_boost": True
-                }
-            )
-            
-            # Save audio file
+            rate_limiter.acquire("tts", self.creator)
+            # convert()는 스트림을 반환하므로 파일에 모두 쓸 때까지를 한 번의 호출로 측정합니다
             output_path = os.path.join(self.narrations_dir, f"{scene_name}.mp3")
-            with open(output_path, "wb") as f:
-                for chunk in audio:
-                    f.write(chunk)
+            with span("tts.elevenlabs", category="external", scene=scene_name) as call:
+                audio = self.client.text_to_speech.convert(
+                    text=scene["script"],
+                    voice_id="5Q0t7uMcjvnagumLfvZi",  # Josh voice
+                    model_id="eleven_multilingual_v2",
+                    output_format="mp3_44100_128",
+                    voice_settings={
+                        "stability": 0.5,
+                        "similarity_boost": 0.75,
+                        "style": 0.8,
+                        "use_speaker_boost": True
+                    }
+                )
+
+                # Save audio file
+                written = 0
+                with open(output_path, "wb") as f:
+                    for chunk in audio:
+                        f.write(chunk)
+                        written += len(chunk)
+                call.set(bytes=written)
             
             # Get audio duration
             duration = self._get_audio_duration(output_path)
@@ -1,11 +1,31 @@
 import json
 import os
-from typing import Dict, Any
-import openai
-from dotenv import load_dotenv
-from .prompts import get_content_plan_prompt
+import re
+import time
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+from .prompts import get_batch_content_plan_prompt, get_content_plan_prompt, normalize_subject
+from .schema import (
+    CONTENT_PLAN_SCHEMA, apply_repair, batch_schema, gemini_schema, openai_response_format,
+    repair_instructions, repair_schema, repair_targets, validate,
+)
+from .stream_parser import ContentPlanStreamParser
 from ...utils.logger import Logger
-from google import genai
+from ...utils import rate_limiter
+from ...utils.client_pool import get_client_pool
+from ...utils.metrics import metrics
+from ...utils.tracing import span
+
+# 검증에 실패한 필드만 다시 요청하는 횟수 (이후에는 전체 콘텐츠 플랜을 다시 생성)
+MAX_REPAIR_ATTEMPTS = 2
+# 수정으로 고치지 못했을 때 전체 콘텐츠 플랜을 다시 생성하는 횟수
+MAX_REGENERATIONS = 1
+
+_CODE_FENCE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+
+def strip_code_fence(text: str) -> str:
+    """응답 앞뒤의 마크다운 코드 블록 표시만 제거합니다 (본문 안의 ```는 그대로 둡니다)."""
+    return _CODE_FENCE.sub("", text or "")
 
 
 class ContentGenerator:
@@ -18,25 +38,23 @@ class ContentGenerator:
         os.makedirs(self.output_dir, exist_ok=True)
 
     def _setup_llm(self):
-        """Set up LLM connection."""
-        # Load environment variables from .env file in project root
-        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        print(project_root)
-        load_dotenv(os.path.join(project_root, '.env'))
-
-        
+        """Set up LLM connection (shared client from the process-wide pool)."""
         if self.model == "gemini":
-            self.client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+            self.client = get_client_pool().get_gemini_client()
         else:
-            if not os.getenv("OPENAI_API_KEY"):
-                raise ValueError(
-                    "OpenAI API key not found. Please set the OPENAI_API_KEY environment variable "
-                    "in your .env file or system environment variables."
-                )
-            self.client = openai.OpenAI()
+            self.client = get_client_pool().get_openai_client()
     
-    def generate_content(self, creator: str, detail: str) -> Dict:
-        """Generate content plan for the given topic."""
+    def generate_content(self, creator: str, detail: str,
+                         on_section: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict:
+        """Generate content plan for the given topic.
+
+        Args:
+            creator (str): 크리에이터
+            detail (str): 주제
+            on_section (Callable, optional): 주어지면 응답을 스트리밍으로 받고, hook/각 씬/conclusion
+                객체가 완성될 때마다 on_section(섹션 이름, 섹션)을 호출합니다 (예: "scene_2").
+                반환되는 콘텐츠 플랜은 스트리밍하지 않을 때와 같습니다.
+        """
         self.logger.section("Content Generation Started")
         self.logger.info(f"Creator: {creator}")
         self.logger.info(f"Detail: {detail}")
@@ -46,98 +64,294 @@ class ContentGenerator:
         # Save prompt to file
         with open(os.path.join(self.output_dir, "content_plan_prompt.txt"), "w") as f: 
             f.write(system_prompt)
-        # Log prompt
-        self.logger.subsection("Prompt")
-        self.logger.subsection(system_prompt)
+        # Log prompt (긴 프롬프트는 로거가 잘라서 해시와 함께 기록, 전체는 위 파일에 있음)
+        self.logger.prompt("Prompt", system_prompt)
         
         # Get LLM response
         self.logger.process(f"Requesting content generation from {self.model}")
-        response = self._get_llm_response(system_prompt)
+        rate_limiter.acquire("llm", creator)
+        response = self._get_llm_response(system_prompt, on_section)
         
-        # Log response
-        self.logger.subsection("Generated Content")
+        # Log response (전체 응답은 content_plan_response.txt에 저장됨)
         self.logger.result("Content Plan", response)
         
         # Parse response into structured format
         self.logger.process("Parsing response...")
-        content_plan = self._parse_llm_response(response)
+        content_plan = self._parse_llm_response(response, system_prompt, creator)
         
         self.logger.success("Content generation completed successfully")
         return content_plan
+
+    def generate_contents(self, creator: str, details: List[str]) -> List[Optional[Dict]]:
+        """Generate content plans for several topics with a single LLM request.
+
+        크리에이터 프롬프트를 한 번만 보내고 주제마다 하나씩 콘텐츠 플랜을 받습니다.
+        각 플랜은 따로 검증하고 수정(repair)하며, 빠졌거나 고치지 못한 주제만 모아서
+        MAX_REGENERATIONS번 다시 요청합니다.
+
+        Args:
+            creator (str): 크리에이터
+            details (List[str]): 주제 목록
+
+        Returns:
+            List[Optional[Dict]]: 주제 순서대로의 콘텐츠 플랜 (끝내 생성하지 못한 주제는 None)
+        """
+        self.logger.section("Batch Content Generation Started")
+        self.logger.info(f"Creator: {creator}")
+        self.logger.info(f"Subjects: {len(details)}")
+
+        content_plans: List[Optional[Dict]] = [None] * len(details)
+        pending = list(range(len(details)))
+        for attempt in range(MAX_REGENERATIONS + 1):
+            if attempt:
+                metrics.inc("shortfactory_content_regenerations_total", len(pending), model=self.model)
+                self.logger.warning(f"Retrying {len(pending)} content plan(s) that failed in the batch")
+            prompt = get_batch_content_plan_prompt(creator, [details[i] for i in pending])
+            with open(os.path.join(self.output_dir, "content_plan_batch_prompt.txt"), "w") as f:
+                f.write(prompt)
+            self.logger.prompt("Prompt", prompt)
+
+            self.logger.process(f"Requesting {len(pending)} content plans from {self.model}")
+            rate_limiter.acquire("llm", creator)
+            response = self._get_llm_response(prompt, schema=batch_schema(), schema_name="content_plan_batch",
+                                              purpose="batch")
+            candidates = self._split_batch_response(response, [details[i] for i in pending])
+
+            for index, candidate in zip(list(pending), candidates):
+                content_plan = self._validate_batch_plan(candidate, creator, details[index])
+                if content_plan is not None:
+                    content_plans[index] = content_plan
+                    pending.remove(index)
+            if not pending:
+                break
+
+        for content_plan in content_plans:
+            metrics.inc("shortfactory_content_batch_plans_total", model=self.model,
+                        result="failed" if content_plan is None else "ok")
+        self.logger.success(f"Batch content generation completed: {len(details) - len(pending)}/{len(details)} plans")
+        return content_plans
+
+    def _split_batch_response(self, response: str, details: List[str]) -> List[Any]:
+        """배치 응답을 주제 순서대로의 플랜 목록으로 나눕니다 (없는 주제는 None).
+
+        응답의 subject가 요청한 주제와 같으면 그 주제에, 그렇지 않으면 순서대로 배정합니다.
+        """
+        try:
+            items = json.loads(strip_code_fence(response)).get("plans")
+        except (json.JSONDecodeError, AttributeError) as e:
+            self.logger.error(f"Error parsing batch response: {str(e)}")
+            items = None
+        if not isinstance(items, list):
+            return [None] * len(details)
+
+        candidates: List[Any] = [None] * len(details)
+        positions = {normalize_subject(detail): i for i, detail in enumerate(details)}
+        unmatched = []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            index = positions.pop(normalize_subject(item.get("subject", "")), None)
+            if index is None:
+                unmatched.append(item.get("plan"))
+            else:
+                candidates[index] = item.get("plan")
+        for index, content_plan in zip(sorted(positions.values()), unmatched):
+            candidates[index] = content_plan
+        return candidates
+
+    def _validate_batch_plan(self, content_plan: Any, creator: str, detail: str) -> Optional[Dict]:
+        """배치에서 받은 플랜 하나를 검증하고 필요하면 그 주제의 프롬프트로 수정합니다."""
+        if not isinstance(content_plan, dict) or not content_plan:
+            return None
+        errors = validate(content_plan)
+        if errors:
+            content_plan, errors = self._repair_until_valid(
+                content_plan, errors, get_content_plan_prompt(creator, detail), creator
+            )
+        return None if errors else content_plan
     
-    def _get_llm_response(self, prompt: str) -> str:
-        """Get response from LLM."""
-        if self.model == "gemini":
-            response_content = self._get_llm_response_gemini(prompt)
-        elif self.model == "gpt-4o":
-            response_content = self._get_llm_response_gpt4o(prompt)
-        else:
+    def _get_llm_response(self, prompt: str, on_section: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                          schema: Dict[str, Any] = CONTENT_PLAN_SCHEMA, schema_name: str = "content_plan",
+                          purpose: str = "plan") -> str:
+        """Get response from LLM.
+
+        Args:
+            prompt (str): 프롬프트
+            on_section (Callable, optional): 스트리밍으로 받을 때 섹션 콜백
+            schema (Dict): 응답 JSON 스키마 (provider의 구조화 출력 모드로 전달)
+            schema_name (str): OpenAI json_schema 이름 ("content_plan", "content_plan_repair", "content_plan_batch")
+            purpose (str): "plan", "repair", "regenerate", "batch" (span 속성과 저장 파일 이름에 사용)
+        """
+        if self.model not in ("gemini", "gpt-4o"):
             raise ValueError(f"Invalid model: {self.model}")
+        with span(f"llm.{self.model}", category="external", prompt_bytes=len(prompt.encode("utf-8")),
+                  stream=on_section is not None, purpose=purpose) as call:
+            if on_section is not None:
+                response_content = self._stream_llm_response(prompt, on_section, call, schema, schema_name)
+            elif self.model == "gemini":
+                response_content = self._get_llm_response_gemini(prompt, schema)
+            else:
+                response_content = self._get_llm_response_gpt4o(prompt, schema, schema_name)
+            call.set(bytes=len((response_content or "").encode("utf-8")))
 
         # Save response to file
-        self._save_llm_response(response_content)
+        self._save_llm_response(response_content, purpose)
         return response_content
 
-    def _get_llm_response_gemini(self, prompt: str) -> str:
+    def _get_llm_response_gemini(self, prompt: str, schema: Dict[str, Any]) -> str:
         self.logger.api_call("Google", "Gemini", "Requesting content generation")
         response = self.client.models.generate_content(
             model="gemini-1.5-flash",
-            contents=prompt
+            contents=prompt,
+            config=self._gemini_config(schema)
         )
         
-        # 응답 텍스트 추출
-        response_text = response.candidates[0].content.parts[0].text
-        print(f"response_text: {response_text}")
-        # JSON 형식으로 변환
-        try:
-            # 마크다운 코드 블록 제거
-            response_text = response_text.replace("```json", "").replace("```", "")
-            # JSON 형식 검증
-            # json.loads(response_text)
-            print(f"response_text after: {response_text}")
-            return response_text
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Error converting response to JSON: {str(e)}")
-            return None
+        # 응답 텍스트 추출 (코드 블록 제거와 JSON 검증은 _parse_llm_response에서)
+        return response.candidates[0].content.parts[0].text
     
-    def _get_llm_response_gpt4o(self, prompt: str) -> str:
+    def _get_llm_response_gpt4o(self, prompt: str, schema: Dict[str, Any], schema_name: str) -> str:
         self.logger.api_call("OpenAI", "Chat Completion", "Requesting content generation")
         response = self.client.chat.completions.create(
             model="gpt-4o",
-            messages=[{"role": "system", "content": prompt}]
+            messages=[{"role": "system", "content": prompt}],
+            response_format=openai_response_format(schema, schema_name)
         )
         return response.choices[0].message.content
+
+    @staticmethod
+    def _gemini_config(schema: Dict[str, Any]) -> Dict[str, Any]:
+        """구조화 출력 설정 (GenerateContentConfig와 같은 키의 dict)"""
+        return {"response_mime_type": "application/json", "response_schema": gemini_schema(schema)}
+    
+    def _stream_llm_response(self, prompt: str, on_section: Callable[[str, Dict[str, Any]], None], call,
+                             schema: Dict[str, Any], schema_name: str) -> str:
+        """응답을 스트리밍으로 받으면서 완성된 섹션마다 on_section을 호출합니다."""
+        parser = ContentPlanStreamParser()
+        for chunk in self._stream_llm_chunks(prompt, schema, schema_name):
+            for name, section in parser.feed(chunk):
+                call.add("sections")
+                if call.attrs["sections"] == 1:
+                    call.set(first_section_ms=round((time.perf_counter() - call.start) * 1000))
+                self.logger.info(f"Content plan section ready: {name}")
+                on_section(name, section)
+        return parser.text
+
+    def _stream_llm_chunks(self, prompt: str, schema: Dict[str, Any], schema_name: str) -> Iterator[str]:
+        if self.model == "gemini":
+            self.logger.api_call("Google", "Gemini", "Streaming content generation")
+            for chunk in self.client.models.generate_content_stream(
+                model="gemini-1.5-flash",
+                contents=prompt,
+                config=self._gemini_config(schema)
+            ):
+                if chunk.text:
+                    yield chunk.text
+        else:
+            self.logger.api_call("OpenAI", "Chat Completion", "Streaming content generation")
+            for chunk in self.client.chat.completions.create(
+                model="gpt-4o",
+                messages=[{"role": "system", "content": prompt}],
+                response_format=openai_response_format(schema, schema_name),
+                stream=True
+            ):
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
     
-    def _save_llm_response(self, response: str):
-        with open(os.path.join(self.output_dir, "content_plan_response.txt"), "w") as f:
-            f.write(response)
+    def _save_llm_response(self, response: str, purpose: str = "plan"):
+        # 원래 응답은 content_plan_response.txt, 수정/재생성 응답은 content_plan_<purpose>.txt
+        name = "content_plan_response.txt" if purpose == "plan" else f"content_plan_{purpose}.txt"
+        with open(os.path.join(self.output_dir, name), "w") as f:
+            f.write(response or "")
     
-    def _parse_llm_response(self, response: str) -> Dict:
-        """Convert LLM response into structured format."""
+    def _parse_llm_response(self, response: str, prompt: str, creator: str) -> Dict:
+        """Convert LLM response into structured format.
+
+        스키마 검증에 실패하면 실패한 필드(최상위 필드 또는 씬 하나)만 다시 요청해 고칩니다.
+        MAX_REPAIR_ATTEMPTS번 수정해도 유효하지 않으면 전체 콘텐츠 플랜을 다시 생성하고
+        (shortfactory_content_regenerations_total), 그래도 실패하면 ValueError를 발생시킵니다.
+        """
+        regenerations = 0
+        while True:
+            content_plan, errors = self._decode_content_plan(response)
+            # 객체가 아니거나 아무 섹션도 꺼내지 못한 응답은 고칠 부분이 없으므로 다시 생성합니다
+            if errors and content_plan:
+                content_plan, errors = self._repair_until_valid(content_plan, errors, prompt, creator)
+            if not errors:
+                return content_plan
+
+            problems = ", ".join(f"{path or '(root)'} {reason}" for path, reason in errors[:5])
+            if regenerations >= MAX_REGENERATIONS:
+                self.logger.error(f"Error parsing response: {problems}")
+                raise ValueError(f"Invalid content plan: {problems}")
+            regenerations += 1
+            metrics.inc("shortfactory_content_regenerations_total", model=self.model)
+            self.logger.warning(f"Content plan could not be repaired ({problems}), regenerating")
+            rate_limiter.acquire("llm", creator)
+            response = self._get_llm_response(prompt, purpose="regenerate")
+
+    def _decode_content_plan(self, response: str) -> Tuple[Dict[str, Any], List[Tuple[str, str]]]:
+        """응답을 JSON으로 읽고 스키마 검증 오류 목록과 함께 반환합니다.
+
+        JSON이 잘린 경우 꺼낸 씬 목록은 잘린 위치 앞까지만 있을 수 있으므로, 씬 수가
+        minItems를 만족하더라도 scenes 전체를 수정 대상으로 표시합니다.
+        """
+        text = strip_code_fence(response)
+        truncated = False
         try:
-            # Convert JSON string to Python dictionary
-            print(f"PARSE LLM RESPONSE")
-            print(f"response: {response}")
-            content_plan = json.loads(response)
-            
-            # Validate required fields
-            required_fields = [
-                "video_title", "video_description", "hashtags", "hook", "scenes",
-                "conclusion", "music_suggestion",
-            ]
-            
-            for field in required_fields:
-                if field not in content_plan:
-                    raise ValueError(f"Missing required field: {field}")
-            
-            return content_plan
-            
+            content_plan = json.loads(text)
         except json.JSONDecodeError as e:
             self.logger.error(f"JSON parsing error: {str(e)}")
-            raise e
-        except Exception as e:
-            self.logger.error(f"Error parsing response: {str(e)}")
-            raise e
+            content_plan = self._salvage_sections(text)
+            truncated = True
+        if not isinstance(content_plan, dict):
+            content_plan = {}
+        errors = validate(content_plan)
+        if truncated and content_plan and not any(path == "scenes" for path, _ in errors):
+            scenes = len(content_plan.get("scenes") or [])
+            self.logger.warning(f"Content plan was truncated after {scenes} complete scene(s), requesting all scenes again")
+            errors.append(("scenes", "incomplete (response was truncated)"))
+        return content_plan, errors
+
+    @staticmethod
+    def _salvage_sections(text: str) -> Dict[str, Any]:
+        """잘린 JSON 응답에서 완성된 hook/씬/conclusion 객체만 꺼냅니다 (나머지는 수정 요청으로 채움)."""
+        content_plan: Dict[str, Any] = {}
+        for name, section in ContentPlanStreamParser().feed(text):
+            if name.startswith("scene_"):
+                content_plan.setdefault("scenes", []).append(section)
+            else:
+                content_plan[name] = section
+        return content_plan
+
+    def _repair_until_valid(self, content_plan: Dict[str, Any], errors: List[Tuple[str, str]],
+                            prompt: str, creator: str) -> Tuple[Dict[str, Any], List[Tuple[str, str]]]:
+        """유효해질 때까지 최대 MAX_REPAIR_ATTEMPTS번 수정을 요청합니다."""
+        for _ in range(MAX_REPAIR_ATTEMPTS):
+            content_plan, errors = self._repair_content_plan(content_plan, errors, prompt, creator)
+            if not errors:
+                break
+        return content_plan, errors
+
+    def _repair_content_plan(self, content_plan: Dict[str, Any], errors: List[Tuple[str, str]],
+                             prompt: str, creator: str) -> Tuple[Dict[str, Any], List[Tuple[str, str]]]:
+        """검증에 실패한 부분만 다시 요청해 콘텐츠 플랜에 반영합니다."""
+        targets = repair_targets(errors)
+        self.logger.warning(f"Content plan failed validation, requesting repair of: {', '.join(targets)}")
+        rate_limiter.acquire("llm", creator)
+        response = self._get_llm_response(
+            prompt + repair_instructions(content_plan, errors, targets),
+            schema=repair_schema(targets), schema_name="content_plan_repair", purpose="repair"
+        )
+        try:
+            repair = json.loads(strip_code_fence(response))
+        except json.JSONDecodeError as e:
+            self.logger.error(f"JSON parsing error in repair response: {str(e)}")
+            repair = None
+        if isinstance(repair, dict):
+            content_plan = apply_repair(content_plan, {target: repair[target] for target in targets if target in repair})
+            errors = validate(content_plan)
+        metrics.inc("shortfactory_content_repairs_total", model=self.model, result="failed" if errors else "fixed")
+        return content_plan, errors
     
     def _get_error_content_plan(self) -> Dict:
         """Generate fallback content when error occurs."""
@@ -1,6 +1,7 @@
 """프로젝트에서 사용되는 모든 프롬프트를 관리합니다."""
 import os
 import yaml
+from typing import List
 
 
 def get_content_plan_prompt(creator: str, detail: str) -> str:
@@ -41,6 +42,40 @@ def get_content_plan_prompt(creator: str, detail: str) -> str:
     raise ValueError(f"Creator prompt for {creator} not found")
 
 
+# 배치 프롬프트에서 주제 목록이 시작되는 줄 (fake LLM도 이 줄 뒤의 번호 목록을 읽습니다)
+BATCH_SUBJECTS_HEADER = "SUBJECTS:"
+
+
+def get_batch_content_plan_prompt(creator: str, details: List[str]) -> str:
+    """Returns a prompt that asks for one content plan per subject in a single request.
+
+    크리에이터의 content_prompt는 한 번만 들어가고, 주제 목록은 프롬프트 끝에 붙습니다.
+
+    Args:
+        creator (str): The creator type for the videos
+        details (List[str]): Subjects, one video each
+
+    Returns:
+        str: The formatted prompt for batch content plan generation
+    """
+    prompt = get_content_plan_prompt(
+        creator, f"each subject in the {BATCH_SUBJECTS_HEADER} list at the end (one separate video per subject)"
+    )
+    subjects = "\n".join(f"{i}. {normalize_subject(detail)}" for i, detail in enumerate(details, 1))
+    return (
+        f"{prompt}\n\n{BATCH_SUBJECTS_HEADER}\n{subjects}\n\n"
+        f"Create one complete and independent content plan for EACH of the {len(details)} subjects above. "
+        'Return a JSON object {"plans": [...]} with one item per subject, in the same order. '
+        'Each item has "subject" (the subject exactly as listed, without the number) and '
+        '"plan" (the content plan in the JSON structure above).'
+    )
+
+
+def normalize_subject(detail: str) -> str:
+    """주제를 한 줄로 만듭니다 (배치 프롬프트의 목록과 응답의 subject 비교에 사용)."""
+    return " ".join(str(detail).split())
+
+
 def get_visual_director_prompt(
     script: str,
     scene_description: str,
@@ -0,0 +1,216 @@
+"""
+콘텐츠 플랜 JSON 스키마
+
+콘텐츠 플랜의 구조는 여기에서 한 번만 정의합니다. 같은 스키마로
+- Gemini(response_schema)와 OpenAI(response_format json_schema)의 구조화 출력 모드를 설정하고
+- 응답을 검증하며
+- 검증에 실패한 필드만 다시 요청하는 수정(repair) 요청의 스키마를 만듭니다.
+
+수정 대상(target)은 최상위 필드 이름("hook", "music_suggestion") 또는 씬 하나입니다. 씬은
+스트리밍 파서, VisualDirector와 같은 이름("scene_1"이 첫 번째 씬)을 사용합니다.
+"""
+
+import copy
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+_STRING = {"type": "string"}
+_TEXT = {"type": "string", "minLength": 1}
+
+SECTION_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "script": _TEXT,
+        "image_keywords": {"type": "array", "items": _STRING},
+        "scene_description": _TEXT,
+        "image_to_video": _STRING,
+        "image_style_name": _TEXT,
+    },
+    "required": ["script", "image_keywords", "scene_description", "image_to_video", "image_style_name"],
+}
+
+# 속성 순서는 스트리밍 파서가 섹션을 받는 순서이기도 합니다 (hook -> scenes -> conclusion)
+CONTENT_PLAN_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "video_title": _TEXT,
+        "video_description": _STRING,
+        "hashtags": {"type": "array", "items": _STRING},
+        "hook": SECTION_SCHEMA,
+        "scenes": {"type": "array", "items": SECTION_SCHEMA, "minItems": 1},
+        "conclusion": SECTION_SCHEMA,
+        "music_suggestion": _STRING,
+    },
+    "required": [
+        "video_title", "video_description", "hashtags", "hook", "scenes",
+        "conclusion", "music_suggestion",
+    ],
+}
+
+_SCENE_TARGET = re.compile(r"^scene_(\d+)$")
+
+# 각 provider의 구조화 출력 모드가 받지 않는 키워드 (검증은 validate()가 직접 합니다)
+_GEMINI_UNSUPPORTED = ("additionalProperties",)
+_OPENAI_UNSUPPORTED = ("minItems", "minLength")
+
+
+def gemini_schema(schema: Dict[str, Any] = CONTENT_PLAN_SCHEMA) -> Dict[str, Any]:
+    """Gemini response_schema (OpenAPI 부분집합, 대문자 type, propertyOrdering)"""
+    def convert(node: Dict[str, Any]) -> Dict[str, Any]:
+        result = {key: value for key, value in node.items() if key not in _GEMINI_UNSUPPORTED}
+        result["type"] = node["type"].upper()
+        if "properties" in node:
+            result["properties"] = {name: convert(child) for name, child in node["properties"].items()}
+            # 순서를 지정하지 않으면 Gemini는 속성을 알파벳 순서로 생성합니다
+            result["propertyOrdering"] = list(node["properties"])
+        if "items" in node:
+            result["items"] = convert(node["items"])
+        return result
+    return convert(schema)
+
+
+def openai_response_format(schema: Dict[str, Any] = CONTENT_PLAN_SCHEMA, name: str = "content_plan") -> Dict[str, Any]:
+    """OpenAI response_format (strict json_schema: 모든 속성 required, additionalProperties false)"""
+    def convert(node: Dict[str, Any]) -> Dict[str, Any]:
+        result = {key: value for key, value in node.items() if key not in _OPENAI_UNSUPPORTED}
+        if "properties" in node:
+            result["properties"] = {name: convert(child) for name, child in node["properties"].items()}
+            result["required"] = list(node["properties"])
+            result["additionalProperties"] = False
+        if "items" in node:
+            result["items"] = convert(node["items"])
+        return result
+    return {"type": "json_schema", "json_schema": {"name": name, "strict": True, "schema": convert(schema)}}
+
+
+def validate(value: Any, schema: Dict[str, Any] = CONTENT_PLAN_SCHEMA, path: str = "") -> List[Tuple[str, str]]:
+    """스키마를 만족하지 않는 위치와 이유 목록을 반환합니다 (비어 있으면 유효).
+
+    위치는 "hook.script", "scenes[1].image_keywords" 같은 형식입니다.
+    """
+    errors: List[Tuple[str, str]] = []
+    expected = schema.get("type")
+    if expected == "object":
+        if not isinstance(value, dict):
+            return [(path, "expected an object")]
+        for name in schema.get("required", []):
+            if name not in value:
+                errors.append((_join(path, name), "missing"))
+        for name, child in schema.get("properties", {}).items():
+            if name in value:
+                errors.extend(validate(value[name], child, _join(path, name)))
+    elif expected == "array":
+        if not isinstance(value, list):
+            return [(path, "expected an array")]
+        if len(value) < schema.get("minItems", 0):
+            errors.append((path, f"expected at least {schema['minItems']} items"))
+        for index, item in enumerate(value):
+            errors.extend(validate(item, schema.get("items", {}), f"{path}[{index}]"))
+    elif expected == "string":
+        if not isinstance(value, str):
+            return [(path, "expected a string")]
+        if len(value.strip()) < schema.get("minLength", 0):
+            errors.append((path, "empty"))
+    return errors
+
+
+def _join(path: str, name: str) -> str:
+    return f"{path}.{name}" if path else name
+
+
+def repair_targets(errors: List[Tuple[str, str]]) -> List[str]:
+    """검증 오류 위치를 다시 요청할 단위(최상위 필드 또는 씬 하나)로 묶습니다."""
+    targets: List[str] = []
+    for path, _ in errors:
+        match = re.match(r"^scenes\[(\d+)\]", path)
+        target = f"scene_{int(match.group(1)) + 1}" if match else path.split(".")[0].split("[")[0]
+        if target not in targets:
+            targets.append(target)
+    # scenes 전체를 다시 받는 경우 개별 씬은 따로 요청하지 않습니다
+    if "scenes" in targets:
+        targets = [target for target in targets if not _SCENE_TARGET.match(target)]
+    return targets
+
+
+def target_schema(target: str) -> Dict[str, Any]:
+    match = _SCENE_TARGET.match(target)
+    if match:
+        return SECTION_SCHEMA
+    return CONTENT_PLAN_SCHEMA["properties"][target]
+
+
+def repair_schema(targets: List[str]) -> Dict[str, Any]:
+    """수정 응답의 스키마: 대상마다 하나의 속성을 가진 객체"""
+    return {
+        "type": "object",
+        "properties": {target: target_schema(target) for target in targets},
+        "required": list(targets),
+    }
+
+
+def target_value(plan: Dict[str, Any], target: str) -> Optional[Any]:
+    """콘텐츠 플랜에서 대상의 현재 값을 반환합니다 (없으면 None)."""
+    match = _SCENE_TARGET.match(target)
+    if match:
+        scenes = plan.get("scenes")
+        index = int(match.group(1)) - 1
+        if isinstance(scenes, list) and 0 <= index < len(scenes):
+            return scenes[index]
+        return None
+    return plan.get(target)
+
+
+def apply_repair(plan: Dict[str, Any], repair: Dict[str, Any]) -> Dict[str, Any]:
+    """수정 응답의 값으로 대상 필드를 교체한 새 콘텐츠 플랜을 반환합니다."""
+    plan = copy.deepcopy(plan)
+    for target, value in repair.items():
+        match = _SCENE_TARGET.match(target)
+        if match:
+            scenes = plan.get("scenes")
+            index = int(match.group(1)) - 1
+            if isinstance(scenes, list) and 0 <= index < len(scenes):
+                scenes[index] = value
+        elif target in CONTENT_PLAN_SCHEMA["properties"]:
+            plan[target] = value
+    return plan
+
+
+def batch_schema() -> Dict[str, Any]:
+    """여러 주제의 콘텐츠 플랜을 한 번에 받는 응답의 스키마
+
+    주제 순서가 바뀌어도 맞출 수 있도록 각 항목은 주제 문자열과 플랜을 함께 가집니다.
+    """
+    return {
+        "type": "object",
+        "properties": {
+            "plans": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {"subject": _STRING, "plan": CONTENT_PLAN_SCHEMA},
+                    "required": ["subject", "plan"],
+                },
+            },
+        },
+        "required": ["plans"],
+    }
+
+
+def repair_instructions(plan: Any, errors: List[Tuple[str, str]], targets: List[str]) -> str:
+    """원래 프롬프트 뒤에 붙이는 수정 요청 문구
+
+    원래 프롬프트를 그대로 앞에 두므로 provider의 프롬프트 캐시가 적용되고, 모델은
+    크리에이터 지침과 이미지 스타일 목록을 다시 볼 수 있습니다.
+    """
+    problems = "\n".join(f"- {path or '(root)'}: {reason}" for path, reason in errors)
+    return (
+        "\n\nYOUR PREVIOUS RESPONSE:\n"
+        f"{json.dumps(plan, ensure_ascii=False, indent=2)}\n\n"
+        "The response above does not match the required format:\n"
+        f"{problems}\n\n"
+        "Return ONLY a JSON object with exactly these keys, each holding the corrected value "
+        f"for that part of the content plan: {', '.join(targets)}\n"
+        "Keys like \"scene_2\" mean a single scene object (scene_1 is the first scene). "
+        "Keep everything else consistent with the previous response."
+    )
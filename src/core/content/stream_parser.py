@@ -0,0 +1,104 @@
+"""
+스트리밍 LLM 응답에서 콘텐츠 플랜 섹션을 점진적으로 꺼내는 파서
+
+LLM이 콘텐츠 플랜 JSON을 토큰 단위로 보내는 동안 hook, scenes의 각 씬, conclusion 객체가
+닫히는 즉시 해당 섹션을 반환합니다. 이미지와 나레이션 생성을 LLM이 나머지 씬을 쓰는 동안
+시작할 수 있게 하기 위한 것입니다.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+# 최상위 객체에서 하나의 객체로 된 섹션
+SINGLE_SECTIONS = ("hook", "conclusion")
+# 최상위 객체에서 객체 배열로 된 섹션
+LIST_SECTION = "scenes"
+
+
+class ContentPlanStreamParser:
+    """콘텐츠 플랜 JSON 텍스트를 조각 단위로 받아 완성된 섹션을 반환합니다.
+
+    JSON 문자열 안의 괄호와 이스케이프를 구분하면서 중첩 깊이만 추적하므로 전체 문서를
+    다시 파싱하지 않습니다. 첫 '{' 이전의 텍스트(```json 같은 마크다운 펜스)는 무시합니다.
+
+    섹션 이름은 VisualDirector/NarrationGenerator와 같은 "hook", "scene_1"..., "conclusion"입니다.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key: Optional[str] = None  # 최상위 객체에서 마지막으로 닫힌 문자열
+        self._in_scenes = False
+        self._scene_count = 0
+        self._capture: Optional[Tuple[str, int, int]] = None  # (섹션 이름, 시작 위치, 깊이)
+
+    @property
+    def text(self) -> str:
+        """지금까지 받은 전체 텍스트"""
+        return self._buffer
+
+    def feed(self, chunk: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """텍스트 조각을 추가하고 이번 조각으로 완성된 (섹션 이름, 섹션) 목록을 반환합니다."""
+        self._buffer += chunk
+        sections = []
+        buffer = self._buffer
+        for pos in range(self._pos, len(buffer)):
+            char = buffer[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._stack == ["{"]:
+                        self._last_key = buffer[self._string_start + 1:pos]
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif char == "{":
+                self._open("{", pos)
+            elif char == "[":
+                self._open("[", pos)
+            elif char in "}]":
+                section = self._close(pos)
+                if section:
+                    sections.append(section)
+        self._pos = len(buffer)
+        return sections
+
+    def _open(self, bracket: str, pos: int) -> None:
+        if self._stack == ["{"] and self._capture is None:
+            if bracket == "{" and self._last_key in SINGLE_SECTIONS:
+                self._capture = (self._last_key, pos, len(self._stack) + 1)
+            elif bracket == "[":
+                self._in_scenes = self._last_key == LIST_SECTION
+        elif bracket == "{" and self._in_scenes and self._stack == ["{", "["] and self._capture is None:
+            self._scene_count += 1
+            self._capture = (f"scene_{self._scene_count}", pos, len(self._stack) + 1)
+        self._stack.append(bracket)
+
+    def _close(self, pos: int) -> Optional[Tuple[str, Dict[str, Any]]]:
+        if not self._stack:
+            return None
+        depth = len(self._stack)
+        self._stack.pop()
+        if self._stack == ["{"]:
+            self._in_scenes = False
+        if self._capture and depth == self._capture[2]:
+            name, start, _ = self._capture
+            self._capture = None
+            try:
+                section = json.loads(self._buffer[start:pos + 1])
+            except json.JSONDecodeError:
+                # 잘못된 섹션은 건너뛰고 전체 응답 파싱에서 오류를 보고합니다
+                return None
+            if isinstance(section, dict):
+                return name, section
+        return None
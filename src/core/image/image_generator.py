@@ -8,15 +8,14 @@
 """
 
 from typing import Dict, Any
-from google import genai
-from google.genai import types
-from PIL import Image
-from io import BytesIO
 import os
-from dotenv import load_dotenv
+import base64
 from ..content.prompts import get_visual_director_prompt
 from ...utils.logger import Logger
-import openai
+from ...utils import rate_limiter
+from ...utils.client_pool import get_client_pool
+from ...utils.tracing import span
+from ...providers.settings import image_pacing_seconds
 import time
 
 class ImageGenerator:
@@ -32,37 +31,17 @@ class ImageGenerator:
             raise ValueError("Unsupported model. Use 'gemini' or 'gpt-4o'")
         
         if self.model == "gemini":
-            self.GOOGLE_API_KEY = "GOOGLE_API_KEY"
             self._setup_gemini()
         else:
-            self.OPENAI_API_KEY = "OPENAI_API_KEY"
             self._setup_openai()
     
     def _setup_gemini(self):
-        """Gemini API 설정을 초기화합니다."""
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        load_dotenv(os.path.join(project_root, '.env'))
-
-        if not os.getenv(self.GOOGLE_API_KEY):
-            raise ValueError(
-                "Google API key not found. Please set the GOOGLE_API_KEY environment variable "
-                "in your .env file or system environment variables."
-            )
-    
-        self.gemini_client = genai.Client(api_key=os.getenv(self.GOOGLE_API_KEY))
+        """Gemini API 설정을 초기화합니다 (프로세스 공유 클라이언트)."""
+        self.gemini_client = get_client_pool().get_gemini_client()
     
     def _setup_openai(self):
-        """OpenAI API 설정을 초기화합니다."""
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        load_dotenv(os.path.join(project_root, '.env'))
-
-        if not os.getenv(self.OPENAI_API_KEY):
-            raise ValueError(
-                "OpenAI API key not found. Please set the OPENAI_API_KEY environment variable "
-                "in your .env file or system environment variables."
-            )
-        
-        openai.api_key = os.getenv(self.OPENAI_API_KEY)
+        """OpenAI API 설정을 초기화합니다 (프로세스 공유 클라이언트)."""
+        self.openai_client = get_client_pool().get_openai_client()
     
     def generate_image(self, scene_description: str, style: str = "default", creator: str = None, task_id: str = None) -> bytes:
         """
@@ -77,7 +56,8 @@ class ImageGenerator:
         Returns:
             bytes: 생성된 이미지 데이터
         """
-        time.sleep(5)
+        with span("image.sleep", category="wait"):
+            time.sleep(image_pacing_seconds())
         try:
             # 프롬프트 생성
             prompt = get_visual_director_prompt(
@@ -97,11 +77,15 @@ class ImageGenerator:
                 with open(prompt_path, "w", encoding="utf-8") as f:
                     f.write(prompt)
             
-            # 모델에 따라 이미지 생성
-            if self.model == "gemini":
-                return self._generate_with_gemini(prompt)
-            else:
-                return self._generate_with_openai(prompt)
+            # 모델에 따라 이미지 생성 (크리에이터 간 공유 호출 한도 적용)
+            rate_limiter.acquire("image", creator)
+            with span(f"image.{self.model}", category="external") as call:
+                if self.model == "gemini":
+                    image_data = self._generate_with_gemini(prompt)
+                else:
+                    image_data = self._generate_with_openai(prompt)
+                call.set(bytes=len(image_data))
+            return image_data
             
         except Exception as e:
             self.logger.error(f"Error generating image: {str(e)}")
@@ -109,6 +93,7 @@ class ImageGenerator:
     
     def _generate_with_gemini(self, prompt: str) -> bytes:
         """Gemini 모델을 사용하여 이미지를 생성합니다."""
+        from google.genai import types
         self.logger.info("Calling Gemini API for image generation...")
         response = self.gemini_client.models.generate_content(
             model="gemini-2.0-flash-exp-image-generation",
@@ -138,7 +123,8 @@ class ImageGenerator:
     def _generate_with_openai(self, prompt: str) -> bytes:
         """OpenAI DALL-E 모델을 사용하여 이미지를 생성합니다."""
         self.logger.info("Calling OpenAI API for image generation...")
-        response = openai.Image.create(
+        response = self.openai_client.images.generate(
+            model="dall-e-3",
             prompt=prompt,
             n=1,
             size="1024x1024",
@@ -148,6 +134,5 @@ class ImageGenerator:
         if not response or not response.data:
             raise Exception("Failed to generate image with OpenAI")
         
-        import base64
         image_data = base64.b64decode(response.data[0].b64_json)
         return image_data 
\ No newline at end of file
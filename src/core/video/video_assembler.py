@@ -1,9 +1,10 @@
 import os
 import json
 from typing import Dict, List, Optional, Any
-import ffmpeg
-from PIL import Image
 from ...utils.logger import Logger
+from ...utils.rate_limiter import ffmpeg_slot
+from ...utils.tracing import span
+from ...utils.metrics import metrics
 import platform
 import re
 
@@ -82,14 +83,27 @@ class VideoAssembler:
     
     def _get_audio_duration(self, audio_path: str) -> float:
         """오디오 파일의 실제 길이를 측정합니다."""
+        import ffmpeg  # 실제로 인코딩할 때만 로드
         try:
-            probe = ffmpeg.probe(audio_path)
+            with span("ffmpeg.probe", category="external"):
+                probe = ffmpeg.probe(audio_path)
             audio_info = next(s for s in probe['streams'] if s['codec_type'] == 'audio')
             return float(audio_info['duration'])
         except Exception as e:
             self.logger.error(f"Error getting audio duration: {str(e)}")
             raise
     
+    def _get_video_duration(self, video_path: str) -> float:
+        """비디오 파일의 길이(초)를 측정합니다. 측정할 수 없으면 0을 반환합니다."""
+        import ffmpeg  # 실제로 인코딩할 때만 로드
+        try:
+            with span("ffmpeg.probe", category="external"):
+                probe = ffmpeg.probe(video_path)
+            return float(probe['format']['duration'])
+        except Exception as e:
+            self.logger.warning(f"Could not measure video duration: {str(e)}")
+            return 0.0
+    
     def _split_into_sentences(self, text: str) -> List[str]:
         """텍스트를 문장 단위로 분리합니다."""
         # 문장 끝을 나타내는 구두점들
@@ -133,6 +147,7 @@ class VideoAssembler:
 
     def _create_scene_video(self, scene: Dict[str, Any], scene_index: int, scene_type: str = None) -> str:
         """개별 씬 비디오를 생성합니다."""
+        import ffmpeg  # 실제로 인코딩할 때만 로드
         try:
             scene_id = f"{scene_type}_{scene_index}" if scene_type else f"scene_{scene_index}"
             output_path = os.path.join(self.clips_dir, f"{scene_id}.mp4")
@@ -208,7 +223,8 @@ class VideoAssembler:
             )
             
             self.logger.info(f"씬 {scene_id} 비디오 생성 중...")
-            stream.run(capture_stdout=True, capture_stderr=True)
+            with ffmpeg_slot("scene"):
+                stream.run(capture_stdout=True, capture_stderr=True)
             self.logger.info(f"씬 {scene_id} 비디오 생성 완료")
             return output_path
             
@@ -223,6 +239,7 @@ class VideoAssembler:
     
     def assemble_video(self, content_id: str, content_data: Dict[str, Any]) -> str:
         """최종 비디오를 조립합니다."""
+        import ffmpeg  # 실제로 인코딩할 때만 로드
         try:
             # 1. 각 씬별 비디오 생성
             scene_videos = []
@@ -276,7 +293,8 @@ class VideoAssembler:
             )
             
             self.logger.info("메인 비디오 생성 중...")
-            stream.run(capture_stdout=True, capture_stderr=True)
+            with ffmpeg_slot("main"):
+                stream.run(capture_stdout=True, capture_stderr=True)
             self.logger.info("메인 비디오 생성 완료")
             
             # 인트로 비디오 경로
@@ -309,7 +327,8 @@ class VideoAssembler:
                 )
                 
                 self.logger.info("인트로 비디오 속도 조정 중...")
-                stream.run(capture_stdout=True, capture_stderr=True)
+                with ffmpeg_slot("intro"):
+                    stream.run(capture_stdout=True, capture_stderr=True)
                 self.logger.info("인트로 비디오 속도 조정 완료")
                 
                 # 인트로와 메인 비디오 결합
@@ -340,7 +359,8 @@ class VideoAssembler:
                 )
                 
                 self.logger.info("인트로 추가 중...")
-                stream.run(capture_stdout=True, capture_stderr=True)
+                with ffmpeg_slot("concat_intro"):
+                    stream.run(capture_stdout=True, capture_stderr=True)
                 self.logger.info("최종 비디오 생성 완료")
                 
                 # 임시 파일 삭제
@@ -356,6 +376,8 @@ class VideoAssembler:
             for video in scene_videos:
                 os.remove(video)
             
+            # 인코딩 효율 지표 (출력 1초당 인코딩 시간)
+            metrics.inc("shortfactory_output_video_seconds_total", self._get_video_duration(final_output))
             return final_output
             
         except Exception as e:
@@ -364,6 +386,7 @@ class VideoAssembler:
     
     def _save_clip(self, clip: Dict, output_path: str):
         """개별 클립을 비디오 파일로 저장합니다."""
+        import ffmpeg  # 실제로 인코딩할 때만 로드
         try:
             # 이미지와 오디오를 결합하여 비디오 생성
             video = ffmpeg.input(clip['image_path'], loop=1, t=clip['duration'])
@@ -387,7 +410,8 @@ class VideoAssembler:
                 )
                 .overwrite_output()
             )
-            ffmpeg.run(stream, capture_stdout=True, capture_stderr=True)
+            with ffmpeg_slot("clip"):
+                ffmpeg.run(stream, capture_stdout=True, capture_stderr=True)
             
         except ffmpeg.Error as e:
             print(f"Error occurred while saving clip: {e.stderr.decode()}")
@@ -395,6 +419,7 @@ class VideoAssembler:
     
     def _concatenate_clips(self, clip_files: List[str], output_path: str):
         """여러 클립을 하나의 비디오로 연결합니다."""
+        import ffmpeg  # 실제로 인코딩할 때만 로드
         try:
             # concat demuxer를 위한 파일 목록 생성
             concat_file = os.path.join(os.path.dirname(output_path), "concat.txt")
@@ -413,7 +438,8 @@ class VideoAssembler:
                 )
                 .overwrite_output()
             )
-            ffmpeg.run(stream, capture_stdout=True, capture_stderr=True)
+            with ffmpeg_slot("concat"):
+                ffmpeg.run(stream, capture_stdout=True, capture_stderr=True)
             
             # 임시 파일 삭제
             os.remove(concat_file)
@@ -425,6 +451,7 @@ class VideoAssembler:
     
     def _create_clip(self, image_path: str, audio_path: str, duration: int, text: str, output_path: str):
         """Create a video clip from an image and audio file."""
+        import ffmpeg  # 실제로 인코딩할 때만 로드
         stream = ffmpeg.input(image_path, loop=1, t=duration)
         audio = ffmpeg.input(audio_path)
         
@@ -470,7 +497,8 @@ class VideoAssembler:
         )
         
         try:
-            ffmpeg.run(stream, capture_stdout=True, capture_stderr=True)
+            with ffmpeg_slot("clip"):
+                ffmpeg.run(stream, capture_stdout=True, capture_stderr=True)
         except ffmpeg.Error as e:
             print('stdout:', e.stdout.decode('utf8'))
             print('stderr:', e.stderr.decode('utf8'))
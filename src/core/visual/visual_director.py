@@ -9,19 +9,14 @@
 """
 
 import time
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional
 from ...utils.logger import Logger
 from ..content.prompts import get_visual_director_prompt
-from google import genai
-from google.genai import types
-from PIL import Image
-from io import BytesIO
 import os
-from dotenv import load_dotenv
-import json
-import uuid
-from config.styles import image_styles
 from ..image.image_generator import ImageGenerator
+from ...utils.client_pool import get_client_pool
+from ...utils.tracing import span
+from ...providers.settings import image_pacing_seconds
 
 class VisualDirector:
     def __init__(self, task_id: str, creator: str, model: str = "gemini"):
@@ -44,23 +39,35 @@ class VisualDirector:
         self.logger = Logger()
         self.image_generator = ImageGenerator(model=model)
     
-    def create_visuals(self, content_plan: Dict[str, Any], creator: str) -> Dict[str, Any]:
-        """콘텐츠 플랜에 따라 시각 자료를 생성합니다."""
+    def create_visuals(self, content_plan: Dict[str, Any], creator: str,
+                       prefetched: Optional[Callable[[str, Dict[str, Any]], Optional[str]]] = None) -> Dict[str, Any]:
+        """콘텐츠 플랜에 따라 시각 자료를 생성합니다.
+
+        Args:
+            content_plan (Dict[str, Any]): 콘텐츠 플랜
+            creator (str): 크리에이터 ID
+            prefetched (Callable, optional): prefetched(scene_id, scene)가 미리 생성한 이미지 경로를
+                반환하면 그 이미지를 사용하고, None이면 여기서 생성합니다.
+        """
+        def image_for(scene: Dict[str, Any], scene_id: str) -> str:
+            image_path = prefetched(scene_id, scene) if prefetched else None
+            return image_path or self.create_scene_image(scene, scene_id)
+
         try:
             # Hook 이미지 생성
             if "hook" in content_plan:
-                hook_image = self._create_scene_image(content_plan["hook"], "hook")
+                hook_image = image_for(content_plan["hook"], "hook")
                 content_plan["hook"]["image_path"] = hook_image
             
             # 각 씬별 이미지 생성
             for i, scene in enumerate(content_plan["scenes"], 1):
                 scene["scene_number"] = i  # 씬 번호 설정
-                scene_image = self._create_scene_image(scene, f"scene_{i}")
+                scene_image = image_for(scene, f"scene_{i}")
                 scene["image_path"] = scene_image
             
             # Conclusion 이미지 생성
             if "conclusion" in content_plan:
-                conclusion_image = self._create_scene_image(content_plan["conclusion"], "conclusion")
+                conclusion_image = image_for(content_plan["conclusion"], "conclusion")
                 content_plan["conclusion"]["image_path"] = conclusion_image
             
             return content_plan
@@ -69,20 +76,22 @@ class VisualDirector:
             self.logger.error(f"Error creating visuals: {str(e)}")
             raise
     
-    def _create_scene_image(self, scene: Dict[str, Any], scene_id: str) -> str:
-        """개별 씬의 이미지를 생성합니다."""
+    def create_scene_image(self, scene: Dict[str, Any], scene_id: str) -> str:
+        """개별 씬의 이미지를 생성합니다 (콘텐츠 플랜 스트리밍 중에 미리 호출될 수 있습니다)."""
         try:
             self.logger.info(f"Creating image for scene: {scene_id}")
             
             # 이미지 생성
-            image_data = self.image_generator.generate_image(
-                scene.get("scene_description", ""),
-                style=scene.get("image_style_name", "default"),
-                creator=self.creator,
-                task_id=self.task_id
-            )
+            with span("visuals.scene", scene_id=scene_id):
+                image_data = self.image_generator.generate_image(
+                    scene.get("scene_description", ""),
+                    style=scene.get("image_style_name", "default"),
+                    creator=self.creator,
+                    task_id=self.task_id
+                )
             # wait for image to be generated
-            time.sleep(5)
+            with span("visuals.sleep", category="wait"):
+                time.sleep(image_pacing_seconds())
             # 이미지 저장
             output_path = os.path.join(self.images_dir, f"{scene_id}.png")
             with open(output_path, "wb") as f:
@@ -96,16 +105,7 @@ class VisualDirector:
             raise
 
     def _setup_llm(self):
-        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        load_dotenv(os.path.join(project_root, '.env'))
-
-        if not os.getenv(self.API_KEY_NAME):
-            raise ValueError(
-                "Google API key not found. Please set the GOOGLE_API_KEY environment variable "
-                "in your .env file or system environment variables."
-            )
-    
-        self.client = genai.Client(api_key=os.getenv(self.API_KEY_NAME))
+        self.client = get_client_pool().get_gemini_client()
     
     def _validate_visual_asset(self, visual_asset: Dict[str, Any]) -> bool:
         """
@@ -0,0 +1,341 @@
+"""Headless worker mode that continuously drains the subject queue
+
+대화형 입력 없이 Google Sheets의 주제 큐를 주기적으로 확인하고,
+설정된 동시성과 처리량 목표에 맞춰 비디오를 생성합니다.
+SIGTERM/SIGINT를 받으면 새 작업을 받지 않고 진행 중인 작업을 마친 뒤 종료합니다.
+"""
+import os
+import time
+import uuid
+import signal
+import threading
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Dict, Any, List, Optional, Set, Tuple
+import yaml
+from .cli import ShortFactoryCLI, get_creator_options
+from .utils.logger import Logger
+from .utils.sheets_manager import SheetsManager
+from .utils.sheets_write_buffer import flush_all_write_buffers
+from .utils.metrics import metrics
+from .utils.upload_queue import UploadQueue
+from .utils.subject_lease import (
+    LeaseBackend, LeaseHeartbeat, SQLiteLeaseBackend, SheetsLeaseBackend, make_worker_id
+)
+
+
+DEFAULT_CONFIG_PATH = os.path.join("config", "daemon.yaml")
+
+
+def load_daemon_config(config_path: str = DEFAULT_CONFIG_PATH) -> Dict[str, Any]:
+    """데몬 설정 파일을 로드합니다. 파일이 없으면 빈 설정을 반환합니다."""
+    if not os.path.exists(config_path):
+        return {}
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f) or {}
+
+
+def build_lease_backend(lease_config: Optional[Dict[str, Any]], spreadsheet_id: str) -> Optional[LeaseBackend]:
+    """설정에 따라 lease 백엔드를 생성합니다 (backend: none | sqlite | sheets)."""
+    backend = (lease_config or {}).get('backend', 'none')
+    if backend in (None, 'none'):
+        return None
+    if backend == 'sqlite':
+        return SQLiteLeaseBackend(lease_config.get('sqlite_path', os.path.join('data', 'leases.sqlite')))
+    if backend == 'sheets':
+        return SheetsLeaseBackend(
+            SheetsManager(), spreadsheet_id, settle_seconds=float(lease_config.get('settle_seconds', 2.0))
+        )
+    raise ValueError(f"Unknown lease backend: {backend}")
+
+
+class FactoryDaemon:
+    # 다른 워커가 먼저 claim한 주제를 건너뛰며 시도할 최대 횟수
+    MAX_CLAIM_ATTEMPTS = 5
+    # quota 부족으로 미룬 업로드(data/<creator>/upload_queue/) 중 기한이 된 작업을 확인하는 주기 (초)
+    DEFERRED_UPLOAD_INTERVAL = 300
+
+    def __init__(
+        self,
+        creators: Optional[List[str]] = None,
+        model: str = "gemini",
+        concurrency: int = 1,
+        poll_interval: float = 60,
+        max_videos_per_hour: int = 0,
+        max_videos: int = 0,
+        lease_backend: Optional[LeaseBackend] = None,
+        lease_seconds: float = 900,
+        worker_id: Optional[str] = None,
+        metrics_port: int = 0,
+    ):
+        """
+        Args:
+            creators (List[str], optional): 처리할 크리에이터 목록 (없으면 전체)
+            model (str): 사용할 모델 ("gemini" 또는 "gpt-4o")
+            concurrency (int): 동시에 처리할 비디오 수
+            poll_interval (float): 대기 중인 주제가 없을 때 다시 확인하기까지의 시간 (초)
+            max_videos_per_hour (int): 시간당 시작할 최대 비디오 수 (0 = 제한 없음)
+            max_videos (int): 이 수만큼 처리한 뒤 종료 (0 = SIGTERM까지 실행)
+            lease_backend (LeaseBackend, optional): 여러 워커 간 주제 claim에 사용할 lease 저장소
+            lease_seconds (float): lease 유효 시간 (heartbeat로 연장됨)
+            worker_id (str, optional): 이 워커의 ID (기본값: 호스트-PID-임의값)
+            metrics_port (int): /metrics 엔드포인트를 제공할 포트 (0 = 사용 안 함)
+        """
+        self.creators = creators or get_creator_options()
+        if not self.creators:
+            raise ValueError("No creator configurations found in config/prompts directory")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self.model = model.lower()
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.max_videos_per_hour = max_videos_per_hour
+        self.max_videos = max_videos
+        self.lease_backend = lease_backend
+        self.lease_seconds = lease_seconds
+        self.worker_id = worker_id or make_worker_id()
+        self.metrics_port = metrics_port
+
+        self.logger = Logger()
+        self.spreadsheet_id = os.getenv('GOOGLE_SHEETS_ID')
+        if not self.spreadsheet_id:
+            raise ValueError("GOOGLE_SHEETS_ID environment variable is not set.")
+
+        self._stop_event = threading.Event()
+        self._sheets_managers = {creator: SheetsManager(creator=creator) for creator in self.creators}
+        self._in_flight: Dict[Future, Tuple[str, int]] = {}
+        self._failed_rows: Dict[str, Set[int]] = {creator: set() for creator in self.creators}
+        self._started_at: deque = deque()  # 최근 1시간 동안 시작한 작업 시각
+        self._next_creator = 0
+        # creator -> 미룬 업로드를 처리하는 큐 (처음 확인할 때 시작)
+        self._upload_queues: Dict[str, UploadQueue] = {}
+        self._deferred_checked_at: Optional[float] = None
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+
+    @classmethod
+    def from_config(cls, config_path: str = DEFAULT_CONFIG_PATH, **overrides) -> "FactoryDaemon":
+        """설정 파일을 로드하고 None이 아닌 인자로 덮어써서 데몬을 생성합니다."""
+        config = load_daemon_config(config_path)
+        config.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(**cls._config_kwargs(config))
+
+    @classmethod
+    def _config_kwargs(cls, config: Dict[str, Any]) -> Dict[str, Any]:
+        lease_config = config.get('leases') or {}
+        return dict(
+            creators=config.get('creators') or None,
+            model=config.get('model', 'gemini'),
+            concurrency=int(config.get('concurrency', 1)),
+            poll_interval=float(config.get('poll_interval', 60)),
+            max_videos_per_hour=int(config.get('max_videos_per_hour', 0)),
+            max_videos=int(config.get('max_videos', 0)),
+            lease_backend=build_lease_backend(lease_config, os.getenv('GOOGLE_SHEETS_ID')),
+            lease_seconds=float(lease_config.get('lease_seconds', 900)),
+            worker_id=config.get('worker_id'),
+            metrics_port=int(config.get('metrics_port', 0)),
+        )
+
+    def install_signal_handlers(self):
+        """SIGTERM/SIGINT 수신 시 graceful shutdown을 시작합니다."""
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        signal.signal(signal.SIGINT, self._handle_signal)
+
+    def _handle_signal(self, signum, frame):
+        self.logger.warning(f"Received signal {signum}, finishing {len(self._in_flight)} in-flight task(s)...")
+        self.stop()
+
+    def stop(self):
+        """새 작업 수락을 중단합니다. 진행 중인 작업은 끝까지 처리됩니다."""
+        self._stop_event.set()
+
+    def run(self) -> int:
+        """큐가 중단될 때까지 주제를 처리합니다.
+
+        Returns:
+            int: 성공적으로 처리된 비디오 수
+        """
+        self.logger.section("Short Factory Daemon Started")
+        self.logger.info(f"Creators: {', '.join(self.creators)}")
+        self.logger.info(f"Model: {self.model}, concurrency: {self.concurrency}")
+        self.logger.info(f"Worker ID: {self.worker_id}")
+        metrics.register_collector(self._metric_samples)
+        if self.metrics_port:
+            from .api.metrics_server import start_metrics_server
+            start_metrics_server(self.metrics_port)
+            self.logger.info(f"Metrics: http://0.0.0.0:{self.metrics_port}/metrics")
+
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="factory-worker")
+        try:
+            while not self._stop_event.is_set():
+                self._reap(timeout=0)
+                self._drain_deferred_uploads()
+
+                if self.max_videos and self.submitted >= self.max_videos:
+                    self.logger.info(f"Reached max_videos ({self.max_videos}), stopping.")
+                    break
+
+                # 모든 워커가 바쁘면 하나가 끝날 때까지 대기
+                if len(self._in_flight) >= self.concurrency:
+                    self._reap(timeout=self.poll_interval)
+                    continue
+
+                # 처리량 목표 초과 시 다음 슬롯까지 대기
+                throttle = self._throttle_delay()
+                if throttle > 0:
+                    self._stop_event.wait(min(throttle, self.poll_interval))
+                    continue
+
+                job = self._next_job()
+                if job is None:
+                    # 다음 폴링에서 시트를 다시 읽어 새로 추가된 주제를 확인합니다
+                    for sheets_manager in self._sheets_managers.values():
+                        sheets_manager.invalidate_subjects()
+                    self._stop_event.wait(self.poll_interval)
+                    continue
+
+                creator, subject = job
+                future = executor.submit(self._process, creator, subject)
+                self._in_flight[future] = (creator, subject['row_index'])
+                self._started_at.append(time.monotonic())
+                self.submitted += 1
+        finally:
+            # 진행 중인 작업을 끝까지 기다린 뒤 종료
+            executor.shutdown(wait=True)
+            self._reap(timeout=0)
+            self._join_upload_queues()
+            flush_all_write_buffers()
+            metrics.unregister_collector(self._metric_samples)
+            self.logger.section("Short Factory Daemon Stopped")
+            self.logger.info(f"Submitted: {self.submitted}, succeeded: {self.succeeded}, failed: {self.failed}")
+        return self.succeeded
+
+    def _drain_deferred_uploads(self) -> None:
+        """DEFERRED_UPLOAD_INTERVAL마다 크리에이터별로 기한이 된 미룬 업로드를 업로드 큐에 넣습니다.
+
+        QuotaExceeded로 미룬 비디오는 이미 렌더링이 끝났으므로 새 주제와 별도로 업로드만 합니다.
+        """
+        now = time.monotonic()
+        if self._deferred_checked_at is not None and now - self._deferred_checked_at < self.DEFERRED_UPLOAD_INTERVAL:
+            return
+        self._deferred_checked_at = now
+        for creator in self.creators:
+            try:
+                upload_queue = self._upload_queues.get(creator)
+                if upload_queue is None:
+                    cli = ShortFactoryCLI(creator=creator, model=self.model)
+                    upload_queue = UploadQueue(creator, cli.publish_job, max_concurrent=1)
+                    upload_queue.start()
+                    self._upload_queues[creator] = upload_queue
+                upload_queue.recover()
+            except Exception as e:
+                self.logger.error(f"Failed to recover deferred uploads for {creator}: {str(e)}")
+
+    def _join_upload_queues(self) -> None:
+        """진행 중이거나 큐에 남은 업로드가 끝날 때까지 기다립니다."""
+        for creator, upload_queue in self._upload_queues.items():
+            if upload_queue.pending():
+                self.logger.info(f"Waiting for {upload_queue.pending()} deferred upload(s) of {creator}...")
+            upload_queue.join()
+        self._upload_queues = {}
+
+    def _throttle_delay(self) -> float:
+        """시간당 처리량 목표를 지키기 위해 기다려야 하는 시간(초)을 반환합니다."""
+        if not self.max_videos_per_hour:
+            return 0
+        now = time.monotonic()
+        while self._started_at and now - self._started_at[0] >= 3600:
+            self._started_at.popleft()
+        if len(self._started_at) < self.max_videos_per_hour:
+            return 0
+        return 3600 - (now - self._started_at[0])
+
+    def _next_job(self) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """크리에이터를 라운드로빈으로 돌며 다음 주제를 찾습니다."""
+        for offset in range(len(self.creators)):
+            creator = self.creators[(self._next_creator + offset) % len(self.creators)]
+            # 처리 중이거나 이번 실행에서 실패한 행은 제외 (실패한 작업은 resume으로 재개)
+            busy_rows = {row for c, row in self._in_flight.values() if c == creator}
+            busy_rows |= self._failed_rows[creator]
+            subject = self._claim_subject(creator, busy_rows)
+            if subject:
+                self._next_creator = (self._next_creator + offset + 1) % len(self.creators)
+                return creator, subject
+        return None
+
+    def _claim_subject(self, creator: str, busy_rows: Set[int]) -> Optional[Dict[str, Any]]:
+        """다음 주제를 가져오고, lease 백엔드가 있으면 claim에 성공한 주제만 반환합니다."""
+        excluded = set(busy_rows)
+        for _ in range(self.MAX_CLAIM_ATTEMPTS):
+            try:
+                subject = self._sheets_managers[creator].get_next_subject(
+                    self.spreadsheet_id, creator, exclude_rows=excluded
+                )
+                if not subject:
+                    return None
+                if self.lease_backend is None:
+                    return subject
+                if self.lease_backend.try_claim(creator, subject['row_index'], self.worker_id, self.lease_seconds):
+                    # 다른 노드가 방금 끝낸 행은 후보 목록에 아직 남아 있을 수 있으므로 시트에서 다시 확인합니다
+                    if self._sheets_managers[creator].is_subject_pending(self.spreadsheet_id, creator, subject['row_index']):
+                        return subject
+                    self.lease_backend.release(creator, subject['row_index'], self.worker_id)
+                    self.logger.info(f"Row {subject['row_index']} of {creator} was already processed, skipping")
+            except Exception as e:
+                self.logger.error(f"Failed to poll subjects for {creator}: {str(e)}")
+                return None
+            # 다른 워커가 먼저 가져갔거나 이미 처리된 주제는 건너뜁니다
+            excluded.add(subject['row_index'])
+        return None
+
+    def _process(self, creator: str, subject: Dict[str, Any]) -> bool:
+        cli = ShortFactoryCLI(creator=creator, model=self.model)
+        if self.lease_backend is None:
+            return cli.process_subject(subject, str(uuid.uuid4()))
+        with LeaseHeartbeat(
+            self.lease_backend, creator, subject['row_index'], self.worker_id, self.lease_seconds
+        ) as lease:
+            completed = cli.process_subject(subject, str(uuid.uuid4()))
+            if completed:
+                # 버퍼의 video ID/예약 시간이 시트에 기록된 뒤에만 lease를 해제합니다.
+                # 기록에 실패하면 lease가 만료될 때까지 다른 워커가 이 행을 가져가지 않습니다.
+                try:
+                    cli.sheets_manager.flush_writes(self.spreadsheet_id)
+                    lease.completed = True
+                except Exception as e:
+                    self.logger.warning(f"Could not flush sheet writes for {creator} row {subject['row_index']}, "
+                                        f"keeping the lease until it expires: {str(e)}")
+            return completed
+
+    def _metric_samples(self):
+        in_flight = {creator: 0 for creator in self.creators}
+        for creator, _ in list(self._in_flight.values()):
+            in_flight[creator] += 1
+        for creator, count in in_flight.items():
+            yield "shortfactory_tasks_in_flight", {"creator": creator}, count
+
+    def _reap(self, timeout: float):
+        """완료된 작업을 정리하고 결과를 집계합니다."""
+        if not self._in_flight:
+            return
+        done, _ = wait(list(self._in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            creator, row_index = self._in_flight.pop(future)
+            try:
+                if future.result():
+                    self.succeeded += 1
+                    metrics.inc("shortfactory_tasks_total", creator=creator, result="succeeded")
+                    # 처리가 끝난 행은 폴링용 후보 목록에서 제거 (워커는 별도 SheetsManager로 기록)
+                    self._sheets_managers[creator].invalidate_subjects(creator, row_index)
+                    continue
+                self.failed += 1
+                metrics.inc("shortfactory_tasks_total", creator=creator, result="failed")
+            except Exception as e:
+                self.failed += 1
+                metrics.inc("shortfactory_tasks_total", creator=creator, result="failed")
+                self.logger.error(f"Task for {creator} row {row_index} failed: {str(e)}")
+                traceback.print_exception(type(e), e, e.__traceback__)
+            self._failed_rows[creator].add(row_index)
@@ -0,0 +1,338 @@
+"""Record/replay cassettes for LLM, image and TTS provider calls
+
+SHORTFACTORY_PROVIDERS=record 이면 실제 Gemini/OpenAI/ElevenLabs 클라이언트를 감싸서
+task별로 모든 요청과 응답을 기록하고, replay 이면 같은 요청에 대해 기록된 응답을 돌려줍니다.
+조립/자막/인코딩을 수정한 뒤 API 비용 없이 같은 비디오를 다시 만들 때 사용합니다.
+
+data/<creator>/<task_id>/cassette/
+    interactions.jsonl   요청 키, 요청, 응답 (텍스트는 그대로, 바이너리는 blob 참조)
+    blobs/<sha256>       이미지/오디오 바이트 (내용 기준으로 중복 제거)
+
+요청은 provider, 메서드, 인자를 정규화한 JSON의 SHA-256으로 찾습니다. 프롬프트가 바뀌면
+기록된 응답을 찾을 수 없으므로 CassetteMiss가 발생합니다 (네트워크로 대체하지 않습니다).
+"""
+import os
+import json
+import base64
+import hashlib
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from ..utils.logger import Logger
+from ..utils.tracing import current_task
+
+# 재생하는 스트리밍 응답 조각 하나의 글자 수
+STREAM_CHUNK_CHARS = 256
+
+
+class CassetteMiss(Exception):
+    """replay 중 기록되지 않은 요청"""
+
+
+def cassette_dir(creator: str, task_id: str) -> str:
+    return os.path.join("data", creator, task_id, "cassette")
+
+
+def _jsonable(value: Any) -> Any:
+    """요청 인자를 키 계산과 기록에 쓸 수 있는 JSON 값으로 변환합니다."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, bytes):
+        return {"sha256": hashlib.sha256(value).hexdigest()}
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if hasattr(value, "model_dump"):  # google-genai types (pydantic)
+        return _jsonable(value.model_dump(mode="json", exclude_none=True))
+    return repr(value)
+
+
+def request_key(provider: str, method: str, request: Dict[str, Any]) -> str:
+    payload = json.dumps([provider, method, request], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    def __init__(self, path: str):
+        self.path = path
+        self.blobs_dir = os.path.join(path, "blobs")
+        self.index_path = os.path.join(path, "interactions.jsonl")
+        self._lock = threading.Lock()
+        self._responses: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        self._cursors: Dict[str, int] = {}
+
+    def exists(self) -> bool:
+        return os.path.exists(self.index_path)
+
+    def put_blob(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = os.path.join(self.blobs_dir, digest)
+        if not os.path.exists(path):
+            os.makedirs(self.blobs_dir, exist_ok=True)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        return digest
+
+    def get_blob(self, digest: str) -> bytes:
+        with open(os.path.join(self.blobs_dir, digest), "rb") as f:
+            return f.read()
+
+    def record(self, provider: str, method: str, request: Dict[str, Any], response: Dict[str, Any]) -> None:
+        entry = {
+            "key": request_key(provider, method, request),
+            "provider": provider,
+            "method": method,
+            "request": request,
+            "response": response,
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._responses = None
+
+    def _load(self) -> Dict[str, List[Dict[str, Any]]]:
+        if self._responses is None:
+            responses: Dict[str, List[Dict[str, Any]]] = {}
+            if self.exists():
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            responses.setdefault(entry["key"], []).append(entry["response"])
+            self._responses = responses
+        return self._responses
+
+    def play(self, provider: str, method: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        """기록된 응답을 반환합니다.
+
+        같은 요청이 여러 번 기록되어 있으면 기록된 순서대로 돌려주고, 모두 사용한 뒤에는
+        마지막 응답을 반복합니다 (재개한 task가 같은 요청을 다시 보내는 경우).
+        """
+        key = request_key(provider, method, request)
+        with self._lock:
+            responses = self._load().get(key)
+            if not responses:
+                raise CassetteMiss(
+                    f"No recorded response for {provider}.{method} (key {key[:12]}) in {self.path}; "
+                    f"the request differs from the recording"
+                )
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+            return responses[min(cursor, len(responses) - 1)]
+
+
+_cassettes: Dict[str, Cassette] = {}
+# replay할 task_id -> 재생할 cassette 경로 (다른 task의 기록으로 새 task를 만들 때)
+_replay_sources: Dict[str, str] = {}
+_cassettes_lock = threading.Lock()
+
+
+def replay_from(task_id: str, source_dir: str) -> None:
+    """task_id의 provider 호출을 source_dir cassette에서 재생하도록 지정합니다."""
+    with _cassettes_lock:
+        _replay_sources[task_id] = source_dir
+
+
+def active_cassette() -> Optional[Cassette]:
+    """현재 스레드에서 실행 중인 task의 cassette (task 밖이면 None)"""
+    task = current_task()
+    if task is None:
+        return None
+    creator, task_id = task
+    with _cassettes_lock:
+        path = _replay_sources.get(task_id) or cassette_dir(creator, task_id)
+        if path not in _cassettes:
+            _cassettes[path] = Cassette(path)
+        return _cassettes[path]
+
+
+def _record(provider: str, method: str, request: Dict[str, Any], capture: Callable[[Cassette], Dict[str, Any]]) -> None:
+    cassette = active_cassette()
+    if cassette is None:
+        Logger().warning(f"{provider}.{method} called outside a task; response not recorded")
+        return
+    cassette.record(provider, method, request, capture(cassette))
+
+
+def _play(provider: str, method: str, request: Dict[str, Any]) -> tuple:
+    cassette = active_cassette()
+    if cassette is None:
+        raise CassetteMiss(f"{provider}.{method} called outside a task; nothing to replay")
+    return cassette, cassette.play(provider, method, request)
+
+
+def _split_text(text: str) -> List[str]:
+    return [text[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(text), STREAM_CHUNK_CHARS)]
+
+
+# Gemini (google-genai): client.models.generate_content, generate_content_stream
+
+def _gemini_request(model: str, contents: Any, config: Any) -> Dict[str, Any]:
+    return {"model": model, "contents": _jsonable(contents), "config": _jsonable(config)}
+
+
+class _RecordingGeminiModels:
+    def __init__(self, models: Any):
+        self._models = models
+
+    def generate_content(self, model: str, contents: Any, config: Any = None) -> Any:
+        response = self._models.generate_content(model=model, contents=contents, config=config)
+
+        def capture(cassette: Cassette) -> Dict[str, Any]:
+            parts = []
+            candidates = getattr(response, "candidates", None) or []
+            content = getattr(candidates[0], "content", None) if candidates else None
+            for part in getattr(content, "parts", None) or []:
+                inline = getattr(part, "inline_data", None)
+                parts.append({
+                    "text": getattr(part, "text", None),
+                    "inline_data": {"blob": cassette.put_blob(inline.data), "mime_type": inline.mime_type} if inline else None,
+                })
+            return {"parts": parts}
+        _record("gemini", "generate_content", _gemini_request(model, contents, config), capture)
+        return response
+
+    def generate_content_stream(self, model: str, contents: Any, config: Any = None) -> Iterator[Any]:
+        pieces = []
+        for chunk in self._models.generate_content_stream(model=model, contents=contents, config=config):
+            pieces.append(getattr(chunk, "text", None) or "")
+            yield chunk
+        _record("gemini", "generate_content_stream", _gemini_request(model, contents, config),
+                lambda cassette: {"text": "".join(pieces)})
+
+
+class _ReplayGeminiModels:
+    def generate_content(self, model: str, contents: Any, config: Any = None) -> Any:
+        cassette, response = _play("gemini", "generate_content", _gemini_request(model, contents, config))
+        parts = []
+        for part in response["parts"]:
+            inline = part.get("inline_data")
+            parts.append(SimpleNamespace(
+                text=part.get("text"),
+                inline_data=SimpleNamespace(data=cassette.get_blob(inline["blob"]), mime_type=inline["mime_type"]) if inline else None,
+            ))
+        text = "".join(part.text for part in parts if part.text) or None
+        return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=parts))], text=text)
+
+    def generate_content_stream(self, model: str, contents: Any, config: Any = None) -> Iterator[Any]:
+        _, response = _play("gemini", "generate_content_stream", _gemini_request(model, contents, config))
+        return (SimpleNamespace(text=piece) for piece in _split_text(response["text"]))
+
+
+# OpenAI: client.chat.completions.create, client.images.generate
+
+class _RecordingChatCompletions:
+    def __init__(self, completions: Any):
+        self._completions = completions
+
+    def create(self, model: str, messages: List[Dict[str, str]], **kwargs) -> Any:
+        response = self._completions.create(model=model, messages=messages, **kwargs)
+        request = {"model": model, "messages": _jsonable(messages), **_jsonable(kwargs)}
+        if kwargs.get("stream"):
+            return self._record_stream(request, response)
+        _record("openai", "chat.completions.create", request,
+                lambda cassette: {"content": response.choices[0].message.content})
+        return response
+
+    @staticmethod
+    def _record_stream(request: Dict[str, Any], stream: Any) -> Iterator[Any]:
+        pieces = []
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                pieces.append(chunk.choices[0].delta.content)
+            yield chunk
+        _record("openai", "chat.completions.create", request, lambda cassette: {"content": "".join(pieces)})
+
+
+class _ReplayChatCompletions:
+    def create(self, model: str, messages: List[Dict[str, str]], **kwargs) -> Any:
+        request = {"model": model, "messages": _jsonable(messages), **_jsonable(kwargs)}
+        _, response = _play("openai", "chat.completions.create", request)
+        if kwargs.get("stream"):
+            return (
+                SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+                for piece in _split_text(response["content"])
+            )
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=response["content"]))])
+
+
+class _RecordingImages:
+    def __init__(self, images: Any):
+        self._images = images
+
+    def generate(self, model: str, prompt: str, **kwargs) -> Any:
+        response = self._images.generate(model=model, prompt=prompt, **kwargs)
+        request = {"model": model, "prompt": prompt, **_jsonable(kwargs)}
+        _record("openai", "images.generate", request, lambda cassette: {
+            "images": [cassette.put_blob(base64.b64decode(item.b64_json)) for item in response.data or []]
+        })
+        return response
+
+
+class _ReplayImages:
+    def generate(self, model: str, prompt: str, **kwargs) -> Any:
+        request = {"model": model, "prompt": prompt, **_jsonable(kwargs)}
+        cassette, response = _play("openai", "images.generate", request)
+        return SimpleNamespace(data=[
+            SimpleNamespace(b64_json=base64.b64encode(cassette.get_blob(digest)).decode("ascii"))
+            for digest in response["images"]
+        ])
+
+
+# ElevenLabs: client.text_to_speech.convert (청크 스트림)
+
+class _RecordingTextToSpeech:
+    def __init__(self, text_to_speech: Any):
+        self._text_to_speech = text_to_speech
+
+    def convert(self, text: str, voice_id: str, **kwargs) -> Iterator[bytes]:
+        request = {"text": text, "voice_id": voice_id, **_jsonable(kwargs)}
+        stream = self._text_to_speech.convert(text=text, voice_id=voice_id, **kwargs)
+        # 스트림을 그대로 전달하면서 모아 두었다가 끝까지 읽으면 기록합니다
+        chunks = []
+        for chunk in stream:
+            chunks.append(chunk)
+            yield chunk
+        audio = b"".join(chunks)
+        _record("elevenlabs", "text_to_speech.convert", request, lambda cassette: {"audio": cassette.put_blob(audio)})
+
+
+class _ReplayTextToSpeech:
+    CHUNK_SIZE = 64 * 1024
+
+    def convert(self, text: str, voice_id: str, **kwargs) -> Iterator[bytes]:
+        request = {"text": text, "voice_id": voice_id, **_jsonable(kwargs)}
+        cassette, response = _play("elevenlabs", "text_to_speech.convert", request)
+        audio = cassette.get_blob(response["audio"])
+        return (audio[i:i + self.CHUNK_SIZE] for i in range(0, len(audio), self.CHUNK_SIZE))
+
+
+def recording_client(provider: str, client: Any) -> Any:
+    """실제 클라이언트를 감싸 현재 task의 cassette에 기록하는 클라이언트를 반환합니다."""
+    if provider == "gemini":
+        return SimpleNamespace(models=_RecordingGeminiModels(client.models))
+    if provider == "openai":
+        return SimpleNamespace(
+            chat=SimpleNamespace(completions=_RecordingChatCompletions(client.chat.completions)),
+            images=_RecordingImages(client.images),
+        )
+    if provider == "elevenlabs":
+        return SimpleNamespace(text_to_speech=_RecordingTextToSpeech(client.text_to_speech))
+    raise ValueError(f"Unknown provider: {provider}")
+
+
+def replay_client(provider: str) -> Any:
+    """현재 task의 cassette에서 응답을 재생하는 클라이언트를 반환합니다."""
+    if provider == "gemini":
+        return SimpleNamespace(models=_ReplayGeminiModels())
+    if provider == "openai":
+        return SimpleNamespace(chat=SimpleNamespace(completions=_ReplayChatCompletions()), images=_ReplayImages())
+    if provider == "elevenlabs":
+        return SimpleNamespace(text_to_speech=_ReplayTextToSpeech())
+    raise ValueError(f"Unknown provider: {provider}")
@@ -0,0 +1,407 @@
+"""In-memory fakes for the Google Sheets and YouTube Data APIs
+
+googleapiclient 서비스 객체의 호출 체인(service.spreadsheets().values().get(...).execute())을
+그대로 흉내 내므로 SheetsManager, SheetMirror, SheetsWriteBuffer, YouTubeManager가 코드 변경 없이
+동작합니다. 요청 객체는 ClientPool이 넘겨 준 requestBuilder(quota ledger)로 만들어지므로
+ledger 기록과 QuotaExceeded 변환도 실제 서비스와 같이 동작합니다.
+
+- 오류 주입은 googleapiclient.errors.HttpError로 발생시켜 기존 재시도 경로를 그대로 사용합니다.
+- YouTube는 프로젝트별 일일 unit 한도를 적용하고, 초과하면 403 quotaExceeded를 반환합니다.
+- 업로드 세션은 메모리에만 있으므로 프로세스가 재시작되면 저장된 세션은 404가 되어 새로 업로드합니다.
+"""
+import re
+import json
+import time
+import uuid
+import hashlib
+import threading
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+from .faults import FaultInjector
+
+
+def _http_error(status: int, reason: str = "", message: str = ""):
+    import httplib2
+    from googleapiclient.errors import HttpError
+    resp = httplib2.Response({"status": status, "reason": message or reason})
+    content = {"error": {"code": status, "message": message or reason, "errors": [{"reason": reason, "message": message}]}}
+    return HttpError(resp, json.dumps(content).encode("utf-8"))
+
+
+def _column_index(letters: str) -> int:
+    index = 0
+    for char in letters.upper():
+        index = index * 26 + (ord(char) - ord('A') + 1)
+    return index - 1
+
+
+_CELL = re.compile(r"^([A-Za-z]*)(\d*)$")
+
+
+def parse_a1_range(a1: str) -> Tuple[str, int, Optional[int], int, Optional[int]]:
+    """'Sheet!A2:P', 'Sheet!O5:P5', 'Sheet!A:J' 형식을 (시트, 시작 열, 시작 행, 끝 열, 끝 행)으로 변환합니다.
+
+    열은 0-based, 행은 1-based입니다. 끝 행이 없으면 None(시트 끝까지)입니다.
+    """
+    sheet, _, cells = a1.partition("!")
+    sheet = sheet.strip("'")
+    if not cells:
+        return sheet, 0, 1, 10 ** 6, None
+    start, _, end = cells.partition(":")
+    start_match, end_match = _CELL.match(start), _CELL.match(end or start)
+    if not start_match or not end_match:
+        raise _http_error(400, "badRequest", f"Unable to parse range: {a1}")
+    start_col = _column_index(start_match.group(1)) if start_match.group(1) else 0
+    start_row = int(start_match.group(2)) if start_match.group(2) else 1
+    end_col = _column_index(end_match.group(1)) if end_match.group(1) else 10 ** 6
+    end_row = int(end_match.group(2)) if end_match.group(2) else None
+    return sheet, start_col, start_row, end_col, end_row
+
+
+class FakeGoogleStore:
+    """프로세스 전체에서 공유하는 시트와 비디오 상태"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        # spreadsheet_id -> sheet name -> 행 목록 (1행 = 헤더)
+        self.sheets: Dict[str, Dict[str, List[List[str]]]] = {}
+        self.videos: Dict[str, Dict[str, Any]] = {}
+        # upload URI -> {progress, total, body}
+        self.sessions: Dict[str, Dict[str, Any]] = {}
+        # (project, 기간 시작) -> 사용한 unit
+        self.units: Dict[Tuple[str, float], int] = {}
+
+    def seed_sheet(self, spreadsheet_id: str, sheet_name: str, rows: List[List[Any]], header: Optional[List[str]] = None) -> None:
+        """시트를 헤더와 주어진 행으로 초기화합니다 (벤치마크용 주제 큐)."""
+        with self.lock:
+            header = header or ["Subject", "Creation Time", "Task ID", "Title", "Description", "Hashtags",
+                                "Status", "Scheduled Time", "Video ID", "Video URL", "Views", "Likes",
+                                "Comments", "Notes", "Lease Worker", "Lease Expiry"]
+            self.sheets.setdefault(spreadsheet_id, {})[sheet_name] = [list(header)] + [
+                ["" if value is None else str(value) for value in row] for row in rows
+            ]
+
+    def _sheet(self, spreadsheet_id: str, sheet_name: str) -> List[List[str]]:
+        sheet = self.sheets.get(spreadsheet_id, {}).get(sheet_name)
+        if sheet is None:
+            # 없는 시트는 헤더만 있는 빈 시트로 만듭니다
+            self.seed_sheet(spreadsheet_id, sheet_name, [])
+            sheet = self.sheets[spreadsheet_id][sheet_name]
+        return sheet
+
+    def read(self, spreadsheet_id: str, a1: str) -> Dict[str, Any]:
+        sheet_name, start_col, start_row, end_col, end_row = parse_a1_range(a1)
+        with self.lock:
+            sheet = self._sheet(spreadsheet_id, sheet_name)
+            last = len(sheet) if end_row is None else min(end_row, len(sheet))
+            values = [list(row[start_col:end_col + 1]) for row in sheet[start_row - 1:last]]
+        # 실제 API처럼 끝의 빈 셀과 빈 행은 생략합니다
+        for row in values:
+            while row and row[-1] == "":
+                row.pop()
+        while values and not values[-1]:
+            values.pop()
+        result = {"range": a1, "majorDimension": "ROWS"}
+        if values:
+            result["values"] = values
+        return result
+
+    def write(self, spreadsheet_id: str, a1: str, values: List[List[Any]]) -> int:
+        sheet_name, start_col, start_row, _, _ = parse_a1_range(a1)
+        updated = 0
+        with self.lock:
+            sheet = self._sheet(spreadsheet_id, sheet_name)
+            for offset, row_values in enumerate(values):
+                row_index = start_row - 1 + offset
+                while len(sheet) <= row_index:
+                    sheet.append([])
+                row = sheet[row_index]
+                needed = start_col + len(row_values)
+                if len(row) < needed:
+                    row.extend([""] * (needed - len(row)))
+                for col, value in enumerate(row_values):
+                    row[start_col + col] = "" if value is None else str(value)
+                    updated += 1
+        return updated
+
+    def append(self, spreadsheet_id: str, a1: str, values: List[List[Any]]) -> Dict[str, Any]:
+        sheet_name, start_col, _, _, _ = parse_a1_range(a1)
+        with self.lock:
+            sheet = self._sheet(spreadsheet_id, sheet_name)
+            last = len(sheet)
+            while last > 0 and not any(sheet[last - 1]):
+                last -= 1
+            first_row = last + 1
+            self.write(spreadsheet_id, f"{sheet_name}!{_column_letter(start_col)}{first_row}", values)
+        width = max((len(row) for row in values), default=1)
+        last_row = first_row + len(values) - 1
+        updated_range = f"{sheet_name}!{_column_letter(start_col)}{first_row}:{_column_letter(start_col + width - 1)}{last_row}"
+        return {"updates": {"updatedRange": updated_range, "updatedRows": len(values),
+                            "updatedCells": sum(len(row) for row in values)}}
+
+    def spend(self, project: str, units: int, daily_units: int) -> None:
+        """프로젝트의 일일 unit을 사용합니다. 한도를 넘으면 403 quotaExceeded"""
+        from ..utils.quota_ledger import QuotaLedger
+        key = (project, QuotaLedger.window()[0])
+        with self.lock:
+            if self.units.get(key, 0) + units > daily_units:
+                raise _http_error(403, "quotaExceeded", "The request cannot be completed because you have exceeded your quota.")
+            self.units[key] = self.units.get(key, 0) + units
+
+
+def _column_letter(index: int) -> str:
+    from ..utils.sheets_write_buffer import column_letter
+    return column_letter(index)
+
+
+_store = FakeGoogleStore()
+
+
+def get_fake_google_store() -> FakeGoogleStore:
+    return _store
+
+
+class FakeCredentials:
+    """OAuth 자격 증명 대체 (갱신이 필요 없음)"""
+
+    def __init__(self, token_file: str, project: str = "fake-project"):
+        self.token_file = token_file
+        self.client_id = project
+        self.quota_project_id = project
+        self.valid = True
+        self.expired = False
+        self.refresh_token = None
+        self.expiry = None
+
+
+class FakeHttpRequest:
+    """googleapiclient HttpRequest의 fake (execute, resumable next_chunk)
+
+    ledger requestBuilder의 기반 클래스로 사용되므로 methodId, uri, http, body, resumable_uri 등
+    HttpRequest와 같은 속성을 가집니다. HttpRequest처럼 청크 전송이 실패하면 다음 next_chunk에서
+    서버가 받은 바이트 수부터 다시 보냅니다.
+    """
+
+    def __init__(self, service: "_FakeService", method_id: str, handler=None, body: Any = None, media_body: Any = None):
+        self.service = service
+        self.methodId = method_id
+        self.uri = service.uri(method_id, upload=media_body is not None)
+        self.http = _FakeUploadHttp(service.store)
+        self.handler = handler
+        self.body = json.dumps(body) if body is not None else None
+        self.resumable = media_body
+        self.resumable_uri: Optional[str] = None
+        self.resumable_progress = 0
+        self._in_error_state = False
+
+    def execute(self, http=None, num_retries: int = 0):
+        return self.service.call(self.methodId, self.handler)
+
+    def next_chunk(self, http=None, num_retries: int = 0):
+        store = self.service.store
+        if self.resumable_uri is None:
+            def start_session():
+                self.service.charge(self.methodId)
+                uri = f"fake://upload/{uuid.uuid4().hex}"
+                with store.lock:
+                    store.sessions[uri] = {"progress": 0, "total": self.resumable.size(), "body": json.loads(self.body)}
+                return uri
+            self.resumable_uri = self.service.call(self.methodId, start_session, charge=False)
+
+        with store.lock:
+            session = store.sessions.get(self.resumable_uri)
+        if session is None:
+            # 메모리에만 있는 세션이므로 다른 프로세스가 만든 URI는 만료된 것으로 처리합니다
+            raise _http_error(404, "notFound", "Upload session not found")
+        if self._in_error_state:
+            # 서버가 받은 바이트 수부터 다시 보냅니다
+            self.resumable_progress = session["progress"]
+            self._in_error_state = False
+
+        chunk = min(self.resumable.chunksize(), session["total"] - self.resumable_progress)
+
+        def send_chunk():
+            session["progress"] = self.resumable_progress + chunk
+            return session["progress"]
+        # 청크 전송 시간은 크기에 비례합니다 (설정의 지연은 MB당)
+        try:
+            self.resumable_progress = self.service.upload_injector.call(send_chunk, _injected_http_error, scale=chunk / (1024 * 1024))
+        except Exception:
+            self._in_error_state = True
+            raise
+
+        if self.resumable_progress < session["total"]:
+            return _UploadProgress(self.resumable_progress, session["total"]), None
+        with store.lock:
+            store.sessions.pop(self.resumable_uri, None)
+        return None, self.service.finish_upload(session["body"])
+
+
+class _FakeUploadHttp:
+    """resumable 업로드 세션 상태 조회(빈 PUT)에 응답하는 httplib2.Http의 fake"""
+
+    def __init__(self, store: FakeGoogleStore):
+        self.store = store
+
+    def request(self, uri: str, method: str = "GET", body: Any = None, headers: Optional[Dict[str, str]] = None):
+        import httplib2
+        with self.store.lock:
+            session = self.store.sessions.get(uri)
+            progress = session["progress"] if session else 0
+        if session is None:
+            return httplib2.Response({"status": 404}), b'{"error": {"code": 404, "message": "Upload session not found"}}'
+        headers = {"status": 308}
+        if progress:
+            headers["range"] = f"bytes=0-{progress - 1}"
+        return httplib2.Response(headers), b""
+
+
+class _UploadProgress:
+    def __init__(self, progress: int, total: int):
+        self.resumable_progress = progress
+        self.total_size = total
+
+    def progress(self) -> float:
+        return self.resumable_progress / self.total_size if self.total_size else 1.0
+
+
+def _injected_http_error(status: int):
+    if status == 429:
+        return _http_error(429, "rateLimitExceeded", "Injected rate limit")
+    return _http_error(status, "backendError", "Injected server error")
+
+
+class _FakeService:
+    BASE_URI = ""
+
+    def __init__(self, store: FakeGoogleStore, injector: FaultInjector, request_builder, project: str,
+                 costs: Dict[str, int], daily_units: int, upload_injector: Optional[FaultInjector] = None):
+        self.store = store
+        self.injector = injector
+        self.upload_injector = upload_injector or injector
+        self.request_builder = request_builder or FakeHttpRequest
+        self.project = project
+        self.costs = costs
+        self.daily_units = daily_units
+
+    def uri(self, method_id: str, upload: bool = False) -> str:
+        """실제 요청과 같은 형식의 URI (ledger가 API를 구분하는 데 사용)"""
+        base = self.BASE_URI.replace("googleapis.com/", "googleapis.com/upload/", 1) if upload else self.BASE_URI
+        return base + "/".join(method_id.split(".")[1:-1])
+
+    def request(self, method_id: str, handler=None, body: Any = None, media_body: Any = None):
+        return self.request_builder(self, method_id, handler, body=body, media_body=media_body)
+
+    def charge(self, method_id: str) -> None:
+        if method_id.startswith("youtube."):
+            self.store.spend(self.project, int(self.costs.get(method_id, 1)), self.daily_units)
+
+    def call(self, method_id: str, handler, charge: bool = True):
+        def respond():
+            if charge:
+                self.charge(method_id)
+            return handler()
+        return self.injector.call(respond, _injected_http_error)
+
+
+class _Values:
+    def __init__(self, service: _FakeService):
+        self._service = service
+        self._store = service.store
+
+    def get(self, spreadsheetId: str, range: str, **kwargs):
+        return self._service.request(
+            "sheets.spreadsheets.values.get", lambda: self._store.read(spreadsheetId, range)
+        )
+
+    def update(self, spreadsheetId: str, range: str, body: Dict[str, Any], **kwargs):
+        def handler():
+            updated = self._store.write(spreadsheetId, range, body.get('values', []))
+            return {"spreadsheetId": spreadsheetId, "updatedRange": range, "updatedCells": updated}
+        return self._service.request("sheets.spreadsheets.values.update", handler, body=body)
+
+    def append(self, spreadsheetId: str, range: str, body: Dict[str, Any], **kwargs):
+        def handler():
+            return dict(self._store.append(spreadsheetId, range, body.get('values', [])), spreadsheetId=spreadsheetId)
+        return self._service.request("sheets.spreadsheets.values.append", handler, body=body)
+
+    def batchUpdate(self, spreadsheetId: str, body: Dict[str, Any], **kwargs):
+        def handler():
+            updated = sum(self._store.write(spreadsheetId, item['range'], item['values']) for item in body.get('data', []))
+            return {"spreadsheetId": spreadsheetId, "totalUpdatedCells": updated}
+        return self._service.request("sheets.spreadsheets.values.batchUpdate", handler, body=body)
+
+
+class FakeSheetsService(_FakeService):
+    BASE_URI = "https://sheets.googleapis.com/v4/"
+
+    def spreadsheets(self):
+        return SimpleNamespace(values=lambda: _Values(self))
+
+
+class _Videos:
+    def __init__(self, service: "FakeYouTubeService"):
+        self._service = service
+        self._store = service.store
+
+    def insert(self, part: str, body: Dict[str, Any], media_body: Any = None, **kwargs):
+        return self._service.request("youtube.videos.insert", body=body, media_body=media_body)
+
+    def list(self, part: str, id: str = "", **kwargs):
+        def handler():
+            items = []
+            with self._store.lock:
+                for video_id in filter(None, id.split(",")):
+                    video = self._store.videos.get(video_id)
+                    if video is not None:
+                        items.append(self._service.video_resource(video))
+            return {"kind": "youtube#videoListResponse", "items": items}
+        return self._service.request("youtube.videos.list", handler)
+
+
+class FakeYouTubeService(_FakeService):
+    BASE_URI = "https://youtube.googleapis.com/youtube/v3/"
+
+    def videos(self):
+        return _Videos(self)
+
+    def finish_upload(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        video_id = hashlib.sha256(uuid.uuid4().bytes).hexdigest()[:11]
+        video = {"id": video_id, "snippet": body.get('snippet', {}), "status": body.get('status', {}),
+                 "uploaded_at": time.time()}
+        with self.store.lock:
+            self.store.videos[video_id] = video
+        return {"kind": "youtube#video", "id": video_id, "snippet": video["snippet"], "status": video["status"]}
+
+    @staticmethod
+    def video_resource(video: Dict[str, Any]) -> Dict[str, Any]:
+        """업로드 후 경과 시간에 따라 결정적으로 늘어나는 통계를 만듭니다."""
+        hours = max(0.0, (time.time() - video["uploaded_at"]) / 3600)
+        seed = int(video["id"].encode("utf-8").hex(), 16) % 97 + 3
+        views = int(seed * 10 * hours)
+        return {
+            "id": video["id"],
+            "statistics": {"viewCount": str(views), "likeCount": str(views // 20), "commentCount": str(views // 200)},
+            "status": {"privacyStatus": video["status"].get("privacyStatus", "private")},
+        }
+
+
+def create_fake_service(api: str, version: str, credentials: Any, request_builder=None, config: Optional[Dict[str, Any]] = None):
+    """googleapiclient.discovery.build 대체 (sheets v4, youtube v3)"""
+    from ..utils.quota_ledger import DEFAULT_COSTS
+    from .settings import get_fault_injector
+
+    config = config or {}
+    project = getattr(credentials, 'client_id', None) or "fake-project"
+    youtube_config = config.get('youtube') or {}
+    costs = dict(DEFAULT_COSTS)
+    costs.update(youtube_config.get('costs') or {})
+    daily_units = int(youtube_config.get('daily_units', 10000))
+    if api == 'sheets':
+        return FakeSheetsService(_store, get_fault_injector('sheets'), request_builder, project, costs, daily_units)
+    if api == 'youtube':
+        return FakeYouTubeService(
+            _store, get_fault_injector('youtube'), request_builder, project, costs, daily_units,
+            upload_injector=get_fault_injector('youtube_upload'),
+        )
+    raise ValueError(f"No fake service for {api} {version}")
@@ -0,0 +1,210 @@
+"""Offline fakes for the Gemini and OpenAI clients
+
+ContentGenerator, ImageGenerator, VisualDirector가 사용하는 메서드만 구현합니다.
+- 텍스트 요청: 프롬프트에서 정해지는 미리 준비된(canned) 콘텐츠 플랜 JSON
+  (스트리밍 요청은 같은 JSON을 조각으로 나누어 지연 시간 동안 나눠 보냅니다).
+  요청의 응답 스키마가 일부 필드만 요구하면(수정 요청) 그 필드만 반환하고, 배치 요청에는
+  프롬프트의 주제 목록마다 하나씩 플랜을 반환합니다.
+  content_plan.invalid_rate 확률로 필드 하나가 빠지거나 빈 플랜을 반환합니다.
+- 이미지 요청: 설정한 크기의 합성 PNG
+"""
+import re
+import json
+import base64
+import random
+import hashlib
+import threading
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+from .faults import FaultInjector
+from .media import synthetic_png
+from ..core.content.prompts import BATCH_SUBJECTS_HEADER
+from ..core.content.schema import target_value
+
+
+# 스트리밍 응답 조각 하나의 글자 수 (토큰 몇 개 분량)
+STREAM_CHUNK_CHARS = 48
+
+_SCRIPTS = [
+    "Here is something most people never notice about this topic.",
+    "It starts with a simple question that turns out to be surprisingly deep.",
+    "Scientists spent decades looking for the answer in the wrong place.",
+    "The real explanation is hiding in plain sight, all around us every day.",
+    "Once you see it, you will never look at the world the same way again.",
+    "And the strangest part is how recently we finally figured it out.",
+]
+
+
+def _prompt_text(contents: Any) -> str:
+    """generate_content의 contents(문자열 또는 types.Content)에서 텍스트를 꺼냅니다."""
+    if isinstance(contents, str):
+        return contents
+    parts = getattr(contents, "parts", None) or []
+    return "\n".join(getattr(part, "text", "") or "" for part in parts)
+
+
+def _split(text: str) -> List[str]:
+    return [text[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(text), STREAM_CHUNK_CHARS)] or [""]
+
+
+def canned_content_plan(prompt: str, scenes: int = 4, script_sentences: int = 1) -> Dict[str, Any]:
+    """프롬프트에서 정해지는 콘텐츠 플랜을 만듭니다 (ContentGenerator 필수 필드 포함).
+
+    이미지 스타일은 프롬프트의 'LIST OF IMAGE STYLES NAMES' 목록에서 고르므로
+    크리에이터 설정의 image_style_guide에 있는 이름만 사용됩니다.
+    씬 스크립트는 script_sentences개의 문장으로 이루어집니다 (나레이션 길이 조절용).
+    """
+    digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+    match = re.search(r"LIST OF IMAGE STYLES NAMES:\s*(.+)", prompt)
+    styles = [name.strip() for name in match.group(1).split(",") if name.strip()] if match else ["default"]
+
+    def scene(index: int, role: str) -> Dict[str, Any]:
+        return {
+            "script": " ".join(
+                _SCRIPTS[(digest[index % len(digest)] + index + n) % len(_SCRIPTS)] for n in range(script_sentences)
+            ),
+            "image_keywords": [role, f"keyword{index}", "illustrative"],
+            "scene_description": f"A clear, brightly lit {role} illustration (variant {digest[index % len(digest)]}).",
+            "image_to_video": "Slow zoom in.",
+            "image_style_name": styles[(digest[(index + 7) % len(digest)]) % len(styles)],
+        }
+
+    return {
+        "video_title": f"Offline benchmark video {digest.hex()[:8]} 🤖",
+        "video_description": "Generated by the offline fake LLM provider.",
+        "hashtags": ["shorts", "benchmark", "offline"],
+        "hook": scene(0, "hook"),
+        "scenes": [scene(i, "scene") for i in range(1, scenes + 1)],
+        "conclusion": scene(scenes + 1, "conclusion"),
+        "music_suggestion": "Upbeat, curious background music",
+    }
+
+
+class _PlanWriter:
+    """요청 스키마와 invalid_rate를 반영해 콘텐츠 플랜 응답 텍스트를 만듭니다."""
+
+    def __init__(self, config: Dict[str, Any]):
+        self._config = config
+        self._rng = random.Random(f"{config.get('seed', 0)}:content_plan")
+        self._lock = threading.Lock()
+
+    def text(self, prompt: str, schema: Optional[Dict[str, Any]] = None) -> str:
+        targets = list((schema or {}).get("properties") or {})
+        if targets == ["plans"]:
+            return json.dumps({"plans": self._batch(prompt)}, ensure_ascii=False, indent=2)
+        plan = self._plan(prompt)
+        if targets and set(targets) != set(plan):
+            # 수정 요청: 스키마가 요구하는 부분만 반환합니다
+            plan = {target: target_value(plan, target) for target in targets}
+        else:
+            self._maybe_invalidate(plan)
+        return json.dumps(plan, ensure_ascii=False, indent=2)
+
+    def _plan(self, prompt: str) -> Dict[str, Any]:
+        return canned_content_plan(prompt, self._config["scenes"], self._config["script_sentences"])
+
+    def _batch(self, prompt: str) -> List[Dict[str, Any]]:
+        """배치 프롬프트 끝의 번호 목록에서 주제를 읽어 주제마다 플랜을 만듭니다."""
+        listing = prompt.rsplit(BATCH_SUBJECTS_HEADER, 1)[-1]
+        items = []
+        for subject in re.findall(r"^\d+\. (.+)$", listing, re.MULTILINE):
+            plan = self._plan(f"{prompt}\n{subject}")
+            self._maybe_invalidate(plan)
+            items.append({"subject": subject, "plan": plan})
+        return items
+
+    def _maybe_invalidate(self, plan: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._rng.random() >= self._config.get("invalid_rate", 0.0):
+                return
+            choice = self._rng.randrange(3)
+            field = self._rng.choice(sorted(plan))
+            scene = self._rng.randrange(len(plan["scenes"]))
+        if choice == 0:
+            del plan[field]
+        elif choice == 1:
+            plan["scenes"][scene]["script"] = ""
+        else:
+            plan["scenes"][scene].pop("image_style_name", None)
+
+
+def _gemini_schema(config: Any) -> Optional[Dict[str, Any]]:
+    """generate_content의 config(dict 또는 GenerateContentConfig)에서 response_schema를 꺼냅니다."""
+    schema = config.get("response_schema") if isinstance(config, dict) else getattr(config, "response_schema", None)
+    return schema if isinstance(schema, dict) else None
+
+
+class _GeminiModels:
+    def __init__(self, llm: FaultInjector, image: FaultInjector, config: Dict[str, Any]):
+        self._llm = llm
+        self._image = image
+        self._config = config
+        self._writer = _PlanWriter(config)
+
+    def generate_content(self, model: str, contents: Any, config: Any = None) -> Any:
+        prompt = _prompt_text(contents)
+        if "image" in model:
+            def respond():
+                data = synthetic_png(self._config["width"], self._config["height"], prompt)
+                parts = [SimpleNamespace(text="", inline_data=SimpleNamespace(data=data, mime_type="image/png"))]
+                return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=parts))])
+            return self._image.call(respond)
+
+        def respond():
+            text = self._writer.text(prompt, _gemini_schema(config))
+            parts = [SimpleNamespace(text=text, inline_data=None)]
+            return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=parts))], text=text)
+        return self._llm.call(respond)
+
+    def generate_content_stream(self, model: str, contents: Any, config: Any = None) -> Iterator[Any]:
+        prompt = _prompt_text(contents)
+        for piece in self._llm.stream(lambda: _split(self._writer.text(prompt, _gemini_schema(config)))):
+            yield SimpleNamespace(text=piece)
+
+
+class FakeGeminiClient:
+    """google-genai Client 대체 (client.models.generate_content)"""
+
+    def __init__(self, llm: FaultInjector, image: FaultInjector, config: Dict[str, Any]):
+        self.models = _GeminiModels(llm, image, config)
+
+
+class _ChatCompletions:
+    def __init__(self, llm: FaultInjector, config: Dict[str, Any]):
+        self._llm = llm
+        self._writer = _PlanWriter(config)
+
+    def create(self, model: str, messages: List[Dict[str, str]], stream: bool = False,
+               response_format: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+        prompt = "\n".join(message.get("content", "") for message in messages)
+        schema = ((response_format or {}).get("json_schema") or {}).get("schema")
+
+        def text():
+            return self._writer.text(prompt, schema)
+
+        if stream:
+            return (
+                SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+                for piece in self._llm.stream(lambda: _split(text()))
+            )
+        return self._llm.call(lambda: SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text()))]))
+
+
+class _Images:
+    def __init__(self, image: FaultInjector, config: Dict[str, Any]):
+        self._image = image
+        self._config = config
+
+    def generate(self, model: str, prompt: str, **kwargs) -> Any:
+        def respond():
+            data = synthetic_png(self._config["width"], self._config["height"], prompt)
+            return SimpleNamespace(data=[SimpleNamespace(b64_json=base64.b64encode(data).decode("ascii"))])
+        return self._image.call(respond)
+
+
+class FakeOpenAIClient:
+    """openai.OpenAI 대체 (chat.completions.create, images.generate)"""
+
+    def __init__(self, llm: FaultInjector, image: FaultInjector, config: Dict[str, Any]):
+        self.chat = SimpleNamespace(completions=_ChatCompletions(llm, config))
+        self.images = _Images(image, config)
@@ -0,0 +1,36 @@
+"""Offline fake for the ElevenLabs client
+
+text_to_speech.convert()는 스크립트 길이에 비례하는 길이의 사인파 WAV를 청크 단위로 반환합니다.
+파일 확장자는 .mp3로 저장되지만 ffmpeg는 내용으로 형식을 판별하므로 probe와 인코딩에 문제가 없습니다.
+"""
+from typing import Any, Dict, Iterator
+from .faults import FaultInjector
+from .media import tone_wav
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+def speech_duration(text: str, chars_per_second: float, min_seconds: float) -> float:
+    """스크립트를 읽는 데 걸리는 시간(초)을 추정합니다."""
+    return max(min_seconds, len(text.strip()) / chars_per_second)
+
+
+class _TextToSpeech:
+    def __init__(self, tts: FaultInjector, config: Dict[str, Any]):
+        self._tts = tts
+        self._config = config
+
+    def convert(self, text: str, voice_id: str = "", **kwargs) -> Iterator[bytes]:
+        def respond():
+            duration = speech_duration(text, self._config["chars_per_second"], self._config["min_seconds"])
+            return tone_wav(duration, f"{voice_id}:{text}", self._config["sample_rate"])
+        audio = self._tts.call(respond)
+        return (audio[i:i + CHUNK_SIZE] for i in range(0, len(audio), CHUNK_SIZE))
+
+
+class FakeElevenLabsClient:
+    """elevenlabs.client.ElevenLabs 대체 (text_to_speech.convert)"""
+
+    def __init__(self, tts: FaultInjector, config: Dict[str, Any]):
+        self.text_to_speech = _TextToSpeech(tts, config)
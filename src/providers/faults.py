@@ -0,0 +1,122 @@
+"""Latency and error injection for offline fake providers"""
+import math
+import time
+import random
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+class ProviderError(Exception):
+    """fake provider가 주입한 HTTP 오류 (429: rate limit, 500: 서버 오류)"""
+
+    def __init__(self, provider: str, status_code: int):
+        super().__init__(f"{provider}: injected HTTP {status_code}")
+        self.provider = provider
+        self.status_code = status_code
+
+
+class LatencyModel:
+    def __init__(self, distribution: str = "fixed", median: float = 0.0, sigma: float = 0.0,
+                 minimum: float = 0.0, maximum: Optional[float] = None):
+        """
+        Args:
+            distribution (str): "fixed", "uniform"(median±sigma) 또는 "lognormal"(중앙값 median, 로그 표준편차 sigma)
+            median (float): 중앙값 (초)
+            sigma (float): 분산 정도
+            minimum (float): 최소 지연 (초)
+            maximum (float, optional): 최대 지연 (초)
+        """
+        if distribution not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.distribution = distribution
+        self.median = float(median)
+        self.sigma = float(sigma)
+        self.minimum = float(minimum)
+        self.maximum = float(maximum) if maximum is not None else None
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "LatencyModel":
+        config = dict(config or {})
+        if "min" in config:
+            config["minimum"] = config.pop("min")
+        if "max" in config:
+            config["maximum"] = config.pop("max")
+        return cls(**config)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.distribution == "fixed" or self.median <= 0:
+            value = self.median
+        elif self.distribution == "uniform":
+            value = rng.uniform(self.median - self.sigma, self.median + self.sigma)
+        else:
+            value = math.exp(rng.gauss(math.log(self.median), self.sigma))
+        value = max(self.minimum, value)
+        return min(self.maximum, value) if self.maximum is not None else value
+
+
+class FaultInjector:
+    def __init__(self, name: str, latency: LatencyModel, error_rates: Optional[Dict[int, float]] = None,
+                 seed: Any = 0, time_scale: float = 1.0):
+        """
+        Args:
+            name (str): provider 이름 (예: "llm", "image", "tts", "sheets", "youtube")
+            latency (LatencyModel): 호출당 지연 분포
+            error_rates (Dict[int, float], optional): HTTP 상태 코드별 발생 확률 (예: {429: 0.02, 500: 0.01})
+            seed: 난수 시드 (같은 시드와 호출 순서면 같은 지연과 오류가 발생)
+            time_scale (float): 모든 지연에 곱하는 배율 (0이면 기다리지 않음)
+        """
+        self.name = name
+        self.latency = latency
+        self.error_rates = {int(status): float(rate) for status, rate in (error_rates or {}).items()}
+        self.time_scale = time_scale
+        self._rng = random.Random(f"{seed}:{name}")
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors: Dict[int, int] = {}
+
+    def sample(self) -> tuple:
+        """(지연 초, 주입할 상태 코드 또는 None)을 뽑습니다."""
+        with self._lock:
+            self.calls += 1
+            delay = self.latency.sample(self._rng) * self.time_scale
+            roll = self._rng.random()
+            status = None
+            for code, rate in sorted(self.error_rates.items()):
+                if roll < rate:
+                    status = code
+                    break
+                roll -= rate
+            if status is not None:
+                self.errors[status] = self.errors.get(status, 0) + 1
+            return delay, status
+
+    def call(self, fn: Callable[[], Any], raise_error: Optional[Callable[[int], Exception]] = None,
+             scale: float = 1.0) -> Any:
+        """지연 후 오류를 주입하거나 fn()의 결과를 반환합니다.
+
+        Args:
+            fn (Callable): 실제 응답을 만드는 함수
+            raise_error (Callable, optional): 상태 코드로 발생시킬 예외를 만드는 함수 (기본값: ProviderError)
+            scale (float): 이번 호출의 지연 배율 (예: 업로드 청크 크기에 비례)
+        """
+        delay, status = self.sample()
+        if delay * scale > 0:
+            time.sleep(delay * scale)
+        if status is not None:
+            raise (raise_error or (lambda code: ProviderError(self.name, code)))(status)
+        return fn()
+
+    def stream(self, fn: Callable[[], List[Any]]) -> Iterator[Any]:
+        """call()의 스트리밍 버전: 지연을 fn()이 만든 조각들 사이에 나누어 하나씩 내보냅니다."""
+        delay, status = self.sample()
+        if status is not None:
+            raise ProviderError(self.name, status)
+        pieces = fn()
+        for piece in pieces:
+            if delay > 0:
+                time.sleep(delay / len(pieces))
+            yield piece
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"calls": self.calls, "errors": dict(self.errors)}
@@ -0,0 +1,52 @@
+"""Deterministic synthetic media for fake providers (표준 라이브러리만 사용)"""
+import sys
+import math
+import zlib
+import array
+import struct
+import hashlib
+
+
+def _seed_bytes(seed: str) -> bytes:
+    return hashlib.sha256(seed.encode("utf-8")).digest()
+
+
+def synthetic_png(width: int, height: int, seed: str) -> bytes:
+    """seed에서 정해지는 두 색의 세로 그라디언트 PNG (RGB 8bit)를 만듭니다."""
+    digest = _seed_bytes(seed)
+    top, bottom = digest[0:3], digest[3:6]
+    raw = bytearray()
+    for y in range(height):
+        t = y / max(1, height - 1)
+        color = bytes(int(a + (b - a) * t) for a, b in zip(top, bottom))
+        raw += b"\x00" + color * width  # 필터 없음
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(bytes(raw), 1))
+        + chunk(b"IEND", b"")
+    )
+
+
+def tone_wav(duration: float, seed: str, sample_rate: int = 22050) -> bytes:
+    """seed에서 정해지는 주파수(220~660Hz)의 사인파 WAV (16bit mono)를 만듭니다."""
+    frequency = 220 + _seed_bytes(seed)[0] / 255 * 440
+    # 정수 주파수면 1초 버퍼를 반복해서 이어 붙일 수 있습니다
+    frequency = int(frequency)
+    second = array.array("h", (
+        int(8000 * math.sin(2 * math.pi * frequency * i / sample_rate)) for i in range(sample_rate)
+    ))
+    total = int(duration * sample_rate)
+    samples = (second * (total // sample_rate + 1))[:total]
+    if sys.byteorder == "big":
+        samples.byteswap()  # WAV는 little-endian
+    data = samples.tobytes()
+    header = b"RIFF" + struct.pack("<I", 36 + len(data)) + b"WAVE"
+    header += b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16)
+    header += b"data" + struct.pack("<I", len(data))
+    return header + data
@@ -0,0 +1,92 @@
+"""Provider selection and fake provider configuration
+
+SHORTFACTORY_PROVIDERS로 ClientPool이 반환하는 클라이언트를 선택합니다.
+- live (기본값): 실제 API 클라이언트
+- fake: src/providers의 오프라인 fake. 지연 분포, 오류 주입 비율, quota, 생성물 크기는
+  config/fake_providers.yaml (또는 SHORTFACTORY_FAKE_CONFIG 경로)에서 설정합니다.
+- record: 실제 LLM/이미지/TTS 클라이언트의 요청과 응답을 task별 cassette에 기록합니다.
+- replay: LLM/이미지/TTS 응답을 cassette에서 재생하고 Google API는 지연 없는 fake를 사용합니다
+  (네트워크 호출 없음).
+"""
+import os
+import threading
+from typing import Any, Dict, Optional
+import yaml
+from .faults import FaultInjector, LatencyModel
+
+
+PROVIDERS_ENV = "SHORTFACTORY_PROVIDERS"
+FAKE_CONFIG_ENV = "SHORTFACTORY_FAKE_CONFIG"
+DEFAULT_FAKE_CONFIG_PATH = os.path.join("config", "fake_providers.yaml")
+PROVIDER_MODES = ("live", "fake", "record", "replay")
+# 실제 이미지 API 요청 사이의 대기 시간 (초)
+IMAGE_PACING_SECONDS = 5.0
+
+_config: Optional[Dict[str, Any]] = None
+_injectors: Dict[str, FaultInjector] = {}
+_lock = threading.Lock()
+
+
+def provider_mode() -> str:
+    mode = os.getenv(PROVIDERS_ENV, "live").lower()
+    if mode not in PROVIDER_MODES:
+        raise ValueError(f"Unknown {PROVIDERS_ENV}={mode!r} (expected one of: {', '.join(PROVIDER_MODES)})")
+    return mode
+
+
+def use_fake_providers() -> bool:
+    """LLM/이미지/TTS를 fake로 대체하는지 여부"""
+    return provider_mode() == "fake"
+
+
+def use_fake_google() -> bool:
+    """Google Sheets/YouTube를 메모리 fake로 대체하는지 여부 (fake, replay 모드)"""
+    return provider_mode() in ("fake", "replay")
+
+
+def load_fake_config(reload: bool = False) -> Dict[str, Any]:
+    """fake provider 설정을 로드합니다 (프로세스에서 한 번)."""
+    global _config
+    with _lock:
+        if _config is None or reload:
+            path = os.getenv(FAKE_CONFIG_ENV, DEFAULT_FAKE_CONFIG_PATH)
+            config = {}
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    config = yaml.safe_load(f) or {}
+            _config = config
+            _injectors.clear()
+        return _config
+
+
+def get_fault_injector(name: str) -> FaultInjector:
+    """provider 이름별 지연/오류 주입기를 반환합니다 (설정에 없으면 지연과 오류 없음)."""
+    config = load_fake_config()
+    with _lock:
+        if name not in _injectors:
+            # replay는 렌더링 경로를 빠르게 반복하기 위한 모드이므로 지연과 오류를 주입하지 않습니다
+            provider_config = {} if provider_mode() == "replay" else (config.get('providers') or {}).get(name) or {}
+            _injectors[name] = FaultInjector(
+                name,
+                LatencyModel.from_config(provider_config.get('latency')),
+                error_rates=provider_config.get('error_rates'),
+                seed=config.get('seed', 0),
+                time_scale=float(config.get('time_scale', 1.0)),
+            )
+        return _injectors[name]
+
+
+def image_pacing_seconds() -> float:
+    """이미지 생성 요청 사이의 대기 시간 (fake 모드는 설정의 image.pacing_seconds, 기본 0, replay 모드는 0)"""
+    if provider_mode() == "replay":
+        return 0.0
+    if use_fake_providers():
+        return float((load_fake_config().get('image') or {}).get('pacing_seconds', 0))
+    return IMAGE_PACING_SECONDS
+
+
+def fault_stats() -> Dict[str, Dict[str, Any]]:
+    """provider별 호출 수와 주입된 오류 수"""
+    with _lock:
+        injectors = dict(_injectors)
+    return {name: injector.stats() for name, injector in sorted(injectors.items())}
@@ -0,0 +1,112 @@
+"""Multi-creator scheduler with per-creator quotas
+
+config/prompts의 모든 크리에이터를 하나의 프로세스에서 동시에 처리합니다.
+- 크리에이터별 일일 비디오 할당량과 동시 실행 수 제한
+- 이미지/TTS/LLM 호출 한도를 크리에이터 간에 공정하게 분배
+- ffmpeg 인코딩 작업 수를 전역적으로 제한하여 한 크리에이터의 백로그가
+  다른 크리에이터를 굶기지 않도록 합니다.
+- YouTube quota ledger로 오늘 업로드할 수 없는 비디오는 렌더링을 시작하지 않습니다.
+"""
+import os
+from datetime import date
+from typing import Dict, Any, List, Optional, Tuple
+from .daemon import FactoryDaemon
+from .utils import rate_limiter
+from .utils.quota_ledger import get_quota_ledger
+
+
+DEFAULT_CONFIG_PATH = os.path.join("config", "scheduler.yaml")
+
+
+class CreatorScheduler(FactoryDaemon):
+    def __init__(
+        self,
+        quotas: Optional[Dict[str, Dict[str, int]]] = None,
+        rate_limits: Optional[Dict[str, float]] = None,
+        ffmpeg_jobs: Optional[int] = None,
+        **kwargs
+    ):
+        """
+        Args:
+            quotas (Dict[str, Dict[str, int]], optional): 크리에이터별 할당량
+                ("default" 키는 기본값). videos_per_day, max_in_flight
+            rate_limits (Dict[str, float], optional): 공유 API 한도 (분당 요청 수)
+            ffmpeg_jobs (int, optional): 동시에 실행할 수 있는 ffmpeg 작업 수
+            **kwargs: FactoryDaemon 인자 (creators가 없으면 모든 크리에이터)
+        """
+        super().__init__(**kwargs)
+        self.quotas = quotas or {}
+        rate_limiter.configure_rate_limits(rate_limits or {}, ffmpeg_jobs=ffmpeg_jobs)
+        self._quota_date = date.today()
+        self._started_today: Dict[str, int] = {creator: 0 for creator in self.creators}
+        # creator -> YouTube quota 프로젝트 (처음 필요할 때 조회)
+        self._quota_projects: Dict[str, str] = {}
+
+    @classmethod
+    def from_config(cls, config_path: str = DEFAULT_CONFIG_PATH, **overrides) -> "CreatorScheduler":
+        return super().from_config(config_path, **overrides)
+
+    @classmethod
+    def _config_kwargs(cls, config: Dict[str, Any]) -> Dict[str, Any]:
+        kwargs = super()._config_kwargs(config)
+        kwargs.update(
+            quotas=config.get('quotas'),
+            rate_limits=config.get('rate_limits'),
+            ffmpeg_jobs=config.get('ffmpeg_jobs'),
+        )
+        return kwargs
+
+    def _quota(self, creator: str) -> Dict[str, int]:
+        quota = dict(self.quotas.get('default', {}))
+        quota.update(self.quotas.get(creator, {}))
+        return quota
+
+    def _in_flight_count(self, creator: str) -> int:
+        return sum(1 for c, _ in self._in_flight.values() if c == creator)
+
+    def _quota_project(self, creator: str) -> str:
+        if creator not in self._quota_projects:
+            from .utils.youtube_manager import YouTubeManager
+            self._quota_projects[creator] = YouTubeManager(creator).quota_project
+        return self._quota_projects[creator]
+
+    def _has_upload_quota(self, creator: str) -> bool:
+        """진행 중인 비디오를 포함해 오늘 한 개를 더 업로드할 YouTube quota가 있는지 확인합니다."""
+        try:
+            project = self._quota_project(creator)
+            in_flight = sum(1 for c, _ in self._in_flight.values() if self._quota_project(c) == project)
+            render_now, _ = get_quota_ledger().plan_uploads(project, 1, in_flight=in_flight)
+        except Exception as e:
+            self.logger.warning(f"Could not check YouTube quota for {creator}: {str(e)}")
+            return True
+        return render_now > 0
+
+    def _has_capacity(self, creator: str) -> bool:
+        """크리에이터의 일일 할당량, 동시 실행 한도, YouTube quota가 남아 있는지 확인합니다."""
+        quota = self._quota(creator)
+        videos_per_day = quota.get('videos_per_day', 0)
+        if videos_per_day and self._started_today[creator] >= videos_per_day:
+            return False
+        max_in_flight = quota.get('max_in_flight', 0)
+        if max_in_flight and self._in_flight_count(creator) >= max_in_flight:
+            return False
+        return self._has_upload_quota(creator)
+
+    def _next_job(self) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """가장 적게 실행 중이고 오늘 가장 적게 처리한 크리에이터부터 주제를 찾습니다."""
+        today = date.today()
+        if today != self._quota_date:
+            self._quota_date = today
+            self._started_today = {creator: 0 for creator in self.creators}
+
+        candidates: List[str] = [creator for creator in self.creators if self._has_capacity(creator)]
+        candidates.sort(key=lambda c: (self._in_flight_count(c), self._started_today[c]))
+
+        for creator in candidates:
+            busy_rows = {row for c, row in self._in_flight.values() if c == creator}
+            busy_rows |= self._failed_rows[creator]
+            subject = self._claim_subject(creator, busy_rows)
+            if subject:
+                self._started_today[creator] += 1
+                return creator, subject
+        return None
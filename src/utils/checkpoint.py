@@ -0,0 +1,165 @@
+"""Per-task stage checkpoints for resuming interrupted videos
+
+각 비디오(task)마다 data/<creator>/<task_id>/manifest.json 파일에
+완료된 단계와 그 결과물(파일 경로 + SHA-256 해시)을 기록합니다.
+"""
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Any, List, Optional
+from .metrics import metrics
+
+
+# 파이프라인 단계 (실행 순서)
+STAGES = ["content", "visuals", "narrations", "assembly", "upload", "sheets"]
+
+# 단계가 완료될 때 (creator, task_id, stage)로 호출되는 함수 (예: HTTP 서비스의 진행 상황 스트림)
+_stage_listeners: List[Callable[[str, str, str], None]] = []
+
+
+def add_stage_listener(listener: Callable[[str, str, str], None]) -> None:
+    _stage_listeners.append(listener)
+
+
+def remove_stage_listener(listener: Callable[[str, str, str], None]) -> None:
+    if listener in _stage_listeners:
+        _stage_listeners.remove(listener)
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """파일의 SHA-256 해시를 계산합니다."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def atomic_write_json(path: str, data: Any) -> None:
+    """임시 파일에 쓴 뒤 os.replace로 교체하여 JSON을 원자적으로 저장합니다."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class TaskCheckpoint:
+    MANIFEST_NAME = "manifest.json"
+
+    def __init__(self, task_id: str, creator: str, model: Optional[str] = None):
+        self.task_id = task_id
+        self.creator = creator
+        self.base_dir = os.path.join("data", creator, task_id)
+        self.path = os.path.join(self.base_dir, self.MANIFEST_NAME)
+        self._lock = threading.Lock()
+        self.manifest = self._load() or {
+            "task_id": task_id,
+            "creator": creator,
+            "model": model,
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "subject": None,
+            "stages": {},
+        }
+        if model and not self.manifest.get("model"):
+            self.manifest["model"] = model
+
+    @classmethod
+    def load(cls, creator: str, task_id: str) -> "TaskCheckpoint":
+        """기존 manifest를 로드합니다. 없으면 FileNotFoundError를 발생시킵니다."""
+        path = os.path.join("data", creator, task_id, cls.MANIFEST_NAME)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Manifest not found: {path}")
+        return cls(task_id, creator)
+
+    @classmethod
+    def list_incomplete(cls, creator: str) -> List[str]:
+        """완료되지 않은 task ID 목록을 생성 시간순으로 반환합니다."""
+        creator_dir = os.path.join("data", creator)
+        if not os.path.isdir(creator_dir):
+            return []
+
+        incomplete = []
+        for task_id in os.listdir(creator_dir):
+            if not os.path.exists(os.path.join(creator_dir, task_id, cls.MANIFEST_NAME)):
+                continue
+            checkpoint = cls(task_id, creator)
+            if not checkpoint.is_finished():
+                incomplete.append((checkpoint.manifest.get("created_at", ""), task_id))
+        return [task_id for _, task_id in sorted(incomplete)]
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save(self) -> None:
+        atomic_write_json(self.path, self.manifest)
+
+    @property
+    def model(self) -> Optional[str]:
+        return self.manifest.get("model")
+
+    @property
+    def subject(self) -> Optional[Dict[str, Any]]:
+        return self.manifest.get("subject")
+
+    def set_subject(self, subject: Dict[str, Any]) -> None:
+        """처리 중인 주제(subject, row_index, creation_time)를 기록합니다."""
+        with self._lock:
+            self.manifest["subject"] = {
+                "subject": subject.get("subject"),
+                "row_index": subject.get("row_index"),
+                "creation_time": str(subject.get("creation_time", "")),
+            }
+            self._save()
+
+    def complete_stage(self, stage: str, outputs: Dict[str, Any], files: Optional[List[str]] = None) -> None:
+        """단계 완료를 기록합니다. files에 포함된 결과물은 해시와 함께 저장됩니다."""
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage: {stage}")
+        with self._lock:
+            self.manifest["stages"][stage] = {
+                "completed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "outputs": outputs,
+                "files": {path: file_sha256(path) for path in (files or [])},
+            }
+            self._save()
+        metrics.inc("shortfactory_stage_completed_total", creator=self.creator, stage=stage)
+        for listener in list(_stage_listeners):
+            listener(self.creator, self.task_id, stage)
+
+    def is_complete(self, stage: str) -> bool:
+        """단계가 완료되었고 결과물 파일이 변경되지 않았는지 확인합니다."""
+        record = self.manifest["stages"].get(stage)
+        if not record:
+            return False
+        for path, digest in record.get("files", {}).items():
+            if not os.path.exists(path) or file_sha256(path) != digest:
+                return False
+        return True
+
+    def get_outputs(self, stage: str) -> Dict[str, Any]:
+        """완료된 단계의 결과를 반환합니다."""
+        return self.manifest["stages"][stage]["outputs"]
+
+    def invalidate(self, stage: str) -> None:
+        """단계 기록을 삭제합니다 (입력이 다시 생성되어 재실행이 필요할 때)."""
+        with self._lock:
+            if self.manifest["stages"].pop(stage, None) is not None:
+                self._save()
+
+    def is_finished(self) -> bool:
+        return all(stage in self.manifest["stages"] for stage in STAGES)
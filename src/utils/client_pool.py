@@ -0,0 +1,263 @@
+"""Process-wide registry of long-lived API clients
+
+Google(Sheets/YouTube), OpenAI, Gemini, ElevenLabs 클라이언트를 프로세스당 한 번만
+생성하여 재사용합니다. HTTP 연결은 클라이언트(또는 스레드별 서비스 객체)에 유지되고,
+OAuth 자격 증명은 만료 전에 백그라운드 스레드에서 미리 갱신됩니다.
+
+SHORTFACTORY_PROVIDERS=fake 이면 모든 클라이언트 대신 src/providers의 오프라인 fake를
+반환합니다 (네트워크 없이 벤치마크할 때 사용). record/replay 이면 LLM/이미지/TTS 호출을
+task별 cassette에 기록하거나 cassette에서 재생합니다 (src/providers/cassette.py).
+"""
+import os
+import pickle
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+from dotenv import load_dotenv
+from .logger import Logger
+from .quota_ledger import credentials_project, make_request_builder
+from .metrics import metrics
+from ..providers.settings import (
+    get_fault_injector, load_fake_config, provider_mode, use_fake_google, use_fake_providers
+)
+
+
+class ClientPool:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    # 만료까지 이 시간보다 적게 남은 토큰은 백그라운드에서 갱신합니다
+    REFRESH_MARGIN = timedelta(minutes=5)
+    REFRESH_CHECK_INTERVAL = 60
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super(ClientPool, cls).__new__(cls)
+                cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        load_dotenv(os.path.join(project_root, '.env'))
+
+        self.logger = Logger()
+        self._lock = threading.RLock()
+        self._clients: Dict[str, Any] = {}
+        # token_file -> (credentials, scopes)
+        self._credentials: Dict[str, Tuple[Any, List[str]]] = {}
+        # id(credentials) -> token_file (quota ledger의 계정 이름)
+        self._accounts: Dict[int, str] = {}
+        self._local = threading.local()
+        self._refresh_thread = None
+        self._stop_event = threading.Event()
+
+    def _get_or_create(self, key: str, factory):
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = factory()
+            return self._clients[key]
+
+    # LLM / 이미지 / TTS 클라이언트 (httpx 기반으로 스레드 간 공유 가능)
+
+    def _provider_client(self, provider: str, factory):
+        """record 모드면 실제 클라이언트를 기록용으로 감싸고, replay 모드면 cassette 클라이언트를 반환합니다."""
+        mode = provider_mode()
+        if mode == "replay":
+            from ..providers.cassette import replay_client
+            return self._get_or_create(f"replay_{provider}", lambda: replay_client(provider))
+        client = self._get_or_create(provider, factory)
+        if mode == "record":
+            from ..providers.cassette import recording_client
+            return self._get_or_create(f"record_{provider}", lambda: recording_client(provider, client))
+        return client
+
+    @staticmethod
+    def _fake_media_config() -> Dict[str, Any]:
+        config = load_fake_config()
+        image = config.get('image') or {}
+        content_plan = config.get('content_plan') or {}
+        return {
+            "width": int(image.get('width', 1024)),
+            "height": int(image.get('height', 1024)),
+            "scenes": int(content_plan.get('scenes', 4)),
+            "script_sentences": int(content_plan.get('script_sentences', 1)),
+            "invalid_rate": float(content_plan.get('invalid_rate', 0.0)),
+            "seed": config.get('seed', 0),
+        }
+
+    def get_gemini_client(self):
+        """공유 Gemini(google-genai) 클라이언트를 반환합니다."""
+        if use_fake_providers():
+            from ..providers.fake_llm import FakeGeminiClient
+            return self._get_or_create("fake_gemini", lambda: FakeGeminiClient(
+                get_fault_injector("llm"), get_fault_injector("image"), self._fake_media_config()
+            ))
+
+        def factory():
+            from google import genai
+            if not os.getenv("GOOGLE_API_KEY"):
+                raise ValueError(
+                    "Google API key not found. Please set the GOOGLE_API_KEY environment variable "
+                    "in your .env file or system environment variables."
+                )
+            return genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+        return self._provider_client("gemini", factory)
+
+    def get_openai_client(self):
+        """공유 OpenAI 클라이언트를 반환합니다."""
+        if use_fake_providers():
+            from ..providers.fake_llm import FakeOpenAIClient
+            return self._get_or_create("fake_openai", lambda: FakeOpenAIClient(
+                get_fault_injector("llm"), get_fault_injector("image"), self._fake_media_config()
+            ))
+
+        def factory():
+            import openai
+            if not os.getenv("OPENAI_API_KEY"):
+                raise ValueError(
+                    "OpenAI API key not found. Please set the OPENAI_API_KEY environment variable "
+                    "in your .env file or system environment variables."
+                )
+            return openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return self._provider_client("openai", factory)
+
+    def get_elevenlabs_client(self):
+        """공유 ElevenLabs 클라이언트를 반환합니다."""
+        if use_fake_providers():
+            from ..providers.fake_tts import FakeElevenLabsClient
+
+            def fake_factory():
+                audio = load_fake_config().get('audio') or {}
+                return FakeElevenLabsClient(get_fault_injector("tts"), {
+                    "chars_per_second": float(audio.get('chars_per_second', 14)),
+                    "min_seconds": float(audio.get('min_seconds', 1.5)),
+                    "sample_rate": int(audio.get('sample_rate', 22050)),
+                })
+            return self._get_or_create("fake_elevenlabs", fake_factory)
+
+        def factory():
+            from elevenlabs.client import ElevenLabs
+            if not os.getenv("ELEVENLABS_API_KEY"):
+                raise ValueError(
+                    "ElevenLabs API key not found. Please set the ELEVENLABS_API_KEY environment variable "
+                    "in your .env file or system environment variables."
+                )
+            return ElevenLabs(api_key=os.getenv("ELEVENLABS_API_KEY"))
+        return self._provider_client("elevenlabs", factory)
+
+    # Google OAuth 자격 증명 및 API 서비스
+
+    def get_credentials(self, token_file: str, client_secrets_file: str, scopes: List[str]):
+        """OAuth 자격 증명을 한 번만 로드(필요 시 갱신 또는 인증)하고 캐시합니다."""
+        with self._lock:
+            if token_file in self._credentials:
+                return self._credentials[token_file][0]
+
+            if use_fake_google():
+                from ..providers.fake_google import FakeCredentials
+                project = (load_fake_config().get('youtube') or {}).get('project', 'fake-project')
+                creds = FakeCredentials(token_file, project)
+                self._credentials[token_file] = (creds, scopes)
+                self._accounts[id(creds)] = os.path.splitext(os.path.basename(token_file))[0]
+                return creds
+
+            from google.auth.transport.requests import Request
+
+            creds = None
+            if os.path.exists(token_file):
+                with open(token_file, 'rb') as token:
+                    creds = pickle.load(token)
+
+            if not creds or not creds.valid:
+                if creds and creds.expired and creds.refresh_token:
+                    creds.refresh(Request())
+                else:
+                    from google_auth_oauthlib.flow import InstalledAppFlow
+                    flow = InstalledAppFlow.from_client_secrets_file(client_secrets_file, scopes)
+                    creds = flow.run_local_server(
+                        port=8080,
+                        open_browser=True,
+                        success_message='인증이 완료되었습니다. 이 창을 닫아주세요.'
+                    )
+                self._save_credentials(token_file, creds)
+
+            self._credentials[token_file] = (creds, scopes)
+            self._accounts[id(creds)] = os.path.splitext(os.path.basename(token_file))[0]
+            self._start_refresher()
+            return creds
+
+    def get_service(self, api: str, version: str, credentials) -> Any:
+        """스레드별로 캐시된 googleapiclient 서비스 객체를 반환합니다.
+
+        httplib2 기반 서비스 객체는 스레드 안전하지 않으므로 스레드마다 하나씩 생성하고,
+        같은 스레드에서는 연결을 재사용합니다. 모든 요청은 quota ledger에 기록됩니다.
+        """
+        services = getattr(self._local, 'services', None)
+        if services is None:
+            services = self._local.services = {}
+        key = (api, version, id(credentials))
+        if key in services:
+            metrics.inc("shortfactory_cache_requests_total", cache="google_service", result="hit")
+        else:
+            metrics.inc("shortfactory_cache_requests_total", cache="google_service", result="miss")
+            project = credentials_project(credentials)
+            account = self._accounts.get(id(credentials), "default")
+            if use_fake_google():
+                from ..providers.fake_google import FakeHttpRequest, create_fake_service
+                request_builder = make_request_builder(project, account, base=FakeHttpRequest)
+                services[key] = create_fake_service(api, version, credentials, request_builder, load_fake_config())
+            else:
+                from googleapiclient.discovery import build
+                request_builder = make_request_builder(project, account)
+                services[key] = build(
+                    api, version, credentials=credentials, cache_discovery=False, requestBuilder=request_builder
+                )
+        return services[key]
+
+    def _save_credentials(self, token_file: str, creds):
+        with open(token_file, 'wb') as token:
+            pickle.dump(creds, token)
+
+    def _start_refresher(self):
+        if self._refresh_thread is not None:
+            return
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop, name="oauth-refresher", daemon=True
+        )
+        self._refresh_thread.start()
+
+    def _refresh_loop(self):
+        """만료가 임박한 OAuth 토큰을 요청 경로 밖에서 미리 갱신합니다."""
+        while not self._stop_event.wait(self.REFRESH_CHECK_INTERVAL):
+            self.refresh_expiring_credentials()
+
+    def refresh_expiring_credentials(self):
+        from google.auth.transport.requests import Request
+
+        with self._lock:
+            entries = list(self._credentials.items())
+        for token_file, (creds, _) in entries:
+            expiry = getattr(creds, 'expiry', None)
+            if not creds.refresh_token or expiry is None:
+                continue
+            # google-auth의 expiry는 naive UTC datetime입니다 (aware로 바꿔서 비교)
+            if expiry.tzinfo is None:
+                expiry = expiry.replace(tzinfo=timezone.utc)
+            if expiry - datetime.now(timezone.utc) > self.REFRESH_MARGIN:
+                continue
+            try:
+                with self._lock:
+                    creds.refresh(Request())
+                    self._save_credentials(token_file, creds)
+                self.logger.info(f"Refreshed OAuth token: {token_file}")
+            except Exception as e:
+                self.logger.warning(f"Failed to refresh OAuth token {token_file}: {str(e)}")
+
+    def close(self):
+        """백그라운드 갱신 스레드를 중지합니다."""
+        self._stop_event.set()
+
+
+def get_client_pool() -> ClientPool:
+    return ClientPool()
@@ -1,110 +1,252 @@
+import atexit
+import hashlib
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Callable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+# 종료 시 리스너를 멈추기 직전에 실행할 훅 (종료 작업이 남기는 로그도 기록되도록)
+_before_stop_hooks: List[Callable[[], None]] = []
+
+
+def add_before_stop_hook(hook: Callable[[], None]) -> None:
+    """Logger.close가 리스너를 멈추기 전에 호출할 함수를 등록합니다."""
+    if hook not in _before_stop_hooks:
+        _before_stop_hooks.append(hook)
+
+
+class PayloadLimitFilter(logging.Filter):
+    """큰 메시지(프롬프트, LLM 응답 등)를 잘라내고 원본의 길이와 SHA-256을 남깁니다."""
+
+    def __init__(self, max_chars: int):
+        super().__init__()
+        self.max_chars = max_chars
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        message = record.getMessage()
+        if len(message) > self.max_chars:
+            record.payload_chars = len(message)
+            record.payload_sha256 = hashlib.sha256(message.encode("utf-8")).hexdigest()
+            message = f"{message[:self.max_chars]}... [truncated {len(message) - self.max_chars} chars, sha256={record.payload_sha256[:12]}]"
+        # 큐로 넘기기 전에 포맷을 끝내 두어 인자 객체를 다른 스레드에서 참조하지 않도록 합니다
+        record.msg, record.args = message, None
+        return True
+
+
+class BlockingQueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 레코드를 버리지 않고 빈 자리가 생길 때까지 기다립니다."""
+
+    def enqueue(self, record: logging.LogRecord):
+        self.queue.put(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄에 하나의 JSON 객체로 기록합니다."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "pid": record.process,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for key in ("payload_chars", "payload_sha256"):
+            if hasattr(record, key):
+                entry[key] = getattr(record, key)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class LockedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """여러 프로세스가 같은 파일에 쓸 수 있도록 파일 잠금 하에 기록하고 회전하는 핸들러.
+
+    다른 프로세스가 파일을 회전했으면(inode 변경) 새 파일을 다시 엽니다.
+    회전할 때 max_age_days보다 오래된 로그 파일을 삭제합니다.
+    """
+
+    def __init__(self, filename: str, max_bytes: int, backup_count: int, max_age_days: float):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        self.max_age_days = max_age_days
+        self._lock_file = open(filename + ".lock", "a")
+
+    def _reopen_if_rotated(self):
+        try:
+            if self.stream and os.fstat(self.stream.fileno()).st_ino != os.stat(self.baseFilename).st_ino:
+                self.stream.close()
+                self.stream = self._open()
+        except FileNotFoundError:
+            self.stream.close()
+            self.stream = self._open()
+
+    def emit(self, record: logging.LogRecord):
+        if fcntl is None:
+            return super().emit(record)
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            self._reopen_if_rotated()
+            super().emit(record)
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def doRollover(self):
+        super().doRollover()
+        remove_old_logs(os.path.dirname(self.baseFilename), self.max_age_days)
+
+    def close(self):
+        super().close()
+        self._lock_file.close()
+
+
+def remove_old_logs(log_dir: str, max_age_days: float) -> None:
+    """max_age_days보다 오래 수정되지 않은 로그 파일을 삭제합니다."""
+    cutoff = time.time() - max_age_days * 86400
+    for name in os.listdir(log_dir):
+        path = os.path.join(log_dir, name)
+        if name.endswith(".lock") or not name.startswith("short_factory"):
+            continue
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            continue
+
 
 class Logger:
     _instance = None
-    
+
+    # 로그 메시지 최대 길이 (초과하면 잘라내고 해시를 기록)
+    MAX_MESSAGE_CHARS = 2000
+    # 로그 파일 회전: 크기와 보관 기간
+    MAX_BYTES = 10 * 1024 * 1024
+    BACKUP_COUNT = 10
+    MAX_AGE_DAYS = 14
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(Logger, cls).__new__(cls)
             cls._instance._initialize_logger()
         return cls._instance
-    
+
     def _initialize_logger(self):
-        """Initialize the logger with proper formatting and file handling."""
+        """Initialize the logger with a queue-based, non-blocking backend.
+
+        호출한 스레드는 레코드를 큐에 넣기만 하고, 파일(JSON Lines)과 콘솔 출력은
+        백그라운드 리스너 스레드가 처리합니다.
+        """
         # Create logs directory if it doesn't exist
         self.log_dir = "logs"
         os.makedirs(self.log_dir, exist_ok=True)
-        
-        # Create a timestamp for the log file name
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.log_file = os.path.join(self.log_dir, f"short_factory_{timestamp}.log")
-        
+        remove_old_logs(self.log_dir, self.MAX_AGE_DAYS)
+
+        # 실행마다 새 파일을 만들지 않고 하나의 파일을 크기 기준으로 회전합니다
+        self.log_file = os.path.join(self.log_dir, "short_factory.jsonl")
+
         # Configure logging
         self.logger = logging.getLogger("ShortFactory")
         self.logger.setLevel(logging.INFO)
-        
-        # Create formatters
-        file_formatter = logging.Formatter(
-            "%(asctime)s - %(levelname)s - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
-        )
-        console_formatter = logging.Formatter(
-            "%(message)s"
+        self.logger.propagate = False
+
+        # File handler (JSON Lines, 프로세스 간 잠금 + 크기/기간 회전)
+        file_handler = LockedRotatingFileHandler(
+            self.log_file, self.MAX_BYTES, self.BACKUP_COUNT, self.MAX_AGE_DAYS
         )
-        
-        # File handler
-        file_handler = logging.FileHandler(self.log_file, encoding="utf-8")
         file_handler.setLevel(logging.INFO)
-        file_handler.setFormatter(file_formatter)
-        
+        file_handler.setFormatter(JsonFormatter())
+
         # Console handler
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(console_formatter)
-        
-        # Add handlers
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
-    
+        console_handler.setFormatter(logging.Formatter("%(message)s"))
+
+        # 호출 스레드에서는 큐에 넣기만 합니다 (큐가 가득 차면 버리지 않고 기다림)
+        log_queue = queue.Queue(maxsize=10000)
+        queue_handler = BlockingQueueHandler(log_queue)
+        queue_handler.addFilter(PayloadLimitFilter(self.MAX_MESSAGE_CHARS))
+        self.logger.addHandler(queue_handler)
+
+        self.listener = logging.handlers.QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        self.listener.start()
+        atexit.register(self.close)
+
+    def close(self):
+        """등록된 종료 훅을 실행한 뒤 큐에 남은 레코드를 모두 기록하고 리스너를 종료합니다."""
+        if self.listener is not None:
+            for hook in list(_before_stop_hooks):
+                try:
+                    hook()
+                except Exception as e:
+                    self.logger.error(f"❌ ERROR: Shutdown hook failed: {str(e)}")
+            self.listener.stop()
+            self.listener = None
+
     def info(self, message: str):
         """Log an informational message."""
         self.logger.info(message)
-    
+
     def error(self, message: str):
         """Log an error message."""
         self.logger.error(f"❌ ERROR: {message}")
-    
+
     def warning(self, message: str):
         """Log a warning message."""
         self.logger.warning(f"⚠️ WARNING: {message}")
-    
+
     def debug(self, message: str):
         """Log a debug message."""
         self.logger.debug(f"🔍 DEBUG: {message}")
-    
+
     def section(self, title: str):
         """Log a section header."""
         self.logger.info(f"\n{'='*50}")
         self.logger.info(f"📑 {title}")
         self.logger.info(f"{'='*50}\n")
-    
+
     def subsection(self, title: str):
         """Log a subsection header."""
         self.logger.info(f"\n{'-'*30}")
         self.logger.info(f"📌 {title}")
         self.logger.info(f"{'-'*30}\n")
-    
+
     def success(self, message: str):
         """Log a success message."""
         self.logger.info(f"✅ SUCCESS: {message}")
-    
+
     def process(self, message: str):
         """Log a process message."""
         self.logger.info(f"⚙️ PROCESSING: {message}")
-    
+
     def result(self, title: str, content: str):
         """Log a result with title and content."""
-        self.logger.info(f"\n📊 {title}:")
-        self.logger.info(f"{content}\n")
-    
+        self.logger.info(f"\n📊 {title}:\n{content}\n")
+
     def prompt(self, title: str, content: str):
         """Log a prompt with title and content."""
-        self.logger.info(f"\n💭 {title}:")
-        self.logger.info(f"{content}\n")
-    
+        self.logger.info(f"\n💭 {title}:\n{content}\n")
+
     def api_call(self, service: str, action: str, details: Optional[str] = None):
         """Log an API call."""
         message = f"🌐 API CALL - {service}: {action}"
         if details:
             message += f"\nDetails: {details}"
         self.logger.info(message)
-    
+
     def asset_generation(self, asset_type: str, status: str, details: Optional[str] = None):
         """Log asset generation status."""
         message = f"🎨 ASSET GENERATION - {asset_type}: {status}"
         if details:
             message += f"\nDetails: {details}"
-        self.logger.info(message) 
\ No newline at end of file
+        self.logger.info(message)
@@ -0,0 +1,142 @@
+"""In-process metrics registry (Prometheus text exposition format)
+
+작업 경로에서는 잠금 하나 아래에서 dict 값을 더하기만 하므로 비용이 거의 없습니다.
+큐 길이처럼 다른 객체가 이미 알고 있는 값은 collector로 등록해 두고
+/metrics를 조회할 때만 계산합니다 (src/api/metrics_server.py).
+"""
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+
+# 이름 -> (type, help)
+METRICS = {
+    "shortfactory_stage_completed_total": ("counter", "Pipeline stages completed, by creator and stage"),
+    "shortfactory_ffmpeg_in_flight": ("gauge", "ffmpeg encodes currently running"),
+    "shortfactory_ffmpeg_waiting": ("gauge", "ffmpeg encodes waiting for a CPU slot"),
+    "shortfactory_encode_seconds_total": ("counter", "Wall-clock seconds spent in ffmpeg encodes"),
+    "shortfactory_output_video_seconds_total": ("counter", "Seconds of finished video produced"),
+    "shortfactory_encode_seconds_per_output_second": ("gauge", "Encode seconds per second of finished video"),
+    "shortfactory_rate_limit_wait_seconds_total": ("counter", "Seconds spent waiting on shared provider rate limits"),
+    "shortfactory_rate_limit_acquired_total": ("counter", "Provider rate limit tokens acquired"),
+    "shortfactory_rate_limit_waiting": ("gauge", "Requests currently waiting on a provider rate limit"),
+    "shortfactory_cache_requests_total": ("counter", "Cache lookups, by cache and result (hit or miss)"),
+    "shortfactory_cache_hit_ratio": ("gauge", "Cache hit ratio since process start"),
+    "shortfactory_content_repairs_total": ("counter", "Targeted repair requests for content plans that failed schema validation, by result"),
+    "shortfactory_content_regenerations_total": ("counter", "Content plans regenerated from scratch after repair failed"),
+    "shortfactory_content_batch_plans_total": ("counter", "Content plans requested in batch LLM calls, by result (failed plans fall back to one request per video)"),
+    "shortfactory_prefetch_total": ("counter", "Per-section jobs started while the content plan was streaming, by result"),
+    "shortfactory_upload_jobs_parked_total": ("counter", "Upload jobs that exhausted their retries and were moved to upload_queue/failed"),
+    "shortfactory_upload_queue_depth": ("gauge", "Rendered videos waiting for or in background upload"),
+    "shortfactory_tasks_in_flight": ("gauge", "Videos currently being processed by the daemon"),
+    "shortfactory_tasks_total": ("counter", "Videos finished by the daemon, by result"),
+    "shortfactory_external_call_latency_seconds": ("summary", "Rolling latency of external calls"),
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+Sample = Tuple[str, Dict[str, Any], float]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[str, Dict[LabelKey, float]] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+
+    @staticmethod
+    def _key(labels: Dict[str, Any]) -> LabelKey:
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    def inc(self, name: str, amount: float = 1, **labels) -> None:
+        """카운터(또는 게이지)에 amount를 더합니다."""
+        key = self._key(labels)
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def set(self, name: str, value: float, **labels) -> None:
+        """게이지 값을 설정합니다."""
+        key = self._key(labels)
+        with self._lock:
+            self._values.setdefault(name, {})[key] = float(value)
+
+    def get(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._values.get(name, {}).get(self._key(labels), 0.0)
+
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        """조회할 때 (이름, 레이블, 값) 샘플을 반환하는 함수를 등록합니다."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def unregister_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def collect(self) -> Dict[str, Dict[LabelKey, float]]:
+        """저장된 값과 collector 샘플을 합친 스냅샷을 반환합니다."""
+        with self._lock:
+            snapshot = {name: dict(series) for name, series in self._values.items()}
+            collectors = list(self._collectors)
+        for collector in collectors:
+            try:
+                samples = list(collector())
+            except Exception:
+                continue  # 조회 중 실패한 collector는 이번 응답에서만 제외
+            for name, labels, value in samples:
+                snapshot.setdefault(name, {})[self._key(labels)] = float(value)
+        self._add_derived(snapshot)
+        return snapshot
+
+    @staticmethod
+    def _add_derived(snapshot: Dict[str, Dict[LabelKey, float]]) -> None:
+        """카운터에서 계산되는 비율 게이지를 추가합니다."""
+        output_seconds = snapshot.get("shortfactory_output_video_seconds_total", {}).get((), 0.0)
+        if output_seconds > 0:
+            encode_seconds = snapshot.get("shortfactory_encode_seconds_total", {}).get((), 0.0)
+            snapshot["shortfactory_encode_seconds_per_output_second"] = {(): encode_seconds / output_seconds}
+
+        totals: Dict[str, List[float]] = {}
+        for key, value in snapshot.get("shortfactory_cache_requests_total", {}).items():
+            labels = dict(key)
+            hits_and_total = totals.setdefault(labels.get("cache", ""), [0.0, 0.0])
+            if labels.get("result") == "hit":
+                hits_and_total[0] += value
+            hits_and_total[1] += value
+        if totals:
+            snapshot["shortfactory_cache_hit_ratio"] = {
+                (("cache", cache),): hits / total for cache, (hits, total) in totals.items() if total
+            }
+
+    def render(self) -> str:
+        """Prometheus text exposition format (0.0.4)으로 변환합니다."""
+        lines = []
+        for name, series in sorted(self.collect().items()):
+            metric_type, help_text = METRICS.get(name, ("untyped", ""))
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for key, value in sorted(series.items()):
+                # summary의 _count/_sum 샘플은 레이블의 "__suffix"로 구분합니다
+                labels = dict(key)
+                sample_name = name + labels.pop("__suffix", "")
+                label_text = ",".join(f'{label}="{_escape(v)}"' for label, v in labels.items())
+                lines.append(f"{sample_name}{{{label_text}}} {value:g}" if label_text else f"{sample_name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _latency_samples() -> Iterable[Sample]:
+    from .tracing import latency_summary
+    name = "shortfactory_external_call_latency_seconds"
+    for call, stats in latency_summary().items():
+        yield name, {"call": call, "quantile": "0.5"}, stats["p50"]
+        yield name, {"call": call, "quantile": "0.95"}, stats["p95"]
+        yield name, {"call": call, "__suffix": "_count"}, stats["count"]
+
+
+metrics = MetricsRegistry()
+metrics.register_collector(_latency_samples)
@@ -0,0 +1,232 @@
+"""Google API quota ledger and upload planner
+
+YouTube Data API는 Google Cloud 프로젝트별로 하루 10,000 unit(태평양 시간 자정 초기화)을
+제공하고 videos.insert 한 번에 1,600 unit을 사용합니다. 이 모듈은 프로젝트(OAuth client ID)와
+계정(토큰 파일 = 채널)별로 사용한 unit을 data/quota_ledger.sqlite에 기록하고,
+오늘 몇 개의 비디오를 더 업로드할 수 있는지 계산합니다.
+
+기록은 googleapiclient의 requestBuilder(ClientPool.get_service)에서 자동으로 이루어지므로
+YouTubeManager와 SheetsManager의 모든 API 호출이 포함됩니다. Sheets API는 unit이 아닌
+분당 요청 수로 제한되므로 요청 1건을 1로 기록합니다.
+"""
+import os
+import re
+import time
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+import yaml
+from .logger import Logger
+from .tracing import span
+
+
+DEFAULT_CONFIG_PATH = os.path.join("config", "quota.yaml")
+
+# methodId -> unit (https://developers.google.com/youtube/v3/determine_quota_cost)
+DEFAULT_COSTS = {
+    "youtube.videos.insert": 1600,
+    "youtube.videos.update": 50,
+    "youtube.videos.delete": 50,
+    "youtube.thumbnails.set": 50,
+    "youtube.search.list": 100,
+}
+
+# YouTube Data API 요청 URI (일반 요청과 media 업로드)
+_YOUTUBE_DATA_URI = re.compile(r"^https?://[^/]+/(upload/)?youtube/v3/")
+
+
+class QuotaExceeded(Exception):
+    """오늘의 quota가 부족합니다. retry_at(UTC epoch 초) 이후에 다시 시도해야 합니다."""
+
+    def __init__(self, message: str, retry_at: float):
+        super().__init__(message)
+        self.retry_at = retry_at
+
+
+class QuotaLedger:
+    def __init__(self, config_path: str = DEFAULT_CONFIG_PATH, db_path: str = os.path.join("data", "quota_ledger.sqlite")):
+        """
+        Args:
+            config_path (str): quota 설정 파일 (일일 한도, 예비 unit, 메서드별 비용)
+            db_path (str): 사용량을 기록할 SQLite 파일
+        """
+        self.logger = Logger()
+        config = {}
+        if os.path.exists(config_path):
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = yaml.safe_load(f) or {}
+        self.daily_units = int(config.get('youtube_daily_units', 10000))
+        self.reserve_units = int(config.get('youtube_reserve_units', 0))
+        self.costs = dict(DEFAULT_COSTS)
+        self.costs.update(config.get('costs') or {})
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.db_path = db_path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS spend (
+                    project TEXT NOT NULL,
+                    account TEXT NOT NULL,
+                    api TEXT NOT NULL,
+                    method TEXT NOT NULL,
+                    units INTEGER NOT NULL,
+                    window_start REAL NOT NULL,
+                    created_at REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_spend_window ON spend (project, api, window_start)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def window(now: Optional[float] = None) -> Tuple[float, float]:
+        """현재 quota 기간(태평양 시간 자정~자정)의 시작과 끝을 epoch 초로 반환합니다."""
+        import pytz
+        pacific = pytz.timezone('America/Los_Angeles')
+        current = datetime.fromtimestamp(now or time.time(), pacific)
+        start = pacific.localize(datetime.combine(current.date(), datetime.min.time()))
+        end = pacific.localize(datetime.combine(current.date() + timedelta(days=1), datetime.min.time()))
+        return start.timestamp(), end.timestamp()
+
+    def cost(self, method: str) -> int:
+        """API 메서드의 unit 비용 (목록에 없는 호출은 1)"""
+        return int(self.costs.get(method, 1))
+
+    def record(self, project: str, account: str, method: str, units: Optional[int] = None) -> None:
+        """API 호출 한 건의 사용량을 기록합니다 (method 예: youtube.videos.insert)."""
+        api = method.split('.', 1)[0]
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT INTO spend (project, account, api, method, units, window_start, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (project, account, api, method, self.cost(method) if units is None else units, self.window()[0], time.time())
+            )
+
+    def spent(self, project: str, api: str = "youtube") -> int:
+        """현재 quota 기간에 프로젝트가 사용한 unit"""
+        row = self._connect().execute(
+            "SELECT COALESCE(SUM(units), 0) FROM spend WHERE project = ? AND api = ? AND window_start = ?",
+            (project, api, self.window()[0])
+        ).fetchone()
+        return int(row[0])
+
+    def spent_by_account(self, project: str, api: str = "youtube") -> Dict[str, int]:
+        rows = self._connect().execute(
+            "SELECT account, SUM(units) FROM spend WHERE project = ? AND api = ? AND window_start = ? GROUP BY account",
+            (project, api, self.window()[0])
+        ).fetchall()
+        return {account: int(units) for account, units in rows}
+
+    def remaining(self, project: str) -> int:
+        """현재 기간에 남은 YouTube unit (예비 unit 제외)"""
+        return max(0, self.daily_units - self.reserve_units - self.spent(project))
+
+    def mark_exhausted(self, project: str, account: str) -> None:
+        """API가 quotaExceeded를 반환했을 때 남은 unit을 모두 사용한 것으로 기록합니다."""
+        left = self.daily_units - self.spent(project)
+        if left > 0:
+            self.record(project, account, "youtube.quotaExceeded", units=left)
+        self.logger.warning(f"YouTube quota exhausted for project {project}")
+
+    def ensure_available(self, project: str, method: str) -> None:
+        """호출에 필요한 unit이 남아 있지 않으면 QuotaExceeded를 발생시킵니다."""
+        if self.remaining(project) < self.cost(method):
+            retry_at = self.window()[1]
+            raise QuotaExceeded(
+                f"YouTube quota exhausted for project {project} "
+                f"({self.spent(project)}/{self.daily_units} units); retry after "
+                f"{datetime.fromtimestamp(retry_at).strftime('%Y-%m-%d %H:%M:%S')}",
+                retry_at
+            )
+
+    def plan_uploads(self, project: str, requested: int, in_flight: int = 0) -> Tuple[int, int]:
+        """오늘 업로드할 수 있는 비디오 수를 계산합니다.
+
+        Args:
+            project (str): Google Cloud 프로젝트 (OAuth client ID)
+            requested (int): 렌더링하려는 비디오 수
+            in_flight (int): 이미 렌더링 중이라 업로드 unit이 예약된 비디오 수
+
+        Returns:
+            Tuple[int, int]: (오늘 렌더링할 수, 다음 quota 기간으로 미룰 수)
+        """
+        affordable = self.remaining(project) // self.cost("youtube.videos.insert") - in_flight
+        now = max(0, min(requested, affordable))
+        return now, requested - now
+
+
+_ledger: Optional[QuotaLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_quota_ledger() -> QuotaLedger:
+    """프로세스에서 공유하는 quota ledger를 반환합니다."""
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = QuotaLedger()
+        return _ledger
+
+
+def credentials_project(credentials: Any) -> str:
+    """OAuth 자격 증명의 client ID로 Google Cloud 프로젝트를 식별합니다."""
+    return getattr(credentials, 'client_id', None) or getattr(credentials, 'quota_project_id', None) or "default"
+
+
+def make_request_builder(project: str, account: str, base: Optional[type] = None):
+    """호출마다 ledger에 사용량을 기록하는 googleapiclient HttpRequest 클래스를 만듭니다.
+
+    Args:
+        project (str): Google Cloud 프로젝트 (OAuth client ID)
+        account (str): 계정 이름 (토큰 파일)
+        base (type, optional): 요청 클래스 (기본값: googleapiclient HttpRequest, 오프라인 fake 서비스는 자체 요청 클래스)
+    """
+    from googleapiclient.errors import HttpError
+    from googleapiclient.http import HttpRequest
+
+    ledger = get_quota_ledger()
+    base = base or HttpRequest
+
+    def _is_quota_error(request: Any, error: HttpError) -> bool:
+        # Sheets도 같은 requestBuilder를 사용하므로 YouTube Data API 요청의 오류만 unit 소진으로 봅니다
+        if not _YOUTUBE_DATA_URI.match(getattr(request, 'uri', None) or ""):
+            return False
+        return error.resp.status == 403 and b'quotaExceeded' in (error.content or b'')
+
+    class LedgerHttpRequest(base):
+        def execute(self, *args, **kwargs):
+            ledger.record(project, account, self.methodId or "unknown")
+            try:
+                with span(f"google.{self.methodId or 'unknown'}", category="external",
+                          request_bytes=len(self.body or b"")):
+                    return super().execute(*args, **kwargs)
+            except HttpError as e:
+                if _is_quota_error(self, e):
+                    ledger.mark_exhausted(project, account)
+                    raise QuotaExceeded(f"YouTube quota exceeded for project {project}", ledger.window()[1]) from e
+                raise
+
+        def next_chunk(self, *args, **kwargs):
+            # resumable 업로드는 세션을 시작할 때 한 번만 비용이 발생합니다
+            if self.resumable_uri is None:
+                ledger.record(project, account, self.methodId or "unknown")
+            try:
+                with span(f"google.{self.methodId or 'unknown'}.chunk", category="external",
+                          offset=self.resumable_progress) as call:
+                    status, response = super().next_chunk(*args, **kwargs)
+                    call.set(bytes=self.resumable_progress - call.attrs["offset"])
+                    return status, response
+            except HttpError as e:
+                if _is_quota_error(self, e):
+                    ledger.mark_exhausted(project, account)
+                    raise QuotaExceeded(f"YouTube quota exceeded for project {project}", ledger.window()[1]) from e
+                raise
+
+    return LedgerHttpRequest
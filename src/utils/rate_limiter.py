@@ -0,0 +1,152 @@
+"""Shared provider rate limits and ffmpeg CPU budget
+
+여러 크리에이터가 동시에 실행될 때 이미지/TTS/LLM API 호출 한도를
+크리에이터 간에 공정하게(라운드로빈) 나누고, ffmpeg 인코딩 작업 수를
+전역적으로 제한합니다. 설정되지 않은 리미터는 제한 없이 통과합니다.
+"""
+import time
+import threading
+from collections import deque, OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Optional
+from .tracing import span
+from .metrics import metrics
+
+
+class FairRateLimiter:
+    def __init__(self, name: str, requests_per_minute: float, burst: Optional[int] = None):
+        """
+        Args:
+            name (str): 리미터 이름 (예: "image", "tts", "llm")
+            requests_per_minute (float): 분당 허용 요청 수 (모든 크리에이터 합계)
+            burst (int, optional): 한 번에 사용할 수 있는 최대 토큰 수
+        """
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+        self.name = name
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(burst or max(1, int(requests_per_minute // 10)))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._cond = threading.Condition()
+        self._waiting: "OrderedDict[str, deque]" = OrderedDict()  # creator -> 대기 티켓
+        self.wait_seconds = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, creator: str = "default") -> float:
+        """토큰 하나를 획득할 때까지 대기합니다.
+
+        대기 중인 크리에이터가 여럿이면 크리에이터 단위 라운드로빈으로 순서를 정하므로
+        한 크리에이터의 대량 요청이 다른 크리에이터를 굶기지 않습니다.
+
+        Returns:
+            float: 대기한 시간 (초)
+        """
+        ticket = object()
+        started = time.monotonic()
+        with self._cond:
+            self._waiting.setdefault(creator, deque()).append(ticket)
+            try:
+                while True:
+                    self._refill()
+                    head_creator = next(iter(self._waiting))
+                    is_turn = head_creator == creator and self._waiting[creator][0] is ticket
+                    if is_turn and self.tokens >= 1:
+                        self.tokens -= 1
+                        break
+                    timeout = None if not is_turn else (1 - self.tokens) / self.rate
+                    self._cond.wait(timeout)
+            finally:
+                queue = self._waiting[creator]
+                queue.remove(ticket)
+                # 차례를 마친 크리에이터는 맨 뒤로 보내 다음 크리에이터에게 순서를 넘깁니다
+                del self._waiting[creator]
+                if queue:
+                    self._waiting[creator] = queue
+                self._cond.notify_all()
+        waited = time.monotonic() - started
+        self.wait_seconds += waited
+        return waited
+
+    def waiting(self) -> int:
+        """현재 토큰을 기다리는 요청 수"""
+        with self._cond:
+            return sum(len(tickets) for tickets in self._waiting.values())
+
+
+_limiters: Dict[str, FairRateLimiter] = {}
+_ffmpeg_slots: Optional[threading.BoundedSemaphore] = None
+_lock = threading.Lock()
+
+
+def configure_rate_limits(rate_limits: Dict[str, float], ffmpeg_jobs: Optional[int] = None):
+    """프로세스 전역 리미터를 설정합니다.
+
+    Args:
+        rate_limits (Dict[str, float]): 이름별 분당 요청 수 (예: {"image": 10})
+        ffmpeg_jobs (int, optional): 동시에 실행할 수 있는 ffmpeg 작업 수
+    """
+    global _ffmpeg_slots
+    with _lock:
+        for name, requests_per_minute in (rate_limits or {}).items():
+            if requests_per_minute:
+                _limiters[name] = FairRateLimiter(name, float(requests_per_minute))
+            else:
+                _limiters.pop(name, None)
+        _ffmpeg_slots = threading.BoundedSemaphore(ffmpeg_jobs) if ffmpeg_jobs else None
+
+
+def get_rate_limiter(name: str) -> Optional[FairRateLimiter]:
+    return _limiters.get(name)
+
+
+def acquire(name: str, creator: Optional[str] = None) -> float:
+    """이름에 해당하는 리미터에서 토큰을 획득합니다. 리미터가 없으면 즉시 반환합니다."""
+    limiter = _limiters.get(name)
+    if limiter is None:
+        return 0.0
+    with span(f"rate_limit.{name}", category="wait") as wait:
+        waited = limiter.acquire(creator or "default")
+        wait.set(waited_seconds=round(waited, 3))
+    metrics.inc("shortfactory_rate_limit_acquired_total", limiter=name)
+    metrics.inc("shortfactory_rate_limit_wait_seconds_total", waited, limiter=name)
+    return waited
+
+
+@contextmanager
+def ffmpeg_slot(step: str = "encode"):
+    """전역 ffmpeg CPU 예산 내에서 인코딩 작업을 실행합니다.
+
+    Args:
+        step (str): 추적 span 이름에 사용할 작업 이름 (ffmpeg.<step>)
+    """
+    slots = _ffmpeg_slots
+    if slots is not None:
+        metrics.inc("shortfactory_ffmpeg_waiting")
+        try:
+            with span("ffmpeg.wait", category="wait", step=step):
+                slots.acquire()
+        finally:
+            metrics.inc("shortfactory_ffmpeg_waiting", -1)
+    metrics.inc("shortfactory_ffmpeg_in_flight")
+    started = time.perf_counter()
+    try:
+        with span(f"ffmpeg.{step}", category="external"):
+            yield
+    finally:
+        metrics.inc("shortfactory_ffmpeg_in_flight", -1)
+        metrics.inc("shortfactory_encode_seconds_total", time.perf_counter() - started)
+        if slots is not None:
+            slots.release()
+
+
+def _limiter_samples():
+    for name, limiter in list(_limiters.items()):
+        yield "shortfactory_rate_limit_waiting", {"limiter": name}, limiter.waiting()
+
+
+metrics.register_collector(_limiter_samples)
@@ -0,0 +1,83 @@
+"""Early start of per-section image and narration jobs
+
+콘텐츠 플랜을 스트리밍으로 받는 동안 완성된 섹션(hook, scene_N, conclusion)의 이미지와
+나레이션 생성을 바로 시작합니다. 작업 종류마다 워커 스레드 하나를 사용하므로 이미지끼리,
+나레이션끼리는 지금처럼 순서대로 실행되고, LLM 응답 및 서로와는 겹쳐서 실행됩니다.
+
+결과는 visuals/narrations 단계가 take()로 가져갑니다. 미리 시작하지 않았거나, 최종 콘텐츠
+플랜의 섹션 내용이 달라졌거나, 작업이 실패한 섹션은 None을 반환하므로 단계에서 다시 생성합니다.
+"""
+import copy
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional, Tuple
+from .logger import Logger
+from .metrics import metrics
+from .tracing import attach_trace, current_trace, span
+
+
+class SectionPrefetcher:
+    def __init__(self, jobs: Dict[str, Callable[[Dict[str, Any], str], Any]]):
+        """
+        Args:
+            jobs (Dict[str, Callable]): 작업 종류 -> job(section, section_id)
+                (예: {"visuals": visual_director.create_scene_image})
+        """
+        self.logger = Logger()
+        self._jobs = jobs
+        # 워커 스레드의 span도 같은 task trace와 cassette를 사용하도록 현재 trace를 넘깁니다
+        self._trace = current_trace()
+        self._executors = {
+            kind: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"prefetch-{kind}") for kind in jobs
+        }
+        self._futures: Dict[Tuple[str, str], Tuple[Dict[str, Any], Future]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, section_id: str, section: Dict[str, Any]) -> None:
+        """완성된 섹션의 작업을 시작합니다 (ContentGenerator의 on_section 콜백)."""
+        snapshot = copy.deepcopy(section)
+        with self._lock:
+            for kind, job in self._jobs.items():
+                future = self._executors[kind].submit(self._run, kind, job, section_id, snapshot)
+                self._futures[(kind, section_id)] = (snapshot, future)
+
+    def _run(self, kind: str, job: Callable[[Dict[str, Any], str], Any], section_id: str, section: Dict[str, Any]) -> Any:
+        with attach_trace(self._trace), span(f"prefetch.{kind}", section=section_id):
+            return job(copy.deepcopy(section), section_id)
+
+    def take(self, kind: str, section_id: str, section: Dict[str, Any]) -> Optional[Any]:
+        """미리 시작한 작업의 결과를 기다려 반환합니다 (사용할 수 없으면 None).
+
+        최종 섹션은 스트리밍 중에 받은 섹션의 모든 필드를 같은 값으로 가지고 있어야 합니다
+        (단계에서 추가하는 scene_number 같은 필드는 비교하지 않습니다).
+        """
+        with self._lock:
+            entry = self._futures.pop((kind, section_id), None)
+        if entry is None:
+            metrics.inc("shortfactory_prefetch_total", kind=kind, result="miss")
+            return None
+        snapshot, future = entry
+        if any(section.get(key) != value for key, value in snapshot.items()):
+            # 이미 실행 중이면 같은 파일을 다시 쓰기 전에 끝날 때까지 기다립니다
+            if not future.cancel():
+                wait([future])
+            metrics.inc("shortfactory_prefetch_total", kind=kind, result="stale")
+            self.logger.warning(f"Prefetched {kind} for {section_id} no longer matches the content plan")
+            return None
+        try:
+            result = future.result()
+        except Exception as e:
+            metrics.inc("shortfactory_prefetch_total", kind=kind, result="failed")
+            self.logger.warning(f"Prefetched {kind} for {section_id} failed, regenerating: {str(e)}")
+            return None
+        metrics.inc("shortfactory_prefetch_total", kind=kind, result="hit")
+        return result
+
+    def taker(self, kind: str) -> Callable[[str, Dict[str, Any]], Optional[Any]]:
+        """VisualDirector/NarrationGenerator의 prefetched 인자로 넘길 함수"""
+        return lambda section_id, section: self.take(kind, section_id, section)
+
+    def close(self) -> None:
+        """시작하지 않은 작업은 취소하고 실행 중인 작업이 끝날 때까지 기다립니다."""
+        for executor in self._executors.values():
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,267 @@
+"""Local indexed SQLite mirror of a creator's Google Sheet
+
+시트(A:P열)를 data/<creator>/sheet_mirror.sqlite에 복제하고 task ID, video ID,
+status, scheduled time으로 인덱싱합니다. 조회는 로컬에서 처리하고, 시트와는
+증분 동기화(마지막으로 본 행 이후만 읽기)와 주기적 전체 동기화로 맞춥니다.
+다른 노드가 기존 행에 쓰는 G:P열은 처리되지 않은 행에 한해 refresh_unprocessed로 다시 읽습니다.
+이 프로세스가 쓰는 셀은 apply_cells로 즉시 반영됩니다(write-through).
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# 시트 열 (0-based) -> 미러 컬럼
+COLUMNS = {
+    0: "subject",           # A
+    1: "creation_time",     # B
+    2: "task_id",           # C
+    3: "video_title",       # D
+    4: "video_description", # E
+    5: "hashtags",          # F
+    6: "status",            # G
+    7: "scheduled_time",    # H (KST, "%Y-%m-%d %H:%M:%S")
+    8: "video_id",          # I
+    9: "video_url",         # J
+    14: "lease_worker",     # O
+    15: "lease_expiry",     # P
+}
+LAST_COLUMN = 16  # A:P
+# 다른 노드가 기존 행에서 바꾸는 열 (G: status ~ P: lease 만료 시각)
+VOLATILE_FIRST_COLUMN = 6
+
+# 주제가 있고 video ID와 예약 시간이 없으며, 렌더링이 끝나 quota를 기다리는 중(awaiting_upload)이 아닌 행
+_UNPROCESSED = """TRIM(COALESCE(subject, '')) != ''
+                 AND TRIM(COALESCE(video_id, '')) = ''
+                 AND TRIM(COALESCE(scheduled_time, '')) = ''
+                 AND COALESCE(status, '') != 'awaiting_upload'"""
+
+
+class SheetMirror:
+    # 사람이 기존 행을 직접 고친 경우를 반영하기 위한 전체 동기화 주기 (초)
+    FULL_SYNC_INTERVAL = 3600
+
+    def __init__(self, creator: str, sheet_name: str, spreadsheet_id: str, service_getter: Callable[[], Any], db_path: Optional[str] = None):
+        """
+        Args:
+            creator (str): 크리에이터 이름
+            sheet_name (str): 크리에이터의 시트 이름
+            spreadsheet_id (str): Google Spreadsheet ID
+            service_getter (Callable): 현재 스레드의 Sheets API 서비스를 반환하는 함수
+            db_path (str, optional): SQLite 파일 경로 (기본값: data/<creator>/sheet_mirror.sqlite)
+        """
+        self.creator = creator
+        self.sheet_name = sheet_name
+        self.spreadsheet_id = spreadsheet_id
+        self.service_getter = service_getter
+        self.db_path = db_path or os.path.join("data", creator, "sheet_mirror.sqlite")
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self._local = threading.local()
+        self._sync_lock = threading.Lock()
+        self._create_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self):
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                f"""CREATE TABLE IF NOT EXISTS rows (
+                    row_index INTEGER PRIMARY KEY,
+                    {', '.join(f'{name} TEXT' for name in COLUMNS.values())},
+                    raw TEXT NOT NULL
+                )"""
+            )
+            for name in ("task_id", "video_id", "status", "scheduled_time"):
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_rows_{name} ON rows ({name})")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def _get_meta(self, key: str, default: float = 0.0) -> float:
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return float(row["value"]) if row else default
+
+    def _set_meta(self, conn: sqlite3.Connection, key: str, value: float):
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    @staticmethod
+    def _record(row_index: int, values: List[Any]) -> Dict[str, Any]:
+        values = list(values) + [""] * (LAST_COLUMN - len(values))
+        record = {name: values[column] for column, name in COLUMNS.items()}
+        record["row_index"] = row_index
+        record["raw"] = json.dumps(values[:LAST_COLUMN], ensure_ascii=False)
+        return record
+
+    def _upsert(self, conn: sqlite3.Connection, record: Dict[str, Any]):
+        names = ["row_index"] + list(COLUMNS.values()) + ["raw"]
+        conn.execute(
+            f"INSERT OR REPLACE INTO rows ({', '.join(names)}) VALUES ({', '.join('?' for _ in names)})",
+            [record[name] for name in names]
+        )
+
+    def sync(self, full: bool = False) -> int:
+        """시트와 동기화합니다.
+
+        기본적으로 마지막으로 미러링한 행 이후의 행만 읽습니다. full=True이거나
+        FULL_SYNC_INTERVAL이 지났으면 A:P 전체를 다시 읽어 미러를 교체합니다.
+
+        Returns:
+            int: 읽은 행 수
+        """
+        with self._sync_lock:
+            if not full and time.time() - self._get_meta("last_full_sync") > self.FULL_SYNC_INTERVAL:
+                full = True
+
+            conn = self._connect()
+            if full:
+                first_row = 2  # 1행은 헤더
+            else:
+                last = conn.execute("SELECT MAX(row_index) AS last FROM rows").fetchone()["last"]
+                first_row = (last or 1) + 1
+
+            result = self.service_getter().spreadsheets().values().get(
+                spreadsheetId=self.spreadsheet_id,
+                range=f'{self.sheet_name}!A{first_row}:P'
+            ).execute()
+            values = result.get('values', [])
+
+            now = time.time()
+            with conn:
+                if full:
+                    conn.execute("DELETE FROM rows")
+                    self._set_meta(conn, "last_full_sync", now)
+                for offset, row in enumerate(values):
+                    if row:
+                        self._upsert(conn, self._record(first_row + offset, row))
+                self._set_meta(conn, "last_sync", now)
+            return len(values)
+
+    def ensure_synced(self, max_age: float) -> None:
+        """마지막 동기화가 max_age초보다 오래되었으면 증분 동기화합니다."""
+        if time.time() - self._get_meta("last_sync") > max_age:
+            self.sync()
+
+    def apply_cells(self, row_index: int, cells: Dict[int, Any]) -> None:
+        """이 프로세스가 시트에 쓴(또는 버퍼에 넣은) 셀 변경을 미러에 반영합니다."""
+        conn = self._connect()
+        with conn:
+            self._merge(conn, row_index, cells)
+
+    def _merge(self, conn: sqlite3.Connection, row_index: int, cells: Dict[int, Any]) -> None:
+        existing = conn.execute("SELECT raw FROM rows WHERE row_index = ?", (row_index,)).fetchone()
+        values = json.loads(existing["raw"]) if existing else [""] * LAST_COLUMN
+        for column, value in cells.items():
+            if column < LAST_COLUMN:
+                values[column] = value
+        self._upsert(conn, self._record(row_index, values))
+
+    def refresh_rows(self, first_row: int, last_row: int, row_indexes: Optional[List[int]] = None) -> None:
+        """first_row~last_row 행의 G:P열을 시트에서 다시 읽어 미러에 반영합니다.
+
+        증분 동기화는 새 행만 읽으므로, 다른 노드가 기존 행에 쓴 상태, 예약 시간, video ID,
+        lease는 이 메서드로 가져옵니다.
+
+        Args:
+            row_indexes (List[int], optional): 주어지면 범위 안에서 이 행들만 갱신합니다
+        """
+        result = self.service_getter().spreadsheets().values().get(
+            spreadsheetId=self.spreadsheet_id,
+            range=f'{self.sheet_name}!G{first_row}:P{last_row}'
+        ).execute()
+        values = result.get('values', [])
+        width = LAST_COLUMN - VOLATILE_FIRST_COLUMN
+        conn = self._connect()
+        with self._sync_lock, conn:
+            for row_index in (row_indexes if row_indexes is not None else range(first_row, last_row + 1)):
+                offset = row_index - first_row
+                row = values[offset] if offset < len(values) else []
+                row = list(row) + [""] * (width - len(row))
+                self._merge(conn, row_index, {VOLATILE_FIRST_COLUMN + i: value for i, value in enumerate(row[:width])})
+
+    def refresh_unprocessed(self) -> int:
+        """처리되지 않은 행들의 G:P열을 요청 하나로 다시 읽습니다 (주제 후보를 만들기 전에 호출).
+
+        Returns:
+            int: 갱신한 행 수
+        """
+        row_indexes = [row["row_index"] for row in self.unprocessed_rows()]
+        if not row_indexes:
+            return 0
+        self.refresh_rows(row_indexes[0], row_indexes[-1], row_indexes)
+        return len(row_indexes)
+
+    def is_unprocessed(self, row_index: int) -> bool:
+        """unprocessed_rows()와 같은 기준으로 행이 아직 처리되지 않았는지 확인합니다 (미러 기준)."""
+        row = self._connect().execute(
+            f"SELECT 1 FROM rows WHERE row_index = ? AND {_UNPROCESSED}", (row_index,)
+        ).fetchone()
+        return row is not None
+
+    def find_row_by_task_id(self, task_id: str) -> Optional[int]:
+        row = self._connect().execute(
+            "SELECT row_index FROM rows WHERE task_id = ? ORDER BY row_index LIMIT 1", (task_id,)
+        ).fetchone()
+        return row["row_index"] if row else None
+
+    def find_row_by_video_id(self, video_id: str) -> Optional[int]:
+        row = self._connect().execute(
+            "SELECT row_index FROM rows WHERE video_id = ? ORDER BY row_index LIMIT 1", (video_id,)
+        ).fetchone()
+        return row["row_index"] if row else None
+
+    def max_scheduled_time(self) -> Optional[str]:
+        """가장 늦은 예약 시간 문자열을 반환합니다 ("%Y-%m-%d %H:%M:%S"는 사전순 = 시간순)."""
+        row = self._connect().execute(
+            "SELECT MAX(scheduled_time) AS latest FROM rows WHERE scheduled_time LIKE '____-__-__ __:__:__'"
+        ).fetchone()
+        return row["latest"] if row else None
+
+    def scheduled_times(self) -> List[str]:
+        rows = self._connect().execute(
+            "SELECT scheduled_time FROM rows WHERE scheduled_time != '' ORDER BY scheduled_time"
+        ).fetchall()
+        return [row["scheduled_time"] for row in rows]
+
+    def rows_by_status(self, status: str) -> List[Dict[str, Any]]:
+        rows = self._connect().execute(
+            "SELECT * FROM rows WHERE status = ? ORDER BY row_index", (status,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def unprocessed_rows(self) -> List[Dict[str, Any]]:
+        """주제가 있고 video ID와 예약 시간이 없는 행을 반환합니다.
+
+        렌더링이 끝나 quota를 기다리는 행(status = awaiting_upload)은 제외합니다.
+        """
+        rows = self._connect().execute(
+            f"SELECT * FROM rows WHERE {_UNPROCESSED} ORDER BY row_index"
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def rows_with_video_ids(self) -> List[Dict[str, Any]]:
+        rows = self._connect().execute(
+            "SELECT * FROM rows WHERE TRIM(COALESCE(video_id, '')) != '' ORDER BY row_index"
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+
+_mirrors: Dict[Tuple[str, str], SheetMirror] = {}
+_mirrors_lock = threading.Lock()
+
+
+def get_sheet_mirror(spreadsheet_id: str, creator: str, sheet_name: str, service_getter: Callable[[], Any]) -> SheetMirror:
+    """(스프레드시트, 크리에이터)별로 프로세스에서 공유하는 미러를 반환합니다."""
+    with _mirrors_lock:
+        key = (spreadsheet_id, creator)
+        if key not in _mirrors:
+            _mirrors[key] = SheetMirror(creator, sheet_name, spreadsheet_id, service_getter)
+        return _mirrors[key]
@@ -1,23 +1,31 @@
 """Utility class for managing Google Sheets"""
 import os
 import yaml
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-import pickle
-from typing import List, Dict, Any, Optional
-from datetime import datetime, time, timedelta
+import time as time_module
+import threading
+from typing import List, Dict, Any, Optional, Set, Tuple
+from datetime import datetime
 from .logger import Logger
-import pytz
+from .client_pool import get_client_pool
+from .sheets_write_buffer import get_write_buffer
+from .sheet_mirror import get_sheet_mirror
+from .upload_slots import find_slot_allocator, get_slot_allocator
+from .metrics import metrics
 
 
 class SheetsManager:
+    # 외부에서 추가된 주제를 반영하기 위해 후보 목록을 다시 읽기까지의 최대 시간 (초)
+    SUBJECT_CACHE_TTL = 300
+    # 로컬 미러가 이 시간보다 오래되면 조회 전에 시트의 새 행을 가져옵니다 (초)
+    MIRROR_SYNC_INTERVAL = 60
+
     def __init__(self, creator: str = None):
         self.logger = Logger()
+        # creator -> (로드 시각, 처리되지 않은 주제 후보 목록)
+        self._subject_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._subject_cache_lock = threading.Lock()
         self.SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
         self.creds = None
-        self.service = None
         self.creator = creator
         self.spreadsheet_id = os.getenv('GOOGLE_SHEETS_ID')
         if not self.spreadsheet_id:
@@ -27,31 +35,45 @@ class SheetsManager:
 
     def _setup_credentials(self):
         """Set up Google Sheets API authentication"""
-        # Load token if exists
-        if os.path.exists('token.pickle'):
-            with open('token.pickle', 'rb') as token:
-                self.creds = pickle.load(token)
-        
-        # Create new credentials if not valid
-        if not self.creds or not self.creds.valid:
-            if self.creds and self.creds.expired and self.creds.refresh_token:
-                self.creds.refresh(Request())
-            else:
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    'credentials.json',
-                    self.SCOPES
-                )
-                self.creds = flow.run_local_server(
-                    port=8080,
-                    open_browser=True,
-                    success_message='인증이 완료되었습니다. 이 창을 닫아주세요.'
-                )
-            
-            # Save token
-            with open('token.pickle', 'wb') as token:
-                pickle.dump(self.creds, token)
-        
-        self.service = build('sheets', 'v4', credentials=self.creds)
+        # 자격 증명은 프로세스 전체에서 공유되며 백그라운드에서 미리 갱신됩니다
+        self.creds = get_client_pool().get_credentials('token.pickle', 'credentials.json', self.SCOPES)
+
+    @property
+    def service(self):
+        """현재 스레드의 Sheets API 서비스 (연결 재사용)"""
+        return get_client_pool().get_service('sheets', 'v4', self.creds)
+
+    def _write_buffer(self, spreadsheet_id: str = None):
+        """셀 변경을 모아 batchUpdate로 기록하는 write-behind 버퍼 (프로세스 공유)"""
+        return get_write_buffer(spreadsheet_id or self.spreadsheet_id, lambda: self.service)
+
+    def flush_writes(self, spreadsheet_id: str = None) -> None:
+        """버퍼에 쌓인 셀 변경을 즉시 기록합니다 (시트를 다시 읽기 전에 호출).
+
+        다른 스레드의 flush가 진행 중이면 끝날 때까지 기다리고, 그 flush가 실패해 버퍼로
+        돌아온 변경도 기록합니다. 기록에 실패하면 예외가 발생합니다.
+        """
+        buffer = self._write_buffer(spreadsheet_id)
+        buffer.flush()
+        if buffer.pending_rows():
+            buffer.flush()
+
+    def _mirror(self, spreadsheet_id: str = None, creator: str = None, max_age: Optional[float] = None):
+        """크리에이터 시트의 로컬 SQLite 미러를 반환합니다.
+
+        Args:
+            max_age (float, optional): 주어지면 마지막 동기화가 이보다 오래된 경우 증분 동기화합니다
+        """
+        spreadsheet_id = spreadsheet_id or self.spreadsheet_id
+        creator = creator or self.creator
+        mirror = get_sheet_mirror(
+            spreadsheet_id, creator, self._get_creator_sheet_name(creator), lambda: self.service
+        )
+        if max_age is not None:
+            # 전체 동기화가 버퍼에 남은 변경을 덮어쓰지 않도록 먼저 기록합니다
+            self.flush_writes(spreadsheet_id)
+            mirror.ensure_synced(max_age)
+        return mirror
 
 
     def _get_creator_sheet_name(self, creator: str = None) -> str:
@@ -75,8 +97,13 @@ class SheetsManager:
             raise
 
 
-    def save_video_info(self, spreadsheet_id: str, content_plan: Dict[str, Any], task_id: str, creator: str, video_id: str = None, video_url: str = None, row_index: int = None) -> None:
-        """Save video information to Google Sheets"""
+    def save_video_info(self, spreadsheet_id: str, content_plan: Dict[str, Any], task_id: str, creator: str, video_id: str = None, video_url: str = None, row_index: int = None, scheduled_time: Optional[datetime] = None) -> None:
+        """Save video information to Google Sheets
+
+        기존 행(row_index)의 변경은 write-behind 버퍼에 기록되어 batchUpdate로 합쳐집니다.
+        scheduled_time이 주어지면 시트를 다시 읽어 업로드 시간을 계산하지 않습니다.
+        """
+        import pytz
         try:
             # 크리에이터의 시트 이름 가져오기
             sheet_name = self._get_creator_sheet_name(creator)
@@ -84,8 +111,8 @@ class SheetsManager:
             # Prepare data to save
             now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            # 다음 업로드 시간 계산
-            next_upload_time = self._calculate_next_upload_time(creator)
+            # 다음 업로드 시간 계산 (업로드에 사용한 시간이 있으면 그대로 사용)
+            next_upload_time = scheduled_time or self._calculate_next_upload_time(creator)
             
             # UTC 시간을 한국 시간으로 변환
             kst = pytz.timezone('Asia/Seoul')
@@ -106,14 +133,14 @@ class SheetsManager:
             ]
             
             if row_index:
-                # 기존 행 업데이트
-                result = self.service.spreadsheets().values().update(
-                    spreadsheetId=spreadsheet_id,
-                    range=f'{sheet_name}!A{row_index}:J{row_index}',
-                    valueInputOption='RAW',
-                    body={'values': [new_values]}
-                ).execute()
-                print(f"Updated row {row_index}")
+                # 기존 행 업데이트 (버퍼링). 주제가 없으면 A열은 그대로 둡니다
+                cells = {column: value for column, value in enumerate(new_values)}
+                if not new_values[0]:
+                    del cells[0]
+                self._write_buffer(spreadsheet_id).set_cells(sheet_name, row_index, cells)
+                self._mirror(spreadsheet_id, creator).apply_cells(row_index, cells)
+                print(f"Queued update for row {row_index}")
+                self.invalidate_subjects(creator, row_index)
             else:
                 # 새 행 추가
                 result = self.service.spreadsheets().values().append(
@@ -124,6 +151,7 @@ class SheetsManager:
                     body={'values': [new_values]}
                 ).execute()
                 print(f"{result.get('updates').get('updatedRows')} rows added.")
+                self.invalidate_subjects(creator)
             
             # 업데이트된 행 번호 반환
             if row_index:
@@ -132,19 +160,25 @@ class SheetsManager:
                 # 새로 추가된 행의 번호 계산
                 updated_range = result.get('updates', {}).get('updatedRange', '')
                 if updated_range:
-                    return int(updated_range.split('!')[1].replace('A', ''))
+                    # 'Sheet!A12:J12' -> 12
+                    new_row = int(updated_range.split('!')[1].split(':')[0].replace('A', ''))
+                    self._mirror(spreadsheet_id, creator).apply_cells(new_row, dict(enumerate(new_values)))
+                    return new_row
                 return None
             
         except Exception as e:
             print(f"Error saving to Google Sheets: {str(e)}")
             raise
 
-    def get_next_subject(self, spreadsheet_id: str, creator: str) -> Optional[Dict[str, Any]]:
+    def get_next_subject(self, spreadsheet_id: str, creator: str, exclude_rows: Optional[Set[int]] = None) -> Optional[Dict[str, Any]]:
         """처리되지 않은 가장 오래된 주제를 가져옵니다.
 
+        다른 워커가 유효한 lease(O열 worker ID, P열 만료 시각)를 가진 행은 건너뜁니다.
+
         Args:
             spreadsheet_id (str): Google Spreadsheet ID
             creator (str): Creator name
+            exclude_rows (Set[int], optional): 건너뛸 행 번호 (이미 처리 중인 주제)
 
         Returns:
             Optional[Dict[str, Any]]: 다음 주제 정보 또는 None
@@ -152,77 +186,142 @@ class SheetsManager:
                 - row_index: 행 번호
                 - creation_time: 생성 시간
         """
+        subjects = self.get_next_subjects(spreadsheet_id, creator, 1, exclude_rows=exclude_rows)
+        return subjects[0] if subjects else None
+
+    def get_next_subjects(self, spreadsheet_id: str, creator: str, n: int, exclude_rows: Optional[Set[int]] = None) -> List[Dict[str, Any]]:
+        """처리되지 않은 가장 오래된 주제 n개를 가져옵니다.
+
+        시트는 한 번만 읽고 후보 목록을 메모리에 보관합니다. 후보 목록은 이 인스턴스가
+        시트에 쓰거나 SUBJECT_CACHE_TTL이 지나면 무효화됩니다.
+
+        Args:
+            spreadsheet_id (str): Google Spreadsheet ID
+            creator (str): Creator name
+            n (int): 가져올 주제 수
+            exclude_rows (Set[int], optional): 건너뛸 행 번호 (이미 처리 중인 주제)
+
+        Returns:
+            List[Dict[str, Any]]: 생성 시간순(오래된 것부터) 주제 목록
+        """
         try:
-            sheet_name = self._get_creator_sheet_name(creator)
+            candidates = self._get_subject_candidates(spreadsheet_id, creator)
+            now_epoch = time_module.time()
             
-            # 현재 시트의 모든 데이터 가져오기
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=spreadsheet_id,
-                range=f'{sheet_name}!A:J'
-            ).execute()
-            
-            values = result.get('values', [])
-            if not values:
-                print('No data found.')
-                return None
-            
-            # 헤더 행이 있다면 제외
-            if values and len(values[0]) > 0:
-                values = values[1:]
-            
-            # 처리되지 않은 주제들을 생성 시간순으로 정렬
-            unprocessed_subjects = []
-            for i, row in enumerate(values):
-                # 최소한 A열(Subject)이 있어야 함
-                if len(row) < 1:
-                    continue
-                    
-                subject = row[0]  # A열: Subject
-                if not subject or subject.strip() == '':  # 주제가 비어있으면 스킵
+            subjects = []
+            for candidate in candidates:
+                # 처리 중인 행은 스킵
+                if exclude_rows and candidate['row_index'] in exclude_rows:
                     continue
-                    
-                # Video ID 확인 (I열)
-                video_id = row[8] if len(row) > 8 else ""
-                if video_id and video_id.strip() != '':  # 이미 처리된 주제는 스킵
+                # 다른 워커가 lease를 가진 행은 스킵
+                if candidate['lease_expiry'] > now_epoch:
                     continue
-                
-                # Scheduled time 확인 (H열)
-                scheduled_time = row[7] if len(row) > 7 else ""
-                if scheduled_time and scheduled_time.strip() != '':  # 이미 예약된 주제는 스킵
-                    continue
-                
-                # Creation time 확인 (B열)
-                creation_time = row[1] if len(row) > 1 else None
-                if creation_time:
-                    try:
-                        creation_datetime = datetime.strptime(creation_time, "%Y-%m-%d %H:%M:%S")
-                    except ValueError:
-                        # 유효하지 않은 날짜면 현재 시간 사용
-                        creation_datetime = datetime.now()
-                else:
-                    # creation_time이 없으면 현재 시간 사용
-                    creation_datetime = datetime.now()
-                
-                unprocessed_subjects.append({
-                    'subject': subject.strip(),
-                    'row_index': i + 2,  # 1-based index (헤더 행 고려)
-                    'creation_time': creation_datetime
+                subjects.append({
+                    'subject': candidate['subject'],
+                    'row_index': candidate['row_index'],
+                    'creation_time': candidate['creation_time']
                 })
+                if len(subjects) >= n:
+                    break
             
-            if not unprocessed_subjects:
+            if not subjects:
                 print('No pending subjects found.')
-                return None
-            
-            # 생성 시간순으로 정렬 (가장 오래된 것부터)
-            unprocessed_subjects.sort(key=lambda x: x['creation_time'])
-            
-            # 가장 오래된 주제 반환
-            return unprocessed_subjects[0]
+            return subjects
             
         except Exception as e:
             print(f"Error getting next subject: {str(e)}")
             raise
 
+    def is_subject_pending(self, spreadsheet_id: str, creator: str, row_index: int) -> bool:
+        """claim한 행이 아직 처리되지 않았는지 시트에서 직접 확인합니다.
+
+        후보 목록과 미러는 다른 노드의 변경을 늦게 볼 수 있으므로(다른 노드의 버퍼에 있던
+        video ID/예약 시간이 기록된 뒤 lease가 해제된 경우), 처리하기 전에 해당 행의 G:P열을
+        다시 읽습니다. 처리된 행은 후보 목록에서도 제거합니다.
+        """
+        self.flush_writes(spreadsheet_id)
+        mirror = self._mirror(spreadsheet_id, creator)
+        mirror.refresh_rows(row_index, row_index)
+        if mirror.is_unprocessed(row_index):
+            return True
+        self.invalidate_subjects(creator, row_index)
+        return False
+
+    def invalidate_subjects(self, creator: str = None, row_index: int = None) -> None:
+        """메모리에 보관한 주제 후보 목록을 무효화합니다.
+
+        Args:
+            creator (str, optional): 크리에이터 (없으면 모든 크리에이터)
+            row_index (int, optional): 주어지면 해당 행만 후보에서 제거합니다
+        """
+        with self._subject_cache_lock:
+            if creator is None:
+                self._subject_cache.clear()
+            elif row_index is None:
+                self._subject_cache.pop(creator, None)
+            elif creator in self._subject_cache:
+                loaded_at, candidates = self._subject_cache[creator]
+                candidates = [c for c in candidates if c['row_index'] != row_index]
+                self._subject_cache[creator] = (loaded_at, candidates)
+
+    def _get_subject_candidates(self, spreadsheet_id: str, creator: str) -> List[Dict[str, Any]]:
+        """캐시된 후보 목록을 반환하고, 없거나 오래되었으면 시트를 한 번 읽어 다시 만듭니다."""
+        with self._subject_cache_lock:
+            cached = self._subject_cache.get(creator)
+            if cached and time_module.monotonic() - cached[0] < self.SUBJECT_CACHE_TTL:
+                metrics.inc("shortfactory_cache_requests_total", cache="subject_candidates", result="hit")
+                return cached[1]
+        
+        metrics.inc("shortfactory_cache_requests_total", cache="subject_candidates", result="miss")
+        candidates = self._load_subject_candidates(spreadsheet_id, creator)
+        with self._subject_cache_lock:
+            self._subject_cache[creator] = (time_module.monotonic(), candidates)
+        return candidates
+
+    def _load_subject_candidates(self, spreadsheet_id: str, creator: str) -> List[Dict[str, Any]]:
+        """로컬 미러에서 처리되지 않은 주제를 생성 시간순으로 정렬합니다.
+
+        미러는 시트에 새로 추가된 행만 읽어 동기화하므로 후보 목록을 다시 만들 때
+        시트 전체를 내려받지 않습니다. 다만 다른 노드가 처리했거나 lease를 잡은 기존 행을
+        걸러내기 위해 처리되지 않은 행의 G:P열(상태, 예약 시간, video ID, lease)은 다시 읽습니다.
+        """
+        self.flush_writes(spreadsheet_id)  # 버퍼에 남은 변경을 먼저 기록 (read-your-writes)
+        mirror = self._mirror(spreadsheet_id, creator)
+        mirror.sync()
+        mirror.refresh_unprocessed()
+        
+        # 처리되지 않은 주제들을 생성 시간순으로 정렬
+        unprocessed_subjects = []
+        for row in mirror.unprocessed_rows():
+            # Lease 만료 시각 (P열)
+            try:
+                lease_expiry = float(row['lease_expiry']) if row['lease_expiry'] else 0.0
+            except ValueError:
+                lease_expiry = 0.0
+            
+            # Creation time 확인 (B열)
+            creation_time = row['creation_time']
+            if creation_time:
+                try:
+                    creation_datetime = datetime.strptime(creation_time, "%Y-%m-%d %H:%M:%S")
+                except ValueError:
+                    # 유효하지 않은 날짜면 현재 시간 사용
+                    creation_datetime = datetime.now()
+            else:
+                # creation_time이 없으면 현재 시간 사용
+                creation_datetime = datetime.now()
+            
+            unprocessed_subjects.append({
+                'subject': row['subject'].strip(),
+                'row_index': row['row_index'],
+                'creation_time': creation_datetime,
+                'lease_expiry': lease_expiry
+            })
+        
+        # 생성 시간순으로 정렬 (가장 오래된 것부터)
+        unprocessed_subjects.sort(key=lambda x: x['creation_time'])
+        return unprocessed_subjects
+
     def update_video_info(self, spreadsheet_id: str, task_id: str, creator: str, updates: Dict[str, Any], row_index: int = None) -> None:
         """비디오 정보를 업데이트합니다.
 
@@ -236,38 +335,21 @@ class SheetsManager:
         try:
             sheet_name = self._get_creator_sheet_name(creator)
             
-            # 행 번호가 주어지지 않은 경우, task_id로 행을 찾음
+            # 행 번호가 주어지지 않은 경우, 로컬 미러의 task_id 인덱스로 행을 찾음
             if row_index is None:
-                result = self.service.spreadsheets().values().get(
-                    spreadsheetId=spreadsheet_id,
-                    range=f'{sheet_name}!A:J'
-                ).execute()
-                
-                values = result.get('values', [])
-                for i, row in enumerate(values):
-                    if len(row) > 2 and row[2] == task_id:  # C열: Task ID
-                        row_index = i + 1  # 1-based index
-                        break
+                mirror = self._mirror(spreadsheet_id, creator, max_age=self.MIRROR_SYNC_INTERVAL)
+                row_index = mirror.find_row_by_task_id(task_id)
+                if row_index is None:
+                    # 다른 워커가 방금 추가한 행일 수 있으므로 새 행을 가져와 다시 찾음
+                    mirror.sync()
+                    row_index = mirror.find_row_by_task_id(task_id)
             
             if not row_index:
                 raise ValueError(f"Row not found for task_id: {task_id}")
             
-            # 현재 행의 데이터 가져오기
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=spreadsheet_id,
-                range=f'{sheet_name}!A{row_index}:J{row_index}'
-            ).execute()
-            
-            current_values = result.get('values', [[]])[0]
-            # 현재 값이 10개보다 적으면 10개가 되도록 빈 문자열 추가
-            while len(current_values) < 10:
-                current_values.append("")
-            
-            # 업데이트할 값 준비
-            new_values = current_values.copy()
-            
             # 업데이트 매핑
             column_mapping = {
+                'task_id': 2,          # C열
                 'video_title': 3,      # D열
                 'video_description': 4, # E열
                 'hashtag': 5,          # F열
@@ -277,24 +359,13 @@ class SheetsManager:
                 'video_url': 9         # J열
             }
             
-            # 값 업데이트
-            for key, value in updates.items():
-                if key in column_mapping:
-                    new_values[column_mapping[key]] = value
+            # 변경된 셀만 버퍼에 기록 (같은 행의 다른 변경과 병합되어 한 번에 기록됨)
+            cells = {column_mapping[key]: value for key, value in updates.items() if key in column_mapping}
+            self._write_buffer(spreadsheet_id).set_cells(sheet_name, row_index, cells)
+            self._mirror(spreadsheet_id, creator).apply_cells(row_index, cells)
             
-            # 업데이트 실행
-            body = {
-                'values': [new_values]
-            }
-            
-            result = self.service.spreadsheets().values().update(
-                spreadsheetId=spreadsheet_id,
-                range=f'{sheet_name}!A{row_index}:J{row_index}',
-                valueInputOption='RAW',
-                body=body
-            ).execute()
-            
-            print(f"Updated {result.get('updatedCells')} cells.")
+            print(f"Queued {len(cells)} cell update(s) for row {row_index}.")
+            self.invalidate_subjects(creator, row_index)
             
         except Exception as e:
             print(f"Error updating video information: {str(e)}")
@@ -315,6 +386,7 @@ class SheetsManager:
         """업로드 상태를 업데이트합니다."""
         try:
             # 현재 시트의 모든 데이터 가져오기
+            self.flush_writes(spreadsheet_id)
             result = self.service.spreadsheets().values().get(
                 spreadsheetId=spreadsheet_id,
                 range='science_fact!A:G'
@@ -349,6 +421,7 @@ class SheetsManager:
             ).execute()
             
             print(f"Status updated to '{status}' for task {task_id}")
+            self.invalidate_subjects()
             
         except Exception as e:
             print(f"Error updating status: {str(e)}")
@@ -365,163 +438,72 @@ class SheetsManager:
             raise
 
     def get_next_available_time(self, creator: str) -> datetime:
-        """마지막 예약 시간 이후의 다음 가능한 시간을 찾습니다."""
+        """마지막 예약 시간 이후의 다음 업로드 슬롯을 할당합니다 (KST).
+
+        반환된 슬롯은 예약된 것으로 표시되므로 다음 호출은 그 다음 슬롯을 반환합니다.
+        """
         try:
-            sheet_name = self._get_creator_sheet_name(creator)
-            
-            # 현재 시트의 모든 데이터 가져오기
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=f'{sheet_name}!A:J'
-            ).execute()
-            
-            values = result.get('values', [])
-            scheduled_times = []
-            
-            # 예약된 시간 수집 (H열: Scheduled time)
-            if values:
-                for row in values[1:]:  # 헤더 제외
-                    if len(row) > 7 and row[7]:  # H열에 값이 있는 경우
-                        try:
-                            # KST 시간으로 변환
-                            kst = pytz.timezone('Asia/Seoul')
-                            scheduled_time = datetime.strptime(row[7], "%Y-%m-%d %H:%M:%S")
-                            scheduled_time = kst.localize(scheduled_time)
-                            scheduled_times.append(scheduled_time)
-                        except (ValueError, IndexError):
-                            continue
-            
-            # 현재 시간 (KST)
-            kst = pytz.timezone('Asia/Seoul')
-            now = datetime.now(kst)
-            
-            # 마지막 예약 시간 찾기
-            last_scheduled_time = max(scheduled_times) if scheduled_times else now
-            
-            # 고정 업로드 시간 (한국 시간 기준)
-            upload_times = [
-                time(16, 0),    # 04:00 KST (4 AM)
-                time(10, 0),   # 18:00 KST (6 PM)
-            ]
-            
-            # 마지막 예약 시간으로부터 24시간이 지났는지 확인
-            time_since_last = now - last_scheduled_time
-            if time_since_last.total_seconds() < 24 * 3600:  # 24시간 미만
-                # 마지막 예약 시간의 날짜 사용
-                current_date = last_scheduled_time.date()
-            else:
-                # 현재 날짜 사용
-                current_date = now.date()
-            
-            # 다음 가능한 시간 찾기
-            current_time = now.time()
-            
-            # 오늘의 남은 시간 확인
-            for upload_time in upload_times:
-                upload_datetime = datetime.combine(current_date, upload_time)
-                upload_datetime = kst.localize(upload_datetime)
-                
-                if upload_time > current_time:
-                    if upload_datetime > last_scheduled_time:
-                        print(f"Next available time (KST): {upload_datetime}")
-                        return upload_datetime
-            
-            # 다음 날의 첫 번째 시간으로 설정
-            next_date = current_date + timedelta(days=1)
-            next_time = datetime.combine(next_date, upload_times[0])
-            next_time = kst.localize(next_time)
-            print(f"Next available time (next day KST): {next_time}")
+            next_time = self.get_upload_slots(creator, 1)[0]
+            print(f"Next available time (KST): {next_time}")
             return next_time
             
         except Exception as e:
             print(f"Error finding next available time: {str(e)}")
             raise
 
+    def get_upload_slots(self, creator: str, k: int) -> List[datetime]:
+        """다음 빈 업로드 슬롯 k개를 한 번에 할당합니다.
+
+        할당기는 크리에이터별로 프로세스에서 공유되며, 처음 사용할 때만 로컬 미러의
+        예약 시간(H열)으로 시드됩니다.
+
+        Args:
+            creator (str): Creator name
+            k (int): 할당할 슬롯 수
+
+        Returns:
+            List[datetime]: 시간순으로 정렬된 KST 슬롯 목록
+        """
+        allocator = get_slot_allocator(
+            creator,
+            lambda: self._mirror(self.spreadsheet_id, creator, max_age=self.MIRROR_SYNC_INTERVAL).scheduled_times()
+        )
+        return allocator.allocate(k)
+
+    def release_upload_slot(self, creator: str, slot: datetime) -> None:
+        """업로드하지 않은 슬롯을 반환하여 다음 할당에서 재사용하도록 합니다.
 
-    def update_video_statistics(self, spreadsheet_id: str, creator: str) -> None:
+        슬롯은 이 프로세스의 할당기에서만 나오므로, 할당기가 없으면 반환할 것도 없습니다.
+        (빈 일정으로 할당기를 만들면 이후 할당이 시트의 예약 시간을 무시하게 됩니다.)
+        """
+        allocator = find_slot_allocator(creator)
+        if allocator is not None:
+            allocator.release(slot)
+
+
+    def update_video_statistics(self, spreadsheet_id: str, creator: str, youtube_manager=None, force: bool = False) -> Dict[str, int]:
         """모든 비디오의 통계 정보를 업데이트합니다.
 
+        공개 후 경과 시간에 따라 갱신할 때가 된 비디오만 videos.list(요청당 50개 ID)로 가져오고,
+        값이 바뀐 행의 조회수/좋아요/댓글/성능 메모(K:N열)를 batchUpdate 한 번으로 기록합니다.
+
         Args:
             spreadsheet_id (str): Google Spreadsheet ID
             creator (str): Creator name
+            youtube_manager (YouTubeManager, optional): 재사용할 YouTube 매니저
+            force (bool): True이면 갱신 주기와 관계없이 모든 비디오를 가져옵니다
+
+        Returns:
+            Dict[str, int]: videos, fetched, updated, requests, saved_requests
         """
         try:
-            sheet_name = self._get_creator_sheet_name(creator)
-            
-            # 현재 시트의 모든 데이터 가져오기
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=spreadsheet_id,
-                range=f'{sheet_name}!A:M'
-            ).execute()
-            
-            values = result.get('values', [])
-            if not values:
-                print('No data found.')
-                return
+            if youtube_manager is None:
+                from .youtube_manager import YouTubeManager
+                youtube_manager = YouTubeManager(creator)
             
-            # YouTube 매니저 초기화
-            from .youtube_manager import YouTubeManager
-            youtube_manager = YouTubeManager(creator)
-            
-            # 각 행의 비디오 정보 업데이트
-            for i, row in enumerate(values):
-                if len(row) < 8:  # 최소 8열(H열)이 있어야 함
-                    continue
-                    
-                video_id = row[7]  # H열: Video ID
-                if not video_id:  # 비디오 ID가 없는 경우 스킵
-                    continue
-                
-                try:
-                    # 비디오 통계 정보 가져오기
-                    stats = youtube_manager.get_video_statistics(video_id)
-                    
-                    # 업데이트할 정보
-                    updates = {
-                        'views': stats['views'],
-                        'likes': stats['likes'],
-                        'comments': stats['comments'],
-                        'status': stats['status']
-                    }
-                    
-                    # 성능 메모 추가 (예: 조회수/좋아요 비율)
-                    try:
-                        views = int(stats['views'])
-                        likes = int(stats['likes'])
-                        if views > 0:
-                            engagement_rate = (likes / views) * 100
-                            updates['performance_notes'] = f"Engagement rate: {engagement_rate:.2f}%"
-                    except (ValueError, ZeroDivisionError):
-                        updates['performance_notes'] = "Engagement rate: N/A"
-                    
-                    # 행 업데이트
-                    if 'views' in updates:
-                        row[9] = updates['views']  # J열
-                    if 'likes' in updates:
-                        row[10] = updates['likes']  # K열
-                    if 'comments' in updates:
-                        row[11] = updates['comments']  # L열
-                    if 'performance_notes' in updates:
-                        row[12] = updates['performance_notes']  # M열
-                    
-                    # 업데이트된 데이터 저장
-                    body = {
-                        'values': [row]
-                    }
-                    
-                    result = self.service.spreadsheets().values().update(
-                        spreadsheetId=spreadsheet_id,
-                        range=f'{sheet_name}!A{i+1}:M{i+1}',
-                        valueInputOption='RAW',
-                        body=body
-                    ).execute()
-                    
-                    print(f"Updated statistics for video {video_id}")
-                    
-                except Exception as e:
-                    print(f"Error updating statistics for video {video_id}: {str(e)}")
-                    continue
+            from .video_statistics import StatisticsRefresher
+            return StatisticsRefresher(self, youtube_manager).refresh(spreadsheet_id, creator, force=force)
             
         except Exception as e:
             print(f"Error updating video statistics: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
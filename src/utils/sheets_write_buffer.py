@@ -0,0 +1,241 @@
+"""Write-behind buffer for Google Sheets cell updates
+
+행별로 변경된 셀을 병합해 두었다가 spreadsheets.values.batchUpdate 한 번으로 기록합니다.
+- 타이머(flush_interval), 대기 행 수(max_pending_rows), 종료 시점에 flush
+- 모든 변경은 먼저 journal 파일(JSON Lines)에 fsync되므로 프로세스가 죽어도
+  다음 실행에서 journal을 재생하여 기록을 마칩니다.
+"""
+import os
+import json
+import glob
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+from .logger import Logger, add_before_stop_hook
+
+
+def column_letter(index: int) -> str:
+    """0-based 열 번호를 A1 표기 열 문자로 변환합니다 (0 -> A, 26 -> AA)."""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SheetsWriteBuffer:
+    JOURNAL_DIR = os.path.join("data", "sheets_journal")
+
+    def __init__(
+        self,
+        service_getter: Callable[[], Any],
+        spreadsheet_id: str,
+        flush_interval: float = 5.0,
+        max_pending_rows: int = 50,
+    ):
+        """
+        Args:
+            service_getter (Callable): 현재 스레드의 Sheets API 서비스를 반환하는 함수
+            spreadsheet_id (str): Google Spreadsheet ID
+            flush_interval (float): 주기적 flush 간격 (초)
+            max_pending_rows (int): 대기 행 수가 이 값에 도달하면 즉시 flush
+        """
+        self.logger = Logger()
+        self.service_getter = service_getter
+        self.spreadsheet_id = spreadsheet_id
+        self.flush_interval = flush_interval
+        self.max_pending_rows = max_pending_rows
+
+        # (sheet_name, row_index) -> {column index: value}
+        self._pending: Dict[Tuple[str, int], Dict[int, Any]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self.flush_count = 0
+
+        os.makedirs(self.JOURNAL_DIR, exist_ok=True)
+        self.journal_path = os.path.join(self.JOURNAL_DIR, f"{spreadsheet_id}.{os.getpid()}.jsonl")
+        self._recover()
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+        self._thread = threading.Thread(target=self._flush_loop, name="sheets-write-behind", daemon=True)
+        self._thread.start()
+
+    def _recover(self):
+        """이전 실행(또는 종료된 다른 프로세스)이 남긴 journal을 재생합니다."""
+        pattern = os.path.join(self.JOURNAL_DIR, f"{self.spreadsheet_id}.*.jsonl*")
+        recovered = 0
+        # .flushing 파일이 같은 프로세스의 journal보다 먼저 기록된 내용입니다
+        for path in sorted(glob.glob(pattern), key=lambda p: (not p.endswith(".flushing"), p)):
+            try:
+                pid = int(os.path.basename(path).split(".")[1])
+            except (IndexError, ValueError):
+                continue
+            if pid != os.getpid() and _pid_alive(pid):
+                continue  # 실행 중인 다른 프로세스의 journal
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # 기록 도중 중단된 마지막 줄
+                    self._merge(entry["sheet"], entry["row"], {int(k): v for k, v in entry["cells"].items()})
+                    recovered += 1
+            if path != self.journal_path:
+                os.replace(path, path + ".recovered")
+        if recovered:
+            self.logger.info(f"Recovered {recovered} pending Sheets write(s) from journal")
+            # 복구한 변경을 현재 journal에 다시 기록하여 다음 충돌에도 유지되도록 합니다
+            with open(self.journal_path, "a", encoding="utf-8") as journal:
+                for (sheet_name, row_index), cells in self._pending.items():
+                    journal.write(json.dumps({"sheet": sheet_name, "row": row_index, "cells": cells}, ensure_ascii=False) + "\n")
+                journal.flush()
+                os.fsync(journal.fileno())
+            for path in glob.glob(pattern + ".recovered"):
+                os.remove(path)
+
+    def _merge(self, sheet_name: str, row_index: int, cells: Dict[int, Any]):
+        self._pending.setdefault((sheet_name, row_index), {}).update(cells)
+
+    def set_cells(self, sheet_name: str, row_index: int, cells: Dict[int, Any]) -> None:
+        """행의 셀 변경을 버퍼에 추가합니다 (열 번호는 0-based).
+
+        변경은 journal에 fsync된 뒤에 반환되므로 프로세스가 종료되어도 유실되지 않습니다.
+        """
+        if not cells:
+            return
+        entry = {"sheet": sheet_name, "row": row_index, "cells": cells}
+        with self._lock:
+            self._journal.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self._merge(sheet_name, row_index, cells)
+            should_flush = len(self._pending) >= self.max_pending_rows
+        if should_flush:
+            try:
+                self.flush()
+            except Exception:
+                pass  # 변경은 journal과 버퍼에 남아 있으며 타이머가 다시 시도합니다
+
+    def pending_rows(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """대기 중인 모든 변경을 batchUpdate 한 번으로 기록합니다.
+
+        Returns:
+            int: 기록된 행 수
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                pending, self._pending = self._pending, {}
+                # 현재 journal을 .flushing으로 돌리고 새 journal에 이후 변경을 기록합니다
+                self._journal.close()
+                flushing_path = self.journal_path + ".flushing"
+                if os.path.exists(flushing_path):
+                    # 이전 flush가 실패하여 남은 내용 뒤에 이어 붙입니다
+                    with open(flushing_path, "a", encoding="utf-8") as dst, open(self.journal_path, "r", encoding="utf-8") as src:
+                        dst.write(src.read())
+                    os.remove(self.journal_path)
+                else:
+                    os.replace(self.journal_path, flushing_path)
+                self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+            try:
+                self.service_getter().spreadsheets().values().batchUpdate(
+                    spreadsheetId=self.spreadsheet_id,
+                    body={'valueInputOption': 'RAW', 'data': self._build_data(pending)}
+                ).execute()
+            except Exception as e:
+                # 실패한 변경은 이후 변경보다 우선순위가 낮도록 다시 병합합니다
+                with self._lock:
+                    for key, cells in pending.items():
+                        merged = dict(cells)
+                        merged.update(self._pending.get(key, {}))
+                        self._pending[key] = merged
+                self.logger.error(f"Sheets batchUpdate failed, will retry: {str(e)}")
+                raise
+
+            os.remove(flushing_path)
+            self.flush_count += 1
+            self.logger.info(f"Flushed {len(pending)} row(s) to Google Sheets with one batchUpdate")
+            return len(pending)
+
+    @staticmethod
+    def _build_data(pending: Dict[Tuple[str, int], Dict[int, Any]]) -> List[Dict[str, Any]]:
+        """행별 변경을 연속된 열 구간으로 묶어 batchUpdate의 data 목록을 만듭니다."""
+        data = []
+        for (sheet_name, row_index), cells in sorted(pending.items()):
+            columns = sorted(cells)
+            run = [columns[0]]
+            for column in columns[1:] + [None]:
+                if column is not None and column == run[-1] + 1:
+                    run.append(column)
+                    continue
+                start, end = column_letter(run[0]), column_letter(run[-1])
+                data.append({
+                    'range': f'{sheet_name}!{start}{row_index}:{end}{row_index}',
+                    'values': [[cells[c] for c in run]]
+                })
+                if column is not None:
+                    run = [column]
+        return data
+
+    def _flush_loop(self):
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                pass  # 에러는 flush에서 기록되며 다음 주기에 재시도합니다
+
+    def close(self):
+        """타이머를 멈추고 남은 변경을 flush합니다."""
+        self._stop_event.set()
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                self._journal.close()
+                if not self._pending and os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) == 0:
+                    os.remove(self.journal_path)
+
+
+_buffers: Dict[str, SheetsWriteBuffer] = {}
+_buffers_lock = threading.Lock()
+
+
+def get_write_buffer(spreadsheet_id: str, service_getter: Callable[[], Any]) -> SheetsWriteBuffer:
+    """스프레드시트별로 프로세스에서 공유하는 write-behind 버퍼를 반환합니다."""
+    with _buffers_lock:
+        if spreadsheet_id not in _buffers:
+            _buffers[spreadsheet_id] = SheetsWriteBuffer(service_getter, spreadsheet_id)
+        return _buffers[spreadsheet_id]
+
+
+def flush_all_write_buffers() -> None:
+    """모든 버퍼를 flush하고 닫습니다 (종료 시 호출)."""
+    with _buffers_lock:
+        buffers = list(_buffers.values())
+        _buffers.clear()
+    for buffer in buffers:
+        try:
+            buffer.close()
+        except Exception as e:
+            buffer.logger.error(f"Failed to flush Sheets writes on shutdown (kept in journal): {str(e)}")
+
+
+# Logger의 atexit 훅에서 리스너를 멈추기 전에 flush합니다 (종료 시 flush 오류 로그를 잃지 않도록)
+add_before_stop_hook(flush_all_write_buffers)
@@ -0,0 +1,216 @@
+"""Lease-based subject claiming for workers on multiple nodes
+
+여러 워커(노드)가 같은 주제를 동시에 처리하지 않도록, 주제(행)를 처리하기 전에
+워커 ID와 만료 시간이 있는 lease를 획득합니다.
+- 작업 중에는 heartbeat로 lease를 연장합니다.
+- 워커가 죽으면 lease가 만료되고 다른 워커가 해당 주제를 다시 가져갑니다.
+
+백엔드:
+- SQLiteLeaseBackend: 트랜잭션으로 원자적 claim (단일 노드/공유 파일시스템, 오프라인 테스트용)
+- SheetsLeaseBackend: 크리에이터 시트의 O열(worker ID), P열(lease 만료 시각)을 사용
+"""
+import os
+import time
+import uuid
+import socket
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional
+from .logger import Logger
+
+
+def make_worker_id() -> str:
+    """호스트 이름, PID, 임의 접미사로 워커 ID를 생성합니다."""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+class LeaseBackend(ABC):
+    """Lease 저장소 인터페이스"""
+
+    @abstractmethod
+    def try_claim(self, creator: str, row_index: int, worker_id: str, lease_seconds: float) -> bool:
+        """행이 비어 있거나 lease가 만료된 경우 원자적으로 claim합니다."""
+
+    @abstractmethod
+    def heartbeat(self, creator: str, row_index: int, worker_id: str, lease_seconds: float) -> bool:
+        """lease를 연장합니다. 다른 워커가 가져갔다면 False를 반환합니다."""
+
+    @abstractmethod
+    def release(self, creator: str, row_index: int, worker_id: str) -> None:
+        """자신이 가진 lease를 해제합니다."""
+
+
+class SQLiteLeaseBackend(LeaseBackend):
+    def __init__(self, db_path: str = os.path.join("data", "leases.sqlite")):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.db_path = db_path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS leases (
+                    creator TEXT NOT NULL,
+                    row_index INTEGER NOT NULL,
+                    worker_id TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (creator, row_index)
+                )"""
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def try_claim(self, creator: str, row_index: int, worker_id: str, lease_seconds: float) -> bool:
+        conn = self._connect()
+        now = time.time()
+        # BEGIN IMMEDIATE: 쓰기 잠금을 먼저 잡아 다른 프로세스와의 경합을 직렬화합니다
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT worker_id, expires_at FROM leases WHERE creator = ? AND row_index = ?",
+                (creator, row_index)
+            ).fetchone()
+            if row and row[0] != worker_id and row[1] > now:
+                conn.execute("ROLLBACK")
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO leases (creator, row_index, worker_id, expires_at) VALUES (?, ?, ?, ?)",
+                (creator, row_index, worker_id, now + lease_seconds)
+            )
+            conn.execute("COMMIT")
+            return True
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def heartbeat(self, creator: str, row_index: int, worker_id: str, lease_seconds: float) -> bool:
+        cursor = self._connect().execute(
+            "UPDATE leases SET expires_at = ? WHERE creator = ? AND row_index = ? AND worker_id = ?",
+            (time.time() + lease_seconds, creator, row_index, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def release(self, creator: str, row_index: int, worker_id: str) -> None:
+        self._connect().execute(
+            "DELETE FROM leases WHERE creator = ? AND row_index = ? AND worker_id = ?",
+            (creator, row_index, worker_id)
+        )
+
+
+class SheetsLeaseBackend(LeaseBackend):
+    """크리에이터 시트의 O열(worker ID)과 P열(만료 시각, epoch 초)에 lease를 기록합니다.
+
+    Sheets API에는 compare-and-set이 없으므로, lease를 쓴 뒤 settle_seconds 동안 기다렸다가
+    다시 읽어 자신의 worker ID가 남아 있을 때만 claim에 성공한 것으로 봅니다.
+    동시에 쓴 워커 중 마지막 쓰기만 남기 때문에 모든 워커가 같은 승자를 보게 됩니다.
+    """
+
+    def __init__(self, sheets_manager, spreadsheet_id: str, settle_seconds: float = 2.0):
+        self.sheets_manager = sheets_manager
+        self.spreadsheet_id = spreadsheet_id
+        self.settle_seconds = settle_seconds
+        self._lock = threading.Lock()
+
+    def _range(self, creator: str, row_index: int) -> str:
+        sheet_name = self.sheets_manager._get_creator_sheet_name(creator)
+        return f'{sheet_name}!O{row_index}:P{row_index}'
+
+    def _read(self, creator: str, row_index: int):
+        result = self.sheets_manager.service.spreadsheets().values().get(
+            spreadsheetId=self.spreadsheet_id,
+            range=self._range(creator, row_index)
+        ).execute()
+        values = result.get('values', [[]])
+        row = values[0] if values else []
+        worker_id = row[0] if len(row) > 0 else ""
+        try:
+            expires_at = float(row[1]) if len(row) > 1 and row[1] else 0.0
+        except ValueError:
+            expires_at = 0.0
+        return worker_id, expires_at
+
+    def _write(self, creator: str, row_index: int, worker_id: str, expires_at: Optional[float]):
+        self.sheets_manager.service.spreadsheets().values().update(
+            spreadsheetId=self.spreadsheet_id,
+            range=self._range(creator, row_index),
+            valueInputOption='RAW',
+            body={'values': [[worker_id, f"{expires_at:.0f}" if expires_at else ""]]}
+        ).execute()
+
+    def try_claim(self, creator: str, row_index: int, worker_id: str, lease_seconds: float) -> bool:
+        with self._lock:
+            owner, expires_at = self._read(creator, row_index)
+            if owner and owner != worker_id and expires_at > time.time():
+                return False
+            self._write(creator, row_index, worker_id, time.time() + lease_seconds)
+        time.sleep(self.settle_seconds)
+        owner, _ = self._read(creator, row_index)
+        return owner == worker_id
+
+    def heartbeat(self, creator: str, row_index: int, worker_id: str, lease_seconds: float) -> bool:
+        owner, _ = self._read(creator, row_index)
+        if owner != worker_id:
+            return False
+        self._write(creator, row_index, worker_id, time.time() + lease_seconds)
+        return True
+
+    def release(self, creator: str, row_index: int, worker_id: str) -> None:
+        owner, _ = self._read(creator, row_index)
+        if owner == worker_id:
+            self._write(creator, row_index, "", None)
+
+
+class LeaseHeartbeat:
+    """작업이 진행되는 동안 백그라운드에서 lease를 주기적으로 연장합니다.
+
+    사용 예:
+        with LeaseHeartbeat(backend, creator, row_index, worker_id, 600) as lease:
+            lease.completed = process(...)
+
+    completed가 True인 경우에만 종료 시 lease를 해제합니다. 실패한 작업의 lease는 만료될 때까지
+    남겨 두어 다른 워커가 곧바로 같은 주제를 재시도하지 않도록 합니다. 완료된 작업도
+    video ID와 예약 시간이 시트에 기록된 것을 확인한 뒤에만 completed를 True로 설정해야 합니다
+    (write-behind 버퍼에만 있는 상태에서 해제하면 다른 워커가 같은 행을 다시 claim할 수 있음).
+    """
+
+    def __init__(self, backend: LeaseBackend, creator: str, row_index: int, worker_id: str, lease_seconds: float):
+        self.backend = backend
+        self.creator = creator
+        self.row_index = row_index
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.completed = False
+        self.lost = False
+        self.logger = Logger()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"lease-{creator}-{row_index}", daemon=True
+        )
+
+    def _run(self):
+        interval = max(1.0, self.lease_seconds / 3)
+        while not self._stop_event.wait(interval):
+            try:
+                if not self.backend.heartbeat(self.creator, self.row_index, self.worker_id, self.lease_seconds):
+                    self.lost = True
+                    self.logger.warning(f"Lease lost for {self.creator} row {self.row_index}")
+                    return
+            except Exception as e:
+                # 일시적인 오류는 다음 주기에 다시 시도합니다 (lease 만료 전까지 여유가 있음)
+                self.logger.warning(f"Lease heartbeat failed for {self.creator} row {self.row_index}: {str(e)}")
+
+    def __enter__(self) -> "LeaseHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop_event.set()
+        self._thread.join()
+        if self.completed and not self.lost:
+            self.backend.release(self.creator, self.row_index, self.worker_id)
+        return False
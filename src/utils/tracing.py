@@ -0,0 +1,211 @@
+"""Stage-level tracing spans and latency histograms
+
+비디오(task) 하나가 어디에 시간을 쓰는지 기록합니다.
+- span(): 중첩 가능한 구간. 지속 시간과 바이트 수, 재시도 횟수 등의 속성을 기록합니다.
+- task_trace(): task가 끝나면 data/<creator>/<task_id>/trace.json에 Chrome trace 형식
+  (chrome://tracing, https://ui.perfetto.dev 에서 열기)으로 저장합니다.
+- category="external"인 span(LLM, 이미지, TTS, Google API, ffmpeg 등)은 이름별 최근
+  HISTOGRAM_WINDOW개의 지속 시간을 보관하여 p50/p95를 계산합니다.
+
+task 컨텍스트는 스레드별로 유지되므로 여러 워커가 동시에 다른 task를 추적할 수 있습니다.
+"""
+import os
+import json
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from .checkpoint import atomic_write_json
+
+
+HISTOGRAM_WINDOW = 1000
+
+_local = threading.local()
+_histograms: Dict[str, deque] = {}
+_histograms_lock = threading.Lock()
+
+# trace.json 파일별 잠금 (같은 작업의 trace를 여러 스레드가 동시에 읽고 덮어쓰지 않도록)
+_path_locks: Dict[str, threading.Lock] = {}
+_path_locks_lock = threading.Lock()
+
+
+class Span:
+    def __init__(self, name: str, category: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.category = category
+        self.attrs = dict(attrs)
+        self.start = time.perf_counter()
+        self.start_epoch_us = time.time() * 1e6
+        self.duration = 0.0
+
+    def set(self, **attrs) -> None:
+        """속성을 설정합니다 (예: bytes=..., status=...)."""
+        self.attrs.update(attrs)
+
+    def add(self, key: str, amount: float = 1) -> None:
+        """숫자 속성을 증가시킵니다 (예: span.add("retries"))."""
+        self.attrs[key] = self.attrs.get(key, 0) + amount
+
+
+class _TaskTrace:
+    def __init__(self, task_id: str, creator: str):
+        self.task_id = task_id
+        self.creator = creator
+        self.events: List[Dict[str, Any]] = []
+        self.lock = threading.Lock()
+
+
+def _stack() -> List[Span]:
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def current_task_id() -> Optional[str]:
+    trace = getattr(_local, 'trace', None)
+    return trace.task_id if trace else None
+
+
+def current_task() -> Optional[Tuple[str, str]]:
+    """현재 스레드에서 추적 중인 task의 (creator, task_id)"""
+    trace = getattr(_local, 'trace', None)
+    return (trace.creator, trace.task_id) if trace else None
+
+
+@contextmanager
+def span(name: str, category: str = "stage", **attrs) -> Iterator[Span]:
+    """추적 구간을 기록합니다.
+
+    Args:
+        name (str): 구간 이름 (예: "llm.gemini", "ffmpeg.encode")
+        category (str): "stage"(파이프라인 단계), "external"(외부 호출, 히스토그램에 집계), "wait"
+        **attrs: 구간 속성 (bytes, retries 등)
+    """
+    current = Span(name, category, attrs)
+    stack = _stack()
+    if stack:
+        current.attrs.setdefault("parent", stack[-1].name)
+    stack.append(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.attrs["error"] = type(e).__name__
+        raise
+    finally:
+        current.duration = time.perf_counter() - current.start
+        stack.pop()
+        if category == "external":
+            _observe(name, current.duration)
+        trace = getattr(_local, 'trace', None)
+        if trace is not None:
+            with trace.lock:
+                trace.events.append({
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": round(current.start_epoch_us),
+                    "dur": round(current.duration * 1e6),
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                    "args": current.attrs,
+                })
+
+
+@contextmanager
+def task_trace(task_id: str, creator: str) -> Iterator[None]:
+    """현재 스레드에서 task의 span을 수집하고, 끝나면 trace 파일에 추가합니다.
+
+    같은 task를 나중에 다시 추적하면(재개, 백그라운드 업로드) 기존 파일에 이어서 기록합니다.
+    """
+    previous = getattr(_local, 'trace', None)
+    trace = _local.trace = _TaskTrace(task_id, creator)
+    try:
+        with span("task", task_id=task_id, creator=creator):
+            yield
+    finally:
+        _local.trace = previous
+        _write_trace(trace)
+
+
+def current_trace() -> Optional[_TaskTrace]:
+    """현재 스레드에서 수집 중인 task trace (다른 스레드에 attach_trace로 넘길 때 사용)"""
+    return getattr(_local, 'trace', None)
+
+
+@contextmanager
+def attach_trace(trace: Optional[_TaskTrace]) -> Iterator[None]:
+    """다른 스레드에서 실행하는 작업의 span을 task의 trace에 함께 기록합니다.
+
+    trace 파일은 task_trace가 끝날 때 기록되므로 작업은 그 전에 끝나야 합니다.
+    """
+    previous = getattr(_local, 'trace', None)
+    _local.trace = trace
+    try:
+        yield
+    finally:
+        _local.trace = previous
+
+
+def trace_path(creator: str, task_id: str) -> str:
+    return os.path.join("data", creator, task_id, "trace.json")
+
+
+def _path_lock(path: str) -> threading.Lock:
+    with _path_locks_lock:
+        lock = _path_locks.get(path)
+        if lock is None:
+            lock = _path_locks[path] = threading.Lock()
+        return lock
+
+
+def _write_trace(trace: _TaskTrace) -> None:
+    path = trace_path(trace.creator, trace.task_id)
+    # 읽기-병합-쓰기 사이에 다른 스레드가 쓰면 그 이벤트가 사라지므로 전체를 잠급니다
+    with _path_lock(os.path.abspath(path)):
+        events = []
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    events = json.load(f).get("traceEvents", [])
+            except (OSError, ValueError):
+                events = []
+        with trace.lock:
+            events.extend(trace.events)
+        atomic_write_json(path, {"traceEvents": events, "displayTimeUnit": "ms"})
+
+
+def _observe(name: str, seconds: float) -> None:
+    with _histograms_lock:
+        samples = _histograms.get(name)
+        if samples is None:
+            samples = _histograms[name] = deque(maxlen=HISTOGRAM_WINDOW)
+        samples.append(seconds)
+
+
+def _percentile(sorted_samples: List[float], q: float) -> float:
+    index = min(len(sorted_samples) - 1, max(0, int(round(q * (len(sorted_samples) - 1)))))
+    return sorted_samples[index]
+
+
+def latency_summary() -> Dict[str, Dict[str, float]]:
+    """외부 호출별 최근 지속 시간의 count, p50, p95, max (초)를 반환합니다."""
+    with _histograms_lock:
+        snapshot = {name: sorted(samples) for name, samples in _histograms.items() if samples}
+    return {
+        name: {
+            "count": len(samples),
+            "p50": _percentile(samples, 0.50),
+            "p95": _percentile(samples, 0.95),
+            "max": samples[-1],
+        }
+        for name, samples in sorted(snapshot.items())
+    }
+
+
+def format_latency_summary() -> str:
+    lines = [f"{'call':<40} {'count':>6} {'p50 (s)':>9} {'p95 (s)':>9}"]
+    for name, stats in latency_summary().items():
+        lines.append(f"{name:<40} {stats['count']:>6} {stats['p50']:>9.3f} {stats['p95']:>9.3f}")
+    return "\n".join(lines)
@@ -0,0 +1,194 @@
+"""Background upload queue
+
+렌더링이 끝난 비디오를 큐에 넣으면 별도의 워커 스레드가 업로드하고 시트를 갱신합니다.
+업로드가 진행되는 동안 메인 스레드는 다음 비디오의 생성과 렌더링을 계속합니다.
+대기 중인 작업은 data/<creator>/upload_queue/<task_id>.json에 저장되므로
+프로세스가 재시작되어도 recover()로 다시 큐에 넣을 수 있습니다.
+MAX_ATTEMPTS번 실패한 작업은 upload_queue/failed/로 옮겨져 더 이상 재시도하지 않습니다.
+"""
+import os
+import json
+import glob
+import time
+import queue
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set
+from .logger import Logger
+from .checkpoint import atomic_write_json
+from .quota_ledger import QuotaExceeded
+from .metrics import metrics
+
+
+def upload_queue_dir(creator: str) -> str:
+    return os.path.join("data", creator, "upload_queue")
+
+
+def failed_upload_dir(creator: str) -> str:
+    """재시도 횟수를 모두 사용한 작업을 보관하는 디렉토리 (recover 대상이 아님)"""
+    return os.path.join(upload_queue_dir(creator), "failed")
+
+
+def defer_upload(creator: str, job: Dict[str, Any], retry_at: float) -> None:
+    """quota가 부족한 업로드 작업을 다음 quota 기간까지 미뤄 디스크에 저장합니다."""
+    job = dict(job, status="deferred", retry_at=retry_at, upload_slot=None)
+    atomic_write_json(os.path.join(upload_queue_dir(creator), f"{job['task_id']}.json"), job)
+
+
+class UploadQueue:
+    # 작업 하나를 업로드하는 최대 시도 횟수 (quota 부족으로 미룬 경우는 세지 않음)
+    MAX_ATTEMPTS = 5
+
+    def __init__(self, creator: str, handler: Callable[[Dict[str, Any]], bool], max_concurrent: int = 2):
+        """
+        Args:
+            creator (str): 크리에이터 이름
+            handler (Callable): 작업 하나를 업로드하고 시트를 갱신하는 함수. 성공하면 True
+            max_concurrent (int): 동시에 업로드할 최대 작업 수
+        """
+        self.logger = Logger()
+        self.creator = creator
+        self.handler = handler
+        self.max_concurrent = max(1, max_concurrent)
+        self.queue_dir = upload_queue_dir(creator)
+        os.makedirs(self.queue_dir, exist_ok=True)
+
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._results_lock = threading.Lock()
+        # task_id -> 성공 여부
+        self.results: Dict[str, bool] = {}
+        # 큐에 들어 있거나 업로드 중인 task_id (recover를 반복 호출해도 중복으로 넣지 않음)
+        self._queued: Set[str] = set()
+        self._workers: List[threading.Thread] = []
+
+    def _job_path(self, task_id: str) -> str:
+        return os.path.join(self.queue_dir, f"{task_id}.json")
+
+    def start(self) -> None:
+        """업로드 워커 스레드를 시작합니다."""
+        metrics.register_collector(self._metric_samples)
+        for i in range(self.max_concurrent):
+            worker = threading.Thread(target=self._worker_loop, name=f"upload-{self.creator}-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, job: Dict[str, Any]) -> None:
+        """업로드 작업을 디스크에 저장한 뒤 큐에 넣습니다 (job에는 task_id가 있어야 함)."""
+        job = dict(job, status="pending", queued_at=datetime.now().isoformat())
+        atomic_write_json(self._job_path(job["task_id"]), job)
+        self._enqueue(job)
+
+    def _enqueue(self, job: Dict[str, Any]) -> bool:
+        with self._results_lock:
+            if job["task_id"] in self._queued:
+                return False
+            self._queued.add(job["task_id"])
+        self._queue.put(job)
+        return True
+
+    def recover(self) -> int:
+        """이전 실행에서 끝나지 않은 작업을 다시 큐에 넣습니다.
+
+        quota 부족으로 미룬 작업은 retry_at(다음 quota 기간)이 지난 경우에만 넣습니다.
+        이미 큐에 있는 작업은 건너뛰므로 데몬은 주기적으로 호출해 기한이 된 작업을 가져옵니다.
+
+        Returns:
+            int: 다시 큐에 넣은 작업 수
+        """
+        recovered = 0
+        for path in sorted(glob.glob(os.path.join(self.queue_dir, "*.json"))):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    job = json.load(f)
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Skipping unreadable upload job {path}: {str(e)}")
+                continue
+            if job.get("retry_at", 0) > time.time():
+                continue
+            # 이전 실행에서 할당된 슬롯은 새 할당기가 알지 못하므로 업로드 시점에 다시 할당합니다
+            job["upload_slot"] = None
+            if self._enqueue(job):
+                recovered += 1
+        if recovered:
+            self.logger.info(f"Recovered {recovered} pending upload(s) for {self.creator}")
+        return recovered
+
+    def pending(self) -> int:
+        return self._queue.unfinished_tasks
+
+    def _metric_samples(self):
+        yield "shortfactory_upload_queue_depth", {"creator": self.creator}, self.pending()
+
+    def _worker_loop(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                try:
+                    self._run_job(job)
+                finally:
+                    with self._results_lock:
+                        self._queued.discard(job["task_id"])
+            finally:
+                self._queue.task_done()
+
+    def _run_job(self, job: Dict[str, Any]):
+        task_id = job["task_id"]
+        try:
+            succeeded = bool(self.handler(job))
+        except QuotaExceeded as e:
+            self.logger.warning(f"Upload job {task_id} deferred to the next quota window: {str(e)}")
+            defer_upload(self.creator, job, e.retry_at)
+            with self._results_lock:
+                self.results[task_id] = False
+            return
+        except Exception as e:
+            self.logger.error(f"Upload job {task_id} failed: {str(e)}")
+            succeeded = False
+
+        with self._results_lock:
+            self.results[task_id] = succeeded
+        if succeeded:
+            if os.path.exists(self._job_path(task_id)):
+                os.remove(self._job_path(task_id))
+        else:
+            job = dict(job, status="failed", attempts=job.get("attempts", 0) + 1)
+            if job["attempts"] >= self.MAX_ATTEMPTS:
+                self._park(job)
+                return
+            # 실패한 작업은 파일에 남겨 두어 다음 실행에서 다시 시도합니다
+            atomic_write_json(self._job_path(task_id), job)
+
+    def _park(self, job: Dict[str, Any]) -> None:
+        """재시도해도 성공하지 못한 작업(예: 잘못된 메타데이터)을 failed/로 옮깁니다.
+
+        옮긴 작업은 recover()가 다시 넣지 않습니다. 원인을 고친 뒤 파일을 upload_queue/로
+        되돌리면 다시 시도합니다 (attempts를 0으로 바꿔야 함).
+        """
+        task_id = job["task_id"]
+        job = dict(job, status="parked", parked_at=datetime.now().isoformat())
+        atomic_write_json(os.path.join(failed_upload_dir(self.creator), f"{task_id}.json"), job)
+        if os.path.exists(self._job_path(task_id)):
+            os.remove(self._job_path(task_id))
+        metrics.inc("shortfactory_upload_jobs_parked_total", creator=self.creator)
+        self.logger.error(
+            f"Upload job {task_id} failed {job['attempts']} times, giving up. "
+            f"Moved to {failed_upload_dir(self.creator)}"
+        )
+
+    def join(self) -> Dict[str, bool]:
+        """큐의 모든 작업이 끝날 때까지 기다린 뒤 워커를 종료합니다.
+
+        Returns:
+            Dict[str, bool]: task_id -> 성공 여부
+        """
+        self._queue.join()
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+        metrics.unregister_collector(self._metric_samples)
+        with self._results_lock:
+            return dict(self.results)
@@ -0,0 +1,102 @@
+"""In-memory upload slot allocator
+
+크리에이터별로 시트의 예약 시간(H열)을 한 번만 읽어 두고, 고정된 일일 업로드 시간
+(UPLOAD_TIMES, KST)에 따라 비어 있는 슬롯을 잠금 하에 한 번에 K개씩 할당합니다.
+여러 비디오를 한꺼번에 예약해도 슬롯이 겹치지 않고, 비디오마다 시트를 다시 읽지 않습니다.
+"""
+import threading
+from datetime import datetime, time, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+
+# 고정 업로드 시간 (한국 시간 기준)
+UPLOAD_TIMES = [
+    time(10, 0),
+    time(16, 0),
+]
+
+
+class UploadSlotAllocator:
+    def __init__(self, scheduled_times: Iterable[str], upload_times: List[time] = None):
+        """
+        Args:
+            scheduled_times (Iterable[str]): 시트에 이미 예약된 시간 ("%Y-%m-%d %H:%M:%S", KST)
+            upload_times (List[time], optional): 일일 업로드 시간 (기본값: UPLOAD_TIMES)
+        """
+        import pytz
+        self.kst = pytz.timezone('Asia/Seoul')
+        self.upload_times = sorted(upload_times or UPLOAD_TIMES)
+        self._lock = threading.Lock()
+        self._taken: Set[datetime] = set()
+        # 업로드 실패 등으로 반환된 슬롯 (다음 할당에서 먼저 재사용)
+        self._released: Set[datetime] = set()
+
+        for value in scheduled_times:
+            try:
+                self._taken.add(self.kst.localize(datetime.strptime(value, "%Y-%m-%d %H:%M:%S")))
+            except (TypeError, ValueError):
+                continue
+
+    def _slots_after(self, start: datetime):
+        """start 이후의 업로드 슬롯을 시간순으로 생성합니다."""
+        current_date = start.date()
+        while True:
+            for upload_time in self.upload_times:
+                slot = self.kst.localize(datetime.combine(current_date, upload_time))
+                if slot > start:
+                    yield slot
+            current_date += timedelta(days=1)
+
+    def allocate(self, k: int = 1) -> List[datetime]:
+        """다음 빈 슬롯 k개를 원자적으로 할당합니다.
+
+        반환된 슬롯 중 아직 미래인 것을 먼저 재사용하고, 나머지는 마지막 예약 시간
+        (또는 현재 시간) 이후의 고정 업로드 시간에서 차례로 할당합니다.
+
+        Returns:
+            List[datetime]: 시간순으로 정렬된 KST 슬롯 k개
+        """
+        with self._lock:
+            now = datetime.now(self.kst)
+            self._released = {slot for slot in self._released if slot > now}
+
+            slots = sorted(self._released)[:k]
+            self._released.difference_update(slots)
+
+            if len(slots) < k:
+                start = max([now] + list(self._taken) + slots)
+                for slot in self._slots_after(start):
+                    slots.append(slot)
+                    if len(slots) >= k:
+                        break
+
+            self._taken.update(slots)
+            return sorted(slots)
+
+    def release(self, slot: datetime) -> None:
+        """사용하지 않은 슬롯을 반환합니다 (업로드 실패 시)."""
+        if slot.tzinfo is None:
+            slot = self.kst.localize(slot)
+        slot = slot.astimezone(self.kst)
+        with self._lock:
+            if slot in self._taken:
+                self._taken.discard(slot)
+                self._released.add(slot)
+
+
+_allocators: Dict[str, UploadSlotAllocator] = {}
+_allocators_lock = threading.Lock()
+
+
+def find_slot_allocator(creator: str) -> Optional[UploadSlotAllocator]:
+    """이미 만들어진 할당기를 반환합니다 (없으면 None, 새로 만들지 않음)."""
+    with _allocators_lock:
+        return _allocators.get(creator)
+
+
+def get_slot_allocator(creator: str, load_scheduled_times: Callable[[], Iterable[str]]) -> UploadSlotAllocator:
+    """크리에이터별로 프로세스에서 공유하는 할당기를 반환합니다 (처음 한 번만 시트에서 시드)."""
+    with _allocators_lock:
+        if creator not in _allocators:
+            _allocators[creator] = UploadSlotAllocator(load_scheduled_times())
+        return _allocators[creator]
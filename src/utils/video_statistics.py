@@ -0,0 +1,218 @@
+"""Batched, incremental YouTube statistics refresh
+
+시트의 비디오 통계를 videos.list(요청당 50개 ID)로 가져오고, 참여율 지표를
+numpy로 한 번에 계산한 뒤 변경된 행을 batchUpdate 한 번으로 기록합니다.
+마지막으로 가져온 통계와 시각은 비디오별로 로컬 SQLite에 저장되며, 공개 후 경과 시간에
+따라(REFRESH_SCHEDULE) 갱신할 때가 된 비디오만 다시 가져옵니다.
+"""
+import os
+import math
+import time
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from .sheets_write_buffer import column_letter
+
+
+# 통계 열 (0-based): K=조회수, L=좋아요, M=댓글, N=성능 메모 (I열은 video ID, J열은 URL)
+STATS_COLUMNS = ['views', 'likes', 'comments', 'performance_notes']
+STATS_FIRST_COLUMN = 10
+
+# (공개 후 경과 시간 상한, 갱신 주기) 초 단위. 공개 후 1일까지는 매시간, 30일까지는 매일, 이후 매주
+REFRESH_SCHEDULE = [
+    (24 * 3600, 3600),
+    (30 * 24 * 3600, 24 * 3600),
+    (None, 7 * 24 * 3600),
+]
+
+
+def refresh_interval(age_seconds: Optional[float]) -> float:
+    """공개 후 경과 시간에 해당하는 갱신 주기(초)를 반환합니다. 경과 시간을 모르면 가장 긴 주기."""
+    if age_seconds is None:
+        return REFRESH_SCHEDULE[-1][1]
+    for max_age, interval in REFRESH_SCHEDULE:
+        if max_age is None or age_seconds < max_age:
+            return interval
+    return REFRESH_SCHEDULE[-1][1]
+
+
+def compute_engagement(views: List[int], likes: List[int], comments: List[int]) -> Dict[str, Any]:
+    """모든 행의 참여율을 벡터 연산으로 계산합니다.
+
+    Returns:
+        Dict[str, Any]: like_rate, comment_rate (%, 조회수가 0이면 NaN)
+    """
+    import numpy as np
+
+    views = np.asarray(views, dtype=np.float64)
+    likes = np.asarray(likes, dtype=np.float64)
+    comments = np.asarray(comments, dtype=np.float64)
+    has_views = views > 0
+    like_rate = np.full(views.shape, np.nan)
+    comment_rate = np.full(views.shape, np.nan)
+    np.divide(likes * 100.0, views, out=like_rate, where=has_views)
+    np.divide(comments * 100.0, views, out=comment_rate, where=has_views)
+    return {'like_rate': like_rate, 'comment_rate': comment_rate}
+
+
+class StatisticsStore:
+    """비디오별 마지막 통계와 가져온 시각을 저장합니다 (data/<creator>/video_statistics.sqlite)."""
+
+    def __init__(self, creator: str, db_path: Optional[str] = None):
+        self.db_path = db_path or os.path.join("data", creator, "video_statistics.sqlite")
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS video_stats (
+                    video_id TEXT PRIMARY KEY,
+                    views INTEGER NOT NULL,
+                    likes INTEGER NOT NULL,
+                    comments INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL
+                )"""
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def get_all(self) -> Dict[str, Dict[str, Any]]:
+        rows = self._connect().execute("SELECT * FROM video_stats").fetchall()
+        return {row["video_id"]: dict(row) for row in rows}
+
+    def save(self, statistics: Dict[str, Dict[str, Any]], fetched_at: float) -> None:
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO video_stats (video_id, views, likes, comments, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (video_id, stats['views'], stats['likes'], stats['comments'], fetched_at)
+                    for video_id, stats in statistics.items()
+                ]
+            )
+
+
+class StatisticsRefresher:
+    def __init__(self, sheets_manager, youtube_manager, store: Optional[StatisticsStore] = None):
+        """
+        Args:
+            sheets_manager (SheetsManager): 시트 미러와 Sheets API 서비스를 제공
+            youtube_manager (YouTubeManager): 크리에이터 채널의 YouTube API 클라이언트
+            store (StatisticsStore, optional): 마지막 통계 저장소 (기본값: 크리에이터별 SQLite)
+        """
+        self.sheets_manager = sheets_manager
+        self.youtube_manager = youtube_manager
+        self.store = store or StatisticsStore(youtube_manager.creator)
+
+    def _published_age(self, scheduled_time: str, now: float) -> Optional[float]:
+        """H열의 예약 시간(KST)으로부터 공개 후 경과 시간(초)을 계산합니다."""
+        import pytz
+        try:
+            published = pytz.timezone('Asia/Seoul').localize(datetime.strptime(scheduled_time, "%Y-%m-%d %H:%M:%S"))
+        except (TypeError, ValueError):
+            return None
+        return now - published.timestamp()
+
+    def _is_due(self, row: Dict[str, Any], previous: Optional[Dict[str, Any]], now: float) -> bool:
+        if previous is None:
+            return True
+        age = self._published_age(row['scheduled_time'], now)
+        if age is not None and age < 0:
+            return False  # 아직 공개되지 않은 비디오
+        return now - previous['fetched_at'] >= refresh_interval(age)
+
+    def refresh(self, spreadsheet_id: str, creator: str, force: bool = False) -> Dict[str, int]:
+        """갱신할 때가 된 비디오의 통계를 가져오고, 값이 바뀐 행만 시트에 기록합니다.
+
+        Args:
+            spreadsheet_id (str): Google Spreadsheet ID
+            creator (str): Creator name
+            force (bool): True이면 갱신 주기와 관계없이 모든 비디오를 가져옵니다
+
+        Returns:
+            Dict[str, int]: videos (video ID가 있는 행), fetched (가져온 비디오), updated (기록한 행),
+                requests (API 호출 수), saved_requests (모든 비디오를 매번 갱신할 때보다 줄어든 호출 수)
+        """
+        sheet_name = self.sheets_manager._get_creator_sheet_name(creator)
+        mirror = self.sheets_manager._mirror(
+            spreadsheet_id, creator, max_age=self.sheets_manager.MIRROR_SYNC_INTERVAL
+        )
+        rows = mirror.rows_with_video_ids()
+        if not rows:
+            print('No uploaded videos found.')
+            return {'videos': 0, 'fetched': 0, 'updated': 0, 'requests': 0, 'saved_requests': 0}
+
+        now = time.time()
+        previous = self.store.get_all()
+        for row in rows:
+            row['video_id'] = row['video_id'].strip()
+        due_rows = [row for row in rows if force or self._is_due(row, previous.get(row['video_id']), now)]
+
+        batch_size = self.youtube_manager.VIDEOS_LIST_MAX_IDS
+        due_ids = list(dict.fromkeys(row['video_id'] for row in due_rows))
+        statistics = self.youtube_manager.get_videos_statistics(due_ids) if due_ids else {}
+        list_calls = math.ceil(len(due_ids) / batch_size)
+
+        # 마지막으로 기록한 값과 같은 행은 다시 쓰지 않습니다
+        changed = []
+        for row in due_rows:
+            stats = statistics.get(row['video_id'])
+            if stats is None:
+                continue
+            last = previous.get(row['video_id'])
+            if last and all(last[key] == stats[key] for key in ('views', 'likes', 'comments')):
+                continue
+            changed.append((row, stats))
+
+        data = self.build_updates(sheet_name, changed)
+        if data:
+            self.sheets_manager.service.spreadsheets().values().batchUpdate(
+                spreadsheetId=spreadsheet_id,
+                body={'valueInputOption': 'RAW', 'data': data}
+            ).execute()
+        # 시트 기록이 성공한 뒤에 저장하여, 실패하면 다음 실행에서 다시 기록합니다
+        self.store.save(statistics, now)
+
+        requests = list_calls + (1 if data else 0)
+        full_refresh_requests = math.ceil(len(set(row['video_id'] for row in rows)) / batch_size) + 1
+        summary = {
+            'videos': len(rows),
+            'fetched': len(statistics),
+            'updated': len(data),
+            'requests': requests,
+            'saved_requests': max(0, full_refresh_requests - requests),
+        }
+        print(f"Fetched {summary['fetched']} and updated {summary['updated']} of {summary['videos']} videos "
+              f"with {summary['requests']} API request(s) ({summary['saved_requests']} saved)")
+        return summary
+
+    @staticmethod
+    def build_updates(sheet_name: str, rows: List[Any]) -> List[Dict[str, Any]]:
+        """(미러 행, 통계) 목록으로 K:N열 batchUpdate data를 만듭니다."""
+        if not rows:
+            return []
+        metrics = compute_engagement(
+            [stats['views'] for _, stats in rows],
+            [stats['likes'] for _, stats in rows],
+            [stats['comments'] for _, stats in rows],
+        )
+
+        start = column_letter(STATS_FIRST_COLUMN)
+        end = column_letter(STATS_FIRST_COLUMN + len(STATS_COLUMNS) - 1)
+        data = []
+        for (row, stats), like_rate, comment_rate in zip(rows, metrics['like_rate'], metrics['comment_rate']):
+            if math.isnan(like_rate):
+                notes = "Engagement rate: N/A"
+            else:
+                notes = f"Engagement rate: {like_rate:.2f}% (comments {comment_rate:.2f}%)"
+            data.append({
+                'range': f"{sheet_name}!{start}{row['row_index']}:{end}{row['row_index']}",
+                'values': [[stats['views'], stats['likes'], stats['comments'], notes]]
+            })
+        return data
@@ -1,28 +1,45 @@
 import os
-from typing import Dict, Optional, Any
+import json
+import time
+import random
+import hashlib
+from typing import Dict, List, Optional, Any
 from datetime import datetime
-import pytz
 import yaml
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-from googleapiclient.errors import HttpError
-import pickle
+from .client_pool import get_client_pool
+from .checkpoint import atomic_write_json
+from .quota_ledger import credentials_project, get_quota_ledger
+from .tracing import span
 
 class YouTubeManager:
-    def __init__(self, creator: str):
+    # 업로드 청크 크기 (resumable 업로드는 256KB의 배수여야 함)
+    DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+    CHUNK_ALIGNMENT = 256 * 1024
+    # 5xx 응답과 네트워크 오류에 대한 재시도 (지수 백오프, 최대 64초)
+    MAX_RETRIES = 10
+    RETRIABLE_STATUS_CODES = (500, 502, 503, 504)
+
+    def __init__(self, creator: str, chunk_size: Optional[int] = None):
+        """
+        Args:
+            creator (str): 크리에이터 이름
+            chunk_size (int, optional): 업로드 청크 크기 (바이트, 256KB 배수로 올림).
+                없으면 크리에이터 설정의 upload_chunk_size_mb, 그것도 없으면 8MB
+        """
         self.SCOPES = [
             'https://www.googleapis.com/auth/youtube.upload',
             'https://www.googleapis.com/auth/youtube',
             'https://www.googleapis.com/auth/youtube.force-ssl'
         ]
         self.creds = None
-        self.youtube = None
         self.creator = creator
         self.channel_id = self._load_channel_id()
+        chunk_size = chunk_size or self._load_chunk_size()
+        self.chunk_size = -(-chunk_size // self.CHUNK_ALIGNMENT) * self.CHUNK_ALIGNMENT
+        self.session_dir = os.path.join("data", creator, "upload_sessions")
         self._setup_credentials()
+        # quota ledger에서 사용하는 Google Cloud 프로젝트 식별자
+        self.quota_project = credentials_project(self.creds)
     
     def _load_channel_id(self) -> str:
         """크리에이터의 YouTube 채널 ID를 로드합니다."""
@@ -38,43 +55,36 @@ class YouTubeManager:
             print(f"채널 ID 로드 중 오류 발생: {str(e)}")
             raise
     
+    def _load_chunk_size(self) -> int:
+        """크리에이터 설정의 upload_chunk_size_mb를 바이트로 반환합니다 (없으면 기본값)."""
+        config_path = os.path.join('config', 'prompts', f'{self.creator}.yml')
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+        chunk_size_mb = config.get('upload_chunk_size_mb')
+        return int(float(chunk_size_mb) * 1024 * 1024) if chunk_size_mb else self.DEFAULT_CHUNK_SIZE
+    
     def _setup_credentials(self):
         """YouTube API 인증을 수행합니다."""
         try:
-            # 저장된 토큰이 있는지 확인
-            token_file = f'youtube_token_{self.creator}.pickle'
-            if os.path.exists(token_file):
-                with open(token_file, 'rb') as token:
-                    self.creds = pickle.load(token)
-            
-            # 토큰이 없거나 만료된 경우 새로 생성
-            if not self.creds or not self.creds.valid:
-                if self.creds and self.creds.expired and self.creds.refresh_token:
-                    self.creds.refresh(Request())
-                else:
-                    flow = InstalledAppFlow.from_client_secrets_file(
-                        f'credentials_{self.creator}.json',
-                        self.SCOPES
-                    )
-                    self.creds = flow.run_local_server(
-                        port=8080,
-                        open_browser=True,
-                        success_message='인증이 완료되었습니다. 이 창을 닫아주세요.'
-                    )
-                
-                # 토큰 저장
-                with open(token_file, 'wb') as token:
-                    pickle.dump(self.creds, token)
-            
-            # YouTube API 서비스 생성
-            self.youtube = build('youtube', 'v3', credentials=self.creds)
-            
+            # 크리에이터별 토큰은 프로세스 전체에서 공유되며 백그라운드에서 미리 갱신됩니다
+            self.creds = get_client_pool().get_credentials(
+                f'youtube_token_{self.creator}.pickle',
+                f'credentials_{self.creator}.json',
+                self.SCOPES
+            )
         except Exception as e:
             print(f"인증 중 오류 발생: {str(e)}")
             raise
     
+    @property
+    def youtube(self):
+        """현재 스레드의 YouTube API 서비스 (연결 재사용)"""
+        return get_client_pool().get_service('youtube', 'v3', self.creds)
+    
     def upload_video(self, video_path: str, metadata: Dict[str, Any], scheduled_time: Optional[datetime] = None, content_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Upload video to YouTube with metadata"""
+        import pytz
+        from googleapiclient.http import MediaFileUpload
         try:
             # 해시태그 처리
             if content_data and 'hashtag' in content_data:
@@ -112,22 +122,187 @@ class YouTubeManager:
                 }
             }
             
-            # 업로드 요청
+            # 업로드 요청 (청크 단위 resumable 업로드)
             request = self.youtube.videos().insert(
                 part=','.join(body.keys()),
                 body=body,
                 media_body=MediaFileUpload(
                     video_path,
-                    chunksize=-1,
+                    chunksize=self.chunk_size,
                     resumable=True
                 )
             )
             
             # 업로드 실행
-            response = request.execute()
+            with span("youtube.upload", bytes=os.path.getsize(video_path)) as upload:
+                response = self._upload_resumable(request, video_path, upload)
             
             return response
             
         except Exception as e:
             print(f"Error uploading video: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+
+    # videos.list는 요청당 최대 50개의 ID를 받습니다
+    VIDEOS_LIST_MAX_IDS = 50
+
+    def get_videos_statistics(self, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """여러 비디오의 통계를 videos.list 요청당 최대 50개씩 묶어 가져옵니다.
+
+        Args:
+            video_ids (List[str]): YouTube 비디오 ID 목록
+
+        Returns:
+            Dict[str, Dict[str, Any]]: video ID -> {views, likes, comments, status}.
+                삭제되었거나 접근할 수 없는 비디오는 포함되지 않습니다.
+        """
+        statistics = {}
+        unique_ids = list(dict.fromkeys(video_id for video_id in video_ids if video_id))
+        for start in range(0, len(unique_ids), self.VIDEOS_LIST_MAX_IDS):
+            chunk = unique_ids[start:start + self.VIDEOS_LIST_MAX_IDS]
+            try:
+                response = self.youtube.videos().list(
+                    part='statistics,status',
+                    id=','.join(chunk),
+                    maxResults=self.VIDEOS_LIST_MAX_IDS
+                ).execute()
+            except Exception as e:
+                print(f"Error fetching video statistics: {str(e)}")
+                raise
+            for item in response.get('items', []):
+                stats = item.get('statistics', {})
+                statistics[item['id']] = {
+                    'views': int(stats.get('viewCount', 0)),
+                    'likes': int(stats.get('likeCount', 0)),
+                    'comments': int(stats.get('commentCount', 0)),
+                    'status': item.get('status', {}).get('privacyStatus', '')
+                }
+        return statistics
+
+    def get_video_statistics(self, video_id: str) -> Dict[str, Any]:
+        """비디오 하나의 통계를 가져옵니다."""
+        statistics = self.get_videos_statistics([video_id])
+        if video_id not in statistics:
+            raise ValueError(f"Video not found: {video_id}")
+        return statistics[video_id]
+
+    def _session_path(self, video_path: str) -> str:
+        """비디오 파일(경로, 크기, 수정 시각)별 업로드 세션 파일 경로"""
+        stat = os.stat(video_path)
+        key = f"{os.path.abspath(video_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        return os.path.join(self.session_dir, hashlib.sha256(key.encode()).hexdigest()[:16] + ".json")
+
+    def _upload_resumable(self, request, video_path: str, upload=None) -> Dict[str, Any]:
+        """next_chunk 루프로 업로드하고, 세션 URI를 디스크에 저장하여 재시작 후에도 이어 올립니다.
+
+        Args:
+            request: videos.insert resumable 요청
+            video_path (str): 업로드할 비디오 파일
+            upload (Span, optional): 재시도 횟수와 세션 재개 여부를 기록할 추적 span
+        """
+        import http.client
+        import httplib2
+        from googleapiclient.errors import HttpError
+
+        retriable_exceptions = (httplib2.HttpLib2Error, http.client.HTTPException, ConnectionError, TimeoutError)
+        session_path = self._session_path(video_path)
+        saved_uri = None
+        if os.path.exists(session_path):
+            try:
+                with open(session_path, 'r', encoding='utf-8') as f:
+                    saved_uri = json.load(f).get('resumable_uri')
+            except (OSError, ValueError):
+                saved_uri = None
+        if not saved_uri:
+            # 새 업로드 세션은 videos.insert 비용이 들므로 quota가 부족하면 시작하지 않습니다
+            get_quota_ledger().ensure_available(self.quota_project, "youtube.videos.insert")
+        else:
+            print(f"Resuming upload session for {video_path}")
+            if upload is not None:
+                upload.set(resumed=True)
+
+        response = None
+        retries = 0
+        # 저장된 세션은 첫 청크를 보내기 전에 서버가 받은 바이트 수를 조회합니다
+        resume = bool(saved_uri)
+        while response is None:
+            error = None
+            try:
+                if resume:
+                    response = self._resume_session(request, saved_uri)
+                    resume = False
+                    if response is not None:
+                        break
+                status, response = request.next_chunk()
+                retries = 0
+                if status:
+                    print(f"Upload progress: {int(status.progress() * 100)}%")
+            except HttpError as e:
+                if saved_uri and e.resp.status in (404, 410):
+                    # 세션이 만료되었으면 처음부터 새 세션으로 업로드
+                    print("Saved upload session expired, starting a new upload")
+                    saved_uri = None
+                    resume = False
+                    request.resumable_uri = None
+                    request.resumable_progress = 0
+                    os.remove(session_path)
+                    get_quota_ledger().ensure_available(self.quota_project, "youtube.videos.insert")
+                    continue
+                if e.resp.status not in self.RETRIABLE_STATUS_CODES:
+                    raise
+                error = e
+            except retriable_exceptions as e:
+                error = e
+
+            # 세션이 시작되면 URI를 저장하여 프로세스가 죽어도 같은 업로드를 이어 갑니다
+            if request.resumable_uri and request.resumable_uri != saved_uri:
+                saved_uri = request.resumable_uri
+                atomic_write_json(session_path, {
+                    'resumable_uri': saved_uri,
+                    'video_path': video_path,
+                    'created_at': datetime.now().isoformat()
+                })
+
+            if error is not None:
+                retries += 1
+                if upload is not None:
+                    upload.add("retries")
+                if retries > self.MAX_RETRIES:
+                    print(f"Upload failed after {self.MAX_RETRIES} retries")
+                    raise error
+                delay = min(2 ** retries, 64) * random.uniform(0.5, 1.0)
+                print(f"Retriable upload error ({str(error)}), retrying in {delay:.1f}s ({retries}/{self.MAX_RETRIES})")
+                # 실패한 next_chunk 이후의 호출은 googleapiclient가 먼저 서버의 진행 상태를 조회합니다
+                time.sleep(delay)
+
+        if os.path.exists(session_path):
+            os.remove(session_path)
+        return response
+
+    @staticmethod
+    def _resume_session(request, resumable_uri: str) -> Optional[Dict[str, Any]]:
+        """저장된 업로드 세션의 상태를 조회하고 요청이 서버가 받은 위치부터 이어 보내도록 합니다.
+
+        resumable upload 프로토콜의 상태 조회(빈 PUT, Content-Range: bytes */<size>)를 보내고,
+        308 응답의 Range 헤더로 resumable_progress를 맞춥니다.
+
+        Returns:
+            Optional[Dict[str, Any]]: 업로드가 이미 끝났으면 videos.insert 응답, 아니면 None
+
+        Raises:
+            HttpError: 세션이 만료되었거나(404, 410) 서버 오류인 경우
+        """
+        from googleapiclient.errors import HttpError
+
+        size = request.resumable.size()
+        resp, content = request.http.request(
+            resumable_uri, "PUT", headers={"Content-Range": f"bytes */{size}", "Content-Length": "0"}
+        )
+        if resp.status in (200, 201):
+            return request.postproc(resp, content)
+        if resp.status != 308:
+            raise HttpError(resp, content, uri=resumable_uri)
+        request.resumable_uri = resumable_uri
+        # Range: bytes=0-<마지막으로 받은 바이트> (아무것도 받지 않았으면 헤더 없음)
+        request.resumable_progress = int(resp["range"].split("-")[1]) + 1 if "range" in resp else 0
+        return None